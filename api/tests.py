@@ -0,0 +1,99 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from restaurants.models import Category, Restaurant
+from reviews.models import Review
+
+
+class ApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="pass12345")
+        self.category = Category.objects.create(name="한식")
+        self.restaurants = [
+            Restaurant.objects.create(name=f"식당{i}", address="서울", category=self.category, description="설명")
+            for i in range(15)
+        ]
+        self.restaurant = self.restaurants[0]
+        self.list_url = reverse("api:restaurant_list")
+        self.detail_url = reverse("api:restaurant_detail", args=[self.restaurant.pk])
+
+    def test_list_cursor_pagination_and_sparse_fields(self):
+        data = self.client.get(self.list_url, {"fields": "id,name"}).json()
+        self.assertEqual(len(data["results"]), 12)
+        self.assertEqual(set(data["results"][0]), {"id", "name"})
+        self.assertIsNone(data["previous_cursor"])
+
+        rest = self.client.get(self.list_url, {"fields": "id,name", "cursor": data["next_cursor"]}).json()
+        ids = [row["id"] for row in data["results"] + rest["results"]]
+        self.assertEqual(ids, sorted((r.pk for r in self.restaurants), reverse=True))
+        self.assertIsNone(rest["next_cursor"])
+
+        response = self.client.get(self.list_url, {"fields": "id,password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_fields(self):
+        data = self.client.get(self.detail_url).json()
+        self.assertEqual(data["category"], "한식")
+        self.assertEqual(data["rating_distribution"], {"5": 0, "4": 0, "3": 0, "2": 0, "1": 0})
+        self.assertNotIn("view_count", data)
+        self.assertEqual(self.client.get(self.detail_url, {"fields": "name"}).json(), {"name": "식당0"})
+        self.assertEqual(self.client.get(reverse("api:restaurant_detail", args=[0])).status_code, 404)
+
+    def test_etag_304_skips_heavy_queries(self):
+        response = self.client.get(self.detail_url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # 갱신 표시 조회 1번만
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 리뷰가 달리면 음식점 updated_at 이 바뀌어 새 ETag
+        self.client.force_login(self.user)
+        self.client.post(reverse("reviews:create", args=[self.restaurant.pk]), {"rating": 4, "content": "굿"})
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["review_count"], 1)
+
+    def test_list_and_reviews_conditional(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # 다른 필드 조합은 다른 ETag
+        self.assertNotEqual(self.client.get(self.list_url, {"fields": "id"})["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Restaurant.objects.create(name="새식당", address="부산")
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        Review.objects.create(restaurant=self.restaurant, author=self.user, rating=5, content="맛있어요")
+        url = reverse("api:review_list")
+        response = self.client.get(url, {"restaurant": self.restaurant.pk, "fields": "content,author"})
+        self.assertEqual(response.json()["results"], [{"content": "맛있어요", "author": "tester"}])
+        response = self.client.get(
+            url, {"restaurant": self.restaurant.pk, "fields": "content,author"},
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_follows_version_counter(self):
+        etag = self.client.get(self.list_url)["ETag"]
+        detail_etag = self.client.get(self.detail_url)["ETag"]
+
+        # 목록 갱신 표시는 캐시 읽기뿐 — 테이블 집계 쿼리 없이 304
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 카테고리 이름이 바뀌면 음식점 updated_at 은 그대로여도 목록/상세 ETag 가 바뀐다
+        self.category.name = "코리안"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][-1]["category"], "코리안")
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["category"], "코리안")
@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = "api"
+
+urlpatterns = [
+    path("restaurants/", views.restaurant_list, name="restaurant_list"),
+    path("restaurants/<int:pk>/", views.restaurant_detail, name="restaurant_detail"),
+    path("reviews/", views.review_list, name="review_list"),
+]
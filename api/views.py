@@ -0,0 +1,200 @@
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+
+from django.http import JsonResponse
+from django.views.decorators.http import condition, require_safe
+
+from core.metrics import query_budget
+from core.pagecache import tag_version
+from restaurants.models import Restaurant
+from restaurants.pagination import paginate_keyset
+from restaurants.ratings import STARS
+from restaurants.views import PAGE_SIZE, SORT_ORDERINGS, _list_queryset, _list_sort, _near_page, _near_params
+from reviews.views import FEED_PAGE_SIZE, _review_json, feed_queryset
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+# 응답 필드 이름 → (읽어야 하는 모델 필드, 값 변환)
+RESTAURANT_FIELDS = {
+    "id":           (["id"], lambda r: r.pk),
+    "name":         (["name"], lambda r: r.name),
+    "category":     (["category", "category__name"], lambda r: r.category.name if r.category else None),
+    "address":      (["address"], lambda r: r.address),
+    "phone":        (["phone"], lambda r: r.phone),
+    "description":  (["description"], lambda r: r.description),
+    "lat":          (["lat"], lambda r: float(r.lat) if r.lat is not None else None),
+    "lng":          (["lng"], lambda r: float(r.lng) if r.lng is not None else None),
+    "thumbnail":    (["thumbnail"], lambda r: r.thumbnail.url if r.thumbnail else None),
+    "avg_rating":   (["avg_rating"], lambda r: round(r.avg_rating, 2)),
+    "review_count": (["review_count"], lambda r: r.review_count),
+    "rating_distribution": (
+        ["review_count"] + [f"rating_{star}_count" for star in STARS],
+        lambda r: {str(star): count for star, count, _ in r.rating_distribution},
+    ),
+    "created_at":   (["created_at"], lambda r: _isoformat(r.created_at)),
+    "updated_at":   (["updated_at"], lambda r: _isoformat(r.updated_at)),
+}
+# 조회수는 버퍼에서 수시로 반영돼 ETag 가 계속 바뀌므로 API 에는 넣지 않는다
+RESTAURANT_LIST_FIELDS = ["id", "name", "category", "address", "thumbnail", "avg_rating", "review_count"]
+REVIEW_FIELDS = ["id", "rating", "content", "photo", "created_at", "author", "restaurant"]
+
+
+def _error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+# ?fields=id,name → 요청한 필드 목록 (없으면 기본값, 모르는 필드가 있으면 None)
+def _requested_fields(request, allowed, default):
+    raw = request.GET.get("fields", "").strip()
+    if not raw:
+        return default
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    if not fields or any(name not in allowed for name in fields):
+        return None
+    return fields
+
+
+# 요청한 필드에 필요한 컬럼만 읽는다 (+ 커서/거리 계산에 쓰는 컬럼)
+def _only_fields(queryset, fields, extra=()):
+    columns = {"id", *extra}
+    for name in fields:
+        columns.update(RESTAURANT_FIELDS[name][0])
+    if "category" not in columns:
+        queryset = queryset.select_related(None)
+    return queryset.only(*columns)
+
+
+def _restaurant_json(restaurant, fields):
+    return {name: RESTAURANT_FIELDS[name][1](restaurant) for name in fields}
+
+
+def _page_json(page, results):
+    return {
+        "results": results,
+        "next_cursor": page.next_cursor or None,
+        "previous_cursor": page.previous_cursor or None,
+    }
+
+
+# ---------------------------------------------------------------
+# 조건부 GET (ETag / Last-Modified)
+# 무거운 목록/상세 쿼리 전에 "갱신 표시" 만 읽어서 바뀐 게 없으면 304 (django condition 데코레이터)
+# - 갱신 표시: (마지막으로 바뀐 시각, 버전)
+# - 음식점: updated_at (저장, 리뷰 작성/수정/삭제, 집계 재계산 때 갱신) + 그 카테고리의 페이지 캐시 태그 버전
+# - 전체 목록/리뷰: 페이지 캐시의 "restaurants" 태그 버전 — 음식점/카테고리 저장·삭제, 리뷰 쓰기, 일괄 명령 때 바뀐다
+#   (테이블 전체를 집계하지 않고 캐시 읽기 한 번. 버전은 무효화한 시각의 ns 라서 Last-Modified 로도 쓴다)
+# ---------------------------------------------------------------
+def _version_time(version):
+    return datetime.fromtimestamp(version / 1e9, tz=dt_timezone.utc)
+
+
+def _all_restaurants_marker(request):
+    if not hasattr(request, "_api_marker"):
+        version = tag_version("restaurants")
+        request._api_marker = (_version_time(version), version)
+    return request._api_marker
+
+
+def _restaurant_marker(request, pk):
+    if not hasattr(request, "_api_marker"):
+        row = Restaurant.objects.filter(pk=pk).values_list("updated_at", "category_id").first()
+        if row is None:
+            request._api_marker = None
+        else:
+            updated, category_id = row
+            version = tag_version(f"category:{category_id}") if category_id else 0
+            request._api_marker = (max(updated, _version_time(version)), f"{updated.isoformat()}|{version}")
+    return request._api_marker
+
+
+# 같은 갱신 표시라도 쿼리 파라미터(필드/커서/정렬)가 다르면 응답이 다르므로 함께 해시
+def _etag(request, marker):
+    if marker is None:
+        return None
+    params = sorted((key, values) for key, values in request.GET.lists())
+    return hashlib.sha1(f"{marker[1]}|{request.path}|{params}".encode()).hexdigest()
+
+
+def _list_marker(request):
+    # 조회수 순서는 갱신 표시에 안 잡히므로 조건부 응답을 하지 않는다
+    if request.GET.get("sort") == "views":
+        return None
+    return _all_restaurants_marker(request)
+
+
+def _review_marker(request):
+    restaurant_id = request.GET.get("restaurant", "").strip()
+    if restaurant_id.isdigit():
+        return _restaurant_marker(request, int(restaurant_id))
+    return _all_restaurants_marker(request)
+
+
+def _last_modified(marker):
+    return marker[0] if marker else None
+
+
+# 음식점 목록 (restaurants.views.restaurant_list 와 같은 검색/필터/정렬, 커서 페이지네이션)
+@query_budget(12)
+@require_safe
+@condition(
+    etag_func=lambda request: _etag(request, _list_marker(request)),
+    last_modified_func=lambda request: _last_modified(_list_marker(request)),
+)
+def restaurant_list(request):
+    fields = _requested_fields(request, RESTAURANT_FIELDS, RESTAURANT_LIST_FIELDS)
+    if fields is None:
+        return _error(f"fields 는 {', '.join(RESTAURANT_FIELDS)} 중에서 골라 주세요.")
+    qs, q, category_id, sort, ranked = _list_queryset(request)
+
+    near = _near_params(request)
+    if near:
+        page = _near_page(_only_fields(qs, fields, ["lat", "lng"]), near)
+    else:
+        ordering = SORT_ORDERINGS.get(_list_sort(sort, ranked), SORT_ORDERINGS["latest"])
+        columns = [field.lstrip("-") for field in ordering if field.lstrip("-") != "search_rank"]
+        page = paginate_keyset(
+            _only_fields(qs, fields, columns), ordering,
+            cursor=request.GET.get("cursor", ""), per_page=PAGE_SIZE,
+        )
+    return JsonResponse(_page_json(page, [_restaurant_json(r, fields) for r in page]))
+
+
+# 음식점 상세 (기본은 모든 필드)
+@query_budget(2)
+@require_safe
+@condition(
+    etag_func=lambda request, pk: _etag(request, _restaurant_marker(request, pk)),
+    last_modified_func=lambda request, pk: _last_modified(_restaurant_marker(request, pk)),
+)
+def restaurant_detail(request, pk):
+    fields = _requested_fields(request, RESTAURANT_FIELDS, list(RESTAURANT_FIELDS))
+    if fields is None:
+        return _error(f"fields 는 {', '.join(RESTAURANT_FIELDS)} 중에서 골라 주세요.")
+    qs = Restaurant.objects.select_related("category")
+    restaurant = _only_fields(qs, fields).filter(pk=pk).first()
+    if restaurant is None:
+        return _error("음식점을 찾을 수 없어요.", status=404)
+    return JsonResponse(_restaurant_json(restaurant, fields))
+
+
+# 리뷰 목록 (reviews.views.review_feed 와 같은 필터 restaurant / category / rating, id 역순 커서)
+@query_budget(5)
+@require_safe
+@condition(
+    etag_func=lambda request: _etag(request, _review_marker(request)),
+    last_modified_func=lambda request: _last_modified(_review_marker(request)),
+)
+def review_list(request):
+    fields = _requested_fields(request, REVIEW_FIELDS, REVIEW_FIELDS)
+    if fields is None:
+        return _error(f"fields 는 {', '.join(REVIEW_FIELDS)} 중에서 골라 주세요.")
+    qs, filters = feed_queryset(request.GET)
+    page = paginate_keyset(qs, ["-id"], cursor=request.GET.get("cursor", ""), per_page=FEED_PAGE_SIZE)
+    results = []
+    for review in page:
+        data = _review_json(review)
+        results.append({name: data[name] for name in fields})
+    return JsonResponse(_page_json(page, results))
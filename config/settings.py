@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
+import sys
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -25,6 +28,8 @@ SECRET_KEY = 'django-insecure-0ru$&h^$z(_3nmnp-mq$tw2$&+09bkjypsw$9ogn3f+7uedrx-
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'   # manage.py test 로 실행 중
+
 ALLOWED_HOSTS = []
 
 
@@ -45,14 +50,17 @@ INSTALLED_APPS = [
     'reviews',
     'favorites',
     'mypage',
+    'api',
 ]
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.RequestMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.pagecache.AnonymousPageCacheMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -60,7 +68,7 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.TimedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -79,10 +87,29 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SQLite 동시 접속 설정
+# - WAL: 쓰는 동안에도 읽기가 막히지 않음 (journal_mode 는 DB 파일에 저장되지만 연결마다 확인)
+# - synchronous=NORMAL: WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않음 (전원 차단 시 마지막 커밋만 잃을 수 있음)
+# - timeout: 다른 연결이 쓰는 중이면 최대 이만큼(초) 기다림 (busy timeout)
+# - transaction_mode=IMMEDIATE: 트랜잭션 시작 시 바로 쓰기 잠금을 잡아서, 읽다가 쓰기로 바꿀 때
+#   busy timeout 을 무시하고 바로 "database is locked" 가 나는 경우를 없앰 (재시도는 core.db.atomic_with_retry)
+SQLITE_INIT_COMMAND = ';'.join([
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-20000',      # 약 20MB 페이지 캐시 (음수 = KiB)
+    'PRAGMA mmap_size=134217728',    # 128MB 메모리 매핑 읽기
+    'PRAGMA temp_store=MEMORY',
+])
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': SQLITE_INIT_COMMAND,
+        },
     }
 }
 
@@ -148,3 +175,137 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 # 위 SMTP 설정 대신 아래로 교체하면 됩니다
 # -------------------------------------------------------
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+
+# -------------------------------------------------------
+# 이메일 발송 대기열 (core.mail, manage.py send_emails)
+# 요청 안에서는 OutgoingEmail 에 쌓기만 하고 워커가 SMTP 연결 하나로 묶어서 보냅니다
+# -------------------------------------------------------
+EMAIL_RETRY_BACKOFF = 60          # 초 — 첫 실패 후 재시도까지, 이후 두 배씩
+EMAIL_RETRY_MAX_DELAY = 60 * 60   # 재시도 간격 최대값
+EMAIL_SENDING_TIMEOUT = 10 * 60   # 이 시간 넘게 '보내는 중'이면 워커가 죽은 것으로 보고 다시 대기로
+
+# -------------------------------------------------------
+# 이메일 인증 / 비밀번호 재설정 토큰 (users.tokens, manage.py purge_tokens)
+# -------------------------------------------------------
+SIGNED_USER_TOKENS = False                   # True 면 DB 에 저장하지 않는 서명+타임스탬프 토큰 (SECRET_KEY 로 서명)
+EMAIL_VERIFICATION_MAX_AGE = 60 * 60 * 24    # 초
+PASSWORD_RESET_MAX_AGE = 60 * 60             # 초
+UNVERIFIED_USER_MAX_AGE = 60 * 60 * 24 * 7   # 이 기간 동안 인증하지 않은 가입은 purge_tokens 가 삭제
+
+# -------------------------------------------------------
+# 음식점 목록 페이지네이션
+# -------------------------------------------------------
+# True 로 두면 페이지 바에 (5분 캐시된) 근사 전체 개수를 표시합니다
+RESTAURANT_LIST_APPROX_COUNT = False
+RESTAURANT_FACET_CACHE_TIMEOUT = 60 * 5   # 초 — 검색어별 카테고리/별점 개수 캐시 (restaurants.facets)
+
+# -------------------------------------------------------
+# 검색어 자동완성 (restaurants.autocomplete)
+# -------------------------------------------------------
+AUTOCOMPLETE_MAX_RESULTS = 10
+AUTOCOMPLETE_REBUILD_INTERVAL = 60 * 10   # 초 — 인기도(리뷰 수)와 다른 프로세스에서 등록된 음식점 반영 주기
+AUTOCOMPLETE_MAX_RECENT = 1000            # 만든 뒤 추가된 음식점이 이만큼 쌓이면 시간과 상관없이 새로 만든다
+
+# -------------------------------------------------------
+# 조회수 버퍼 (restaurants.viewcounts)
+# -------------------------------------------------------
+VIEW_COUNT_FLUSH_INTERVAL = 10     # 초 — 이 시간이 지나면 모인 조회수를 DB 에 반영
+VIEW_COUNT_FLUSH_THRESHOLD = 100   # 이만큼 쌓이면 시간과 상관없이 반영
+VIEW_COUNT_SORT_MAX_LAG = 2        # 조회수 순 정렬 시 허용하는 최대 지연 (초)
+VIEW_COUNT_BACKGROUND_FLUSH = not TESTING   # 조회가 끊겨도 주기마다 반영하는 타이머 (테스트 DB 트랜잭션과 부딪히지 않게 테스트에서는 끔)
+
+# -------------------------------------------------------
+# 상세 페이지 리뷰 섹션 캐시 (restaurants.fragments)
+# -------------------------------------------------------
+REVIEW_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24  # 초 — 리뷰가 바뀌면 버전 키가 바뀌므로 길게 둬도 됨
+
+# -------------------------------------------------------
+# 인기 맛집 순위 (restaurants.trending, manage.py update_trending)
+# -------------------------------------------------------
+TRENDING_WINDOW_DAYS = 14      # 최근 리뷰/즐겨찾기를 이 기간만 집계
+TRENDING_HALF_LIFE_DAYS = 3    # 이만큼 지난 리뷰/즐겨찾기는 절반만 반영
+TRENDING_SIZE = 50             # 순위 테이블에 저장할 개수
+TRENDING_CACHE_TIMEOUT = 60 * 10
+FEATURED_RESTAURANTS = 6       # 홈 화면에 보여줄 개수
+
+# -------------------------------------------------------
+# 비슷한 음식점 추천 (restaurants.recommendations, manage.py update_recommendations)
+# -------------------------------------------------------
+RECOMMENDATION_NEIGHBORS = 6             # 음식점마다 저장/표시할 이웃 수
+RECOMMENDATION_MIN_RATING = 4            # 이 별점 이상 리뷰도 즐겨찾기처럼 "좋아요"로 본다
+RECOMMENDATION_MIN_COMMON_USERS = 2      # 함께 좋아한 사용자가 이보다 적으면 이웃으로 치지 않는다 (우연 배제)
+RECOMMENDATION_MAX_USER_LIKES = 500      # 이보다 많이 좋아한 사용자는 "함께 좋아한 수"에서 뺀다
+RECOMMENDATION_QUEUE_FLUSH_INTERVAL = 5     # 초 — 즐겨찾기/리뷰 변경을 모았다가 재계산 대기열에 쌓는 주기
+RECOMMENDATION_QUEUE_FLUSH_THRESHOLD = 100  # 이만큼의 사용자가 모이면 주기와 상관없이 쌓는다
+RECOMMENDATION_QUEUE_BACKGROUND_FLUSH = not TESTING   # 주기 타이머 (테스트에서는 끄고 직접 flush)
+
+# -------------------------------------------------------
+# 예약 (mypage.reservations, manage.py generate_slots)
+# -------------------------------------------------------
+RESERVATION_DAYS_AHEAD = 14      # 오늘부터 이 날 수만큼 시간대를 미리 만들고 예약을 받는다
+RESERVATION_MAX_PARTY_SIZE = 8   # 한 번에 예약할 수 있는 최대 인원
+
+# -------------------------------------------------------
+# 이미지 변환본 (core.images, manage.py process_images)
+# -------------------------------------------------------
+IMAGE_VARIANT_WIDTHS = [320, 640, 1280]
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_RETRY_BACKOFF = 60              # 초 — 변환 첫 실패 후 재시도까지, 이후 두 배씩
+IMAGE_RETRY_MAX_DELAY = 60 * 60       # 재시도 간격 최대값
+IMAGE_PROCESSING_TIMEOUT = 10 * 60    # 이 시간 넘게 '처리 중'이면 워커가 죽은 것으로 보고 다시 대기로
+
+# -------------------------------------------------------
+# 요청 측정 (core.middleware.RequestMetricsMiddleware)
+# -------------------------------------------------------
+REQUEST_METRICS_HEADERS = DEBUG          # X-Query-Count, X-SQL-Time-Ms 등 응답 헤더 추가
+# @query_budget 초과 시 예외 — 테스트에서만 (개발 서버는 경고 로그만, 필요하면 QUERY_BUDGET_STRICT=1 로 켠다)
+QUERY_BUDGET_STRICT = TESTING or os.environ.get('QUERY_BUDGET_STRICT') == '1'
+TEST_RUNNER = 'core.test_runner.TestRunner'   # 테스트 DB 삭제 전 조회수 버퍼 비우기
+
+# -------------------------------------------------------
+# 캐시 — 모든 워커 프로세스가 같이 쓰는 저장소
+# -------------------------------------------------------
+# 페이지 캐시 태그 버전/재생성 잠금(core.pagecache), 즐겨찾기 id(favorites.cache) 등은 쓰기를 처리한 워커뿐 아니라
+# 모든 워커가 같은 값을 봐야 하므로 프로세스마다 따로인 LocMemCache(Django 기본값)는 쓰지 않는다.
+# REDIS_URL 이 있으면 Redis (서버 여러 대), 없으면 같은 서버의 파일 캐시 (core.cache.FileCache)
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.FileCache',
+            # 테스트는 실행마다 빈 캐시에서 시작
+            'LOCATION': (
+                os.path.join(tempfile.gettempdir(), f'localeats-test-cache-{os.getpid()}') if TESTING
+                else BASE_DIR / '.cache'
+            ),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+    }
+
+# -------------------------------------------------------
+# 쓰기 잠금 충돌 재시도 (core.db.atomic_with_retry)
+# -------------------------------------------------------
+DB_WRITE_RETRY_ATTEMPTS = 5
+DB_WRITE_RETRY_BACKOFF = 0.05   # 초 — 첫 재시도 대기, 이후 두 배씩
+
+# -------------------------------------------------------
+# async 읽기 뷰 (목록/상세/리뷰 목록/즐겨찾기 목록)
+# -------------------------------------------------------
+# config/asgi.py 로 ASGI 서버(uvicorn, daphne 등)에서 띄울 때 켠다.
+# WSGI 에서 켜면 요청마다 이벤트 루프를 새로 만들어서 오히려 느려진다 (manage.py benchmark_asgi)
+ASYNC_READ_VIEWS = False
+
+# -------------------------------------------------------
+# 비로그인 페이지 캐시 (core.pagecache)
+# -------------------------------------------------------
+# 홈 / 음식점 목록·상세 / 리뷰 목록의 비로그인 GET 응답을 통째로 캐시 (쓰기 뷰가 태그로 무효화)
+ANONYMOUS_PAGE_CACHE = not TESTING
+ANONYMOUS_PAGE_CACHE_TIMEOUT = 60           # 초 — 이 동안은 그대로 보냄
+ANONYMOUS_PAGE_CACHE_STALE = 60 * 10        # 초 — 그 뒤로도 이만큼은 보관해서, 한 요청이 다시 만드는 동안 이전 응답을 보냄
+ANONYMOUS_PAGE_CACHE_LOCK_TIMEOUT = 30      # 초 — 다시 만들던 요청이 죽었을 때 잠금이 풀리는 시간
@@ -27,6 +27,7 @@ urlpatterns = [
     path("favorites/", include("favorites.urls")),
     path("users/", include("users.urls")),
     path('mypage/', include('mypage.urls')),
+    path("api/", include("api.urls")),
 ]
 
 if settings.DEBUG:
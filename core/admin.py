@@ -1,3 +1,21 @@
 from django.contrib import admin
+from django.utils import timezone
+from .models import OutgoingEmail, ProcessedImage
 
-# Register your models here.
+admin.site.register(ProcessedImage)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at", "created_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    actions = ["requeue"]
+
+    # 실패(dead letter) 메일을 원인 해결 후 다시 보내기
+    @admin.action(description="선택한 메일 다시 보내기")
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status=OutgoingEmail.SENT).update(
+            status=OutgoingEmail.PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"{count}개를 발송 대기로 돌렸어요.")
@@ -0,0 +1,24 @@
+import os
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+# 같은 서버의 워커 프로세스들이 같이 쓰는 파일 캐시 (settings.CACHES — REDIS_URL 이 없을 때)
+# Django 의 FileBasedCache.add() 는 "있는지 확인 → 쓰기" 라서 두 프로세스가 동시에 부르면 둘 다 성공할 수 있다.
+# 페이지 캐시 재생성 잠금(core.pagecache)이 add() 로 한 요청만 고르므로, 캐시 폴더의 잠금 파일로 확인과 쓰기를 묶는다.
+ADD_LOCK_FILE = "add.lock"
+
+
+class FileCache(FileBasedCache):
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._createdir()
+        with open(os.path.join(self._dir, ADD_LOCK_FILE), "ab") as lock_file:
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                if self.has_key(key, version):
+                    return False
+                self.set(key, value, timeout, version)
+                return True
+            finally:
+                locks.unlock(lock_file)
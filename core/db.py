@@ -0,0 +1,41 @@
+import random
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+# SQLite 쓰기 잠금 충돌
+# - settings.DATABASES 의 OPTIONS(WAL, busy timeout, BEGIN IMMEDIATE)로 대부분은 기다렸다가 처리되지만,
+#   timeout 을 넘기면 "database is locked" 가 난다. 쓰기 트랜잭션은 atomic_with_retry 로 감싸서
+#   지수 백오프(+지터) 후 트랜잭션 전체를 다시 실행한다.
+# - BEGIN IMMEDIATE 라서 잠금 충돌은 트랜잭션 시작 시점에 나므로 다시 실행해도 중복 쓰기가 생기지 않는다.
+LOCK_ERRORS = ("database is locked", "database table is locked")
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and any(message in str(exc) for message in LOCK_ERRORS)
+
+
+def atomic_with_retry(func=None, *, using=None, attempts=None, backoff=None):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            max_attempts = attempts or getattr(settings, "DB_WRITE_RETRY_ATTEMPTS", 5)
+            delay = backoff if backoff is not None else getattr(settings, "DB_WRITE_RETRY_BACKOFF", 0.05)
+            # 바깥 트랜잭션 안에서 불리면 그 트랜잭션에 합류 (잠금 충돌 시 바깥 트랜잭션 전체를 다시 해야 하므로 재시도 불가)
+            if connections[using or DEFAULT_DB_ALIAS].in_atomic_block:
+                return func(*args, **kwargs)
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    with transaction.atomic(using=using):
+                        return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_error(exc) or attempt == max_attempts:
+                        raise
+                    time.sleep(delay * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
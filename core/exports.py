@@ -0,0 +1,82 @@
+import csv
+from datetime import datetime, time
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+# 내보내기 대상 — 필요한 컬럼만 values_list 로 읽는다 (헤더는 "category__name" → "category")
+# timestamp: --since 증분 기준 컬럼 (인덱스 있음: review_created_idx, restaurant_updated_idx)
+EXPORTS = {
+    "restaurants": {
+        "model": "restaurants.Restaurant",
+        "fields": [
+            "id", "name", "category__name", "address", "phone", "lat", "lng",
+            "avg_rating", "review_count", "view_count", "created_at", "updated_at",
+        ],
+        "timestamp": "updated_at",
+    },
+    "reviews": {
+        "model": "reviews.Review",
+        "fields": ["id", "restaurant_id", "author_id", "rating", "content", "created_at"],
+        "timestamp": "created_at",
+    },
+}
+FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+
+
+# "2026-01-01" / "2026-01-01T09:00" → aware datetime (날짜만 있으면 그날 0시), 잘못된 값은 ValueError
+def parse_since(value):
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"날짜 형식이 아니에요: {value}")
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+# since_id 보다 큰 id / since 이후 행만 (증분) — id 순, since 가 있으면 기준 컬럼 순
+def export_queryset(name, since_id=None, since=None):
+    spec = EXPORTS[name]
+    qs = apps.get_model(spec["model"]).objects.all()
+    ordering = ["pk"]
+    if since_id:
+        qs = qs.filter(pk__gt=since_id)
+    if since:
+        qs = qs.filter(**{f"{spec['timestamp']}__gte": since})
+        ordering = [spec["timestamp"], "pk"]
+    return qs.order_by(*ordering).values_list(*spec["fields"])
+
+
+def headers(name):
+    return [field.split("__")[0] for field in EXPORTS[name]["fields"]]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# 내보낼 줄(문자열)을 하나씩 만든다 — .iterator() 로 chunk_size 행씩만 메모리에 올린다
+def export_lines(name, file_format, since_id=None, since=None, chunk_size=2000):
+    fields = headers(name)
+    rows = export_queryset(name, since_id, since).iterator(chunk_size=chunk_size)
+    if file_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow([_csv_value(value) for value in row])
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(dict(zip(fields, row))) + "\n"
@@ -0,0 +1,199 @@
+import hashlib
+from datetime import timedelta
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import ProcessedImage
+
+# 업로드 이미지 변환 파이프라인
+# 1) 업로드한 뷰가 enqueue_variants(field_file) 로 작업 등록
+# 2) process_images 커맨드(백그라운드 워커)가 폭별 WebP 변환본을 내용 해시 파일명으로 저장
+# 3) 템플릿은 {% responsive_img %} 로 srcset 출력 — 변환 전에는 원본을 그대로 사용
+#    이미지가 여러 개인 페이지는 뷰에서 prefetch_variants() 로 한 번에 읽어 둔다 (이미지마다 쿼리하지 않도록)
+# 4) 이 파이프라인 이전에 올라온 이미지는 manage.py process_images --backfill 로 작업 등록
+DONE_CACHE_TIMEOUT = 60 * 60 * 24
+PENDING_CACHE_TIMEOUT = 60
+
+# 변환본이 새로 생긴 원본 파일 이름 목록과 함께 전송 (sources=[...]) — 렌더링 캐시 무효화용
+variants_ready = Signal()
+
+
+def variant_widths():
+    return sorted(getattr(settings, "IMAGE_VARIANT_WIDTHS", [320, 640, 1280]))
+
+
+def _cache_key(source):
+    return "images:variants:" + hashlib.md5(source.encode()).hexdigest()
+
+
+def enqueue_variants(field_file):
+    if not field_file:
+        return
+    ProcessedImage.objects.get_or_create(source=field_file.name)
+
+
+# 작업이 없는 기존 이미지(음식점 썸네일, 리뷰 사진)를 전부 등록 → 등록한 수
+def backfill_variants(batch_size=1000):
+    from restaurants.models import Restaurant
+    from reviews.models import Review
+
+    created = 0
+    for model, field in [(Restaurant, "thumbnail"), (Review, "photo")]:
+        sources = (
+            model.objects.exclude(**{f"{field}__isnull": True}).exclude(**{field: ""}).exclude(**{f"{field}__in": ProcessedImage.objects.values("source")})
+            .order_by().values_list(field, flat=True).distinct()
+        )
+        sources = sources.iterator(chunk_size=batch_size)
+        while batch := list(islice(sources, batch_size)):
+            ProcessedImage.objects.bulk_create([ProcessedImage(source=source) for source in batch], ignore_conflicts=True)
+            created += len(batch)
+    return created
+
+
+def _cache_variants(rows):
+    done = {_cache_key(source): variants for source, variants in rows.items() if variants}
+    pending = {_cache_key(source): variants for source, variants in rows.items() if not variants}
+    cache.set_many(done, DONE_CACHE_TIMEOUT)
+    cache.set_many(pending, PENDING_CACHE_TIMEOUT)
+
+
+def _int_widths(variants):
+    return {int(width): name for width, name in variants.items()}
+
+
+# 원본 파일 이름 → {폭: 변환본 이름} (없으면 빈 dict, 캐시 사용)
+def get_variants(source):
+    variants = cache.get(_cache_key(source))
+    if variants is None:
+        variants = (
+            ProcessedImage.objects.filter(source=source, status=ProcessedImage.DONE)
+            .values_list("variants", flat=True)
+            .first()
+        ) or {}
+        _cache_variants({source: variants})
+    return _int_widths(variants)
+
+
+# 여러 이미지(FieldFile)의 변환본을 한 번에 읽어 각 파일에 붙여 둔다 — 캐시 get_many 1번 + 캐시에 없는 것만 쿼리 1번
+# responsive_img 는 붙여 둔 값을 쓴다 (모델 인스턴스가 같은 FieldFile 을 계속 돌려주므로 템플릿에서도 그대로 보인다)
+def prefetch_variants(files):
+    files = [field_file for field_file in files if field_file]
+    if not files:
+        return
+    keys = {field_file.name: _cache_key(field_file.name) for field_file in files}
+    cached = cache.get_many(list(keys.values()))
+    found = {source: cached[key] for source, key in keys.items() if key in cached}
+    missing = [source for source in keys if source not in found]
+    if missing:
+        rows = dict(
+            ProcessedImage.objects.filter(source__in=missing, status=ProcessedImage.DONE)
+            .values_list("source", "variants")
+        )
+        rows = {source: rows.get(source) or {} for source in missing}
+        _cache_variants(rows)
+        found.update(rows)
+    for field_file in files:
+        field_file.prefetched_variants = _int_widths(found[field_file.name])
+
+
+def variants_for(field_file):
+    prefetched = getattr(field_file, "prefetched_variants", None)
+    return prefetched if prefetched is not None else get_variants(field_file.name)
+
+
+def build_variants(data):
+    from PIL import Image, ImageOps
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+    quality = getattr(settings, "IMAGE_VARIANT_QUALITY", 80)
+    variants = {}
+    for width in variant_widths():
+        # 원본보다 크게 키우지 않는다 (원본이 작으면 원본 폭 하나만)
+        target = min(width, image.width)
+        name = f"variants/{content_hash[:2]}/{content_hash}-{target}.webp"
+        if not default_storage.exists(name):
+            resized = image.copy()
+            resized.thumbnail((target, image.height), Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, "WEBP", quality=quality, method=4)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+        variants[str(target)] = name
+        if target == image.width:
+            break
+    return content_hash, variants
+
+
+def process_image(job):
+    with default_storage.open(job.source, "rb") as f:
+        data = f.read()
+    job.content_hash, job.variants = build_variants(data)
+    job.status = ProcessedImage.DONE
+    job.error = ""
+    job.save(update_fields=["content_hash", "variants", "status", "error", "updated_at"])
+    cache.delete(_cache_key(job.source))
+
+
+# n 번째 실패 후 다시 시도하기까지 기다릴 시간 (1분, 2분, 4분 ... 최대 IMAGE_RETRY_MAX_DELAY)
+def retry_delay(attempts):
+    base = getattr(settings, "IMAGE_RETRY_BACKOFF", 60)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), getattr(settings, "IMAGE_RETRY_MAX_DELAY", 3600)))
+
+
+def _mark_failed(job, error, max_attempts):
+    job.attempts += 1
+    job.error = f"{type(error).__name__}: {error}"
+    if job.attempts >= max_attempts:
+        job.status = ProcessedImage.FAILED
+    else:
+        job.status = ProcessedImage.PENDING
+        job.next_attempt_at = timezone.now() + retry_delay(job.attempts)
+    job.save(update_fields=["attempts", "status", "error", "next_attempt_at", "updated_at"])
+
+
+# 처리할 때가 된 작업을 batch_size 개까지 처리 → (성공, 실패) 개수
+# max_attempts 번 실패하면 FAILED 로 남겨 더 이상 재시도하지 않는다 (dead letter)
+def process_pending(batch_size=20, max_attempts=3):
+    now = timezone.now()
+
+    # 처리하다가 워커가 죽어서 PROCESSING 으로 남은 작업은 다시 대기로
+    stale = now - timedelta(seconds=getattr(settings, "IMAGE_PROCESSING_TIMEOUT", 600))
+    ProcessedImage.objects.filter(status=ProcessedImage.PROCESSING, updated_at__lt=stale).update(
+        status=ProcessedImage.PENDING, updated_at=now
+    )
+
+    done = failed = 0
+    ready = []
+    ids = list(
+        ProcessedImage.objects.filter(status=ProcessedImage.PENDING, next_attempt_at__lte=now)
+        .order_by("id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    for pk in ids:
+        # 다른 워커가 먼저 가져간 작업은 건너뛴다
+        claimed = ProcessedImage.objects.filter(pk=pk, status=ProcessedImage.PENDING).update(
+            status=ProcessedImage.PROCESSING, updated_at=timezone.now()
+        )
+        if not claimed:
+            continue
+        job = ProcessedImage.objects.get(pk=pk)
+        try:
+            process_image(job)
+            ready.append(job.source)
+            done += 1
+        except Exception as e:
+            _mark_failed(job, e, max_attempts)
+            failed += 1
+    if ready:
+        variants_ready.send(sender=ProcessedImage, sources=ready)
+    return done, failed
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+# 이메일 발송 예약 — 실제 발송은 manage.py send_emails 워커가 한다
+def enqueue_email(subject, body, to, html_body="", from_email=None):
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or "",
+        to=list(to),
+    )
+
+
+def build_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+# n 번째 실패 후 다시 시도하기까지 기다릴 시간 (1분, 2분, 4분 ... 최대 EMAIL_RETRY_MAX_DELAY)
+def retry_delay(attempts):
+    base = getattr(settings, "EMAIL_RETRY_BACKOFF", 60)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), getattr(settings, "EMAIL_RETRY_MAX_DELAY", 3600)))
+
+
+def _mark_failed(email, error, max_attempts):
+    email.attempts += 1
+    email.error = f"{type(error).__name__}: {error}"
+    if email.attempts >= max_attempts:
+        email.status = OutgoingEmail.FAILED  # 더 이상 재시도하지 않음 (관리자에서 확인 후 다시 대기로)
+    else:
+        email.status = OutgoingEmail.PENDING
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=["attempts", "error", "status", "next_attempt_at", "updated_at"])
+
+
+# 보낼 때가 된 메일을 batch_size 개까지 SMTP 연결 하나로 보낸다 → (보낸 수, 실패 수)
+def send_pending(batch_size=50, max_attempts=5):
+    now = timezone.now()
+
+    # 보내다가 워커가 죽어서 SENDING 으로 남은 메일은 다시 대기로
+    stale = now - timedelta(seconds=getattr(settings, "EMAIL_SENDING_TIMEOUT", 600))
+    OutgoingEmail.objects.filter(status=OutgoingEmail.SENDING, updated_at__lt=stale).update(
+        status=OutgoingEmail.PENDING, updated_at=now
+    )
+
+    ids = list(
+        OutgoingEmail.objects.filter(status=OutgoingEmail.PENDING, next_attempt_at__lte=now)
+        .order_by("id")
+        .values_list("id", flat=True)[:batch_size]
+    )
+    emails = []
+    for pk in ids:
+        # 다른 워커가 먼저 가져간 메일은 건너뛴다
+        claimed = OutgoingEmail.objects.filter(pk=pk, status=OutgoingEmail.PENDING).update(
+            status=OutgoingEmail.SENDING, updated_at=now
+        )
+        if claimed:
+            emails.append(OutgoingEmail.objects.get(pk=pk))
+    if not emails:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # 메일 서버에 연결조차 못 하면 이번 배치 전체를 재시도 대기로
+        for email in emails:
+            _mark_failed(email, e, max_attempts)
+        return 0, len(emails)
+
+    try:
+        for email in emails:
+            try:
+                connection.send_messages([build_message(email, connection)])
+            except Exception as e:
+                _mark_failed(email, e, max_attempts)
+                failed += 1
+                continue
+            email.status = OutgoingEmail.SENT
+            email.sent_at = timezone.now()
+            email.error = ""
+            email.save(update_fields=["status", "sent_at", "error", "updated_at"])
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
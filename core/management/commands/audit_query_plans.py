@@ -0,0 +1,149 @@
+import re
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, F
+from django.utils import timezone
+
+from favorites.models import Favorite
+from mypage.models import Reservation, ReservationSlot
+from restaurants.geo import cell_filter
+from restaurants.models import Restaurant, TrendingRestaurant
+from restaurants.pagination import _after
+from restaurants.search import search_restaurants
+from restaurants.views import PAGE_SIZE, SORT_ORDERINGS
+from reviews.models import Review
+from reviews.views import FEED_PAGE_SIZE, feed_queryset
+from users.models import EmailVerificationToken, PasswordResetToken
+
+# "SCAN 테이블" 뒤에 USING (COVERING) INDEX 가 없으면 테이블 전체 스캔
+FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)(\S+)(?: AS \S+)?\s*$")
+TEMP_BTREE = "USE TEMP B-TREE"
+FTS_MATCH = "VIRTUAL TABLE INDEX"
+
+
+# 뷰/작업에서 실제로 실행하는 핫 쿼리 (라벨, queryset)
+def hot_queries():
+    restaurant = Restaurant.objects.order_by("-id").first()
+    restaurant_id = restaurant.pk if restaurant else 1
+    category_id = (restaurant.category_id if restaurant else None) or 1
+    user_id = Favorite.objects.values_list("user_id", flat=True).first() or 1
+    restaurants = Restaurant.objects.select_related("category")
+
+    queries = []
+    for sort in ["latest", "rating", "reviews", "views"]:
+        ordering = SORT_ORDERINGS[sort]
+        queries.append((f"restaurant_list sort={sort}", restaurants.order_by(*ordering)[:PAGE_SIZE + 1]))
+        # 다음 페이지 커서 (첫 행 값 기준)
+        values = [1] * len(ordering)
+        queries.append((
+            f"restaurant_list sort={sort} cursor",
+            restaurants.filter(_after(ordering, values)).order_by(*ordering)[:PAGE_SIZE + 1],
+        ))
+    queries += [
+        ("restaurant_list category",
+         restaurants.filter(category_id=category_id).order_by(*SORT_ORDERINGS["latest"])[:PAGE_SIZE + 1]),
+        ("restaurant_list search",
+         search_restaurants(restaurants, "국밥집")[0].order_by(*SORT_ORDERINGS["relevance"])[:PAGE_SIZE + 1]),
+        ("restaurant_list search sort=latest",
+         search_restaurants(restaurants, "국밥집")[0].order_by(*SORT_ORDERINGS["latest"])[:PAGE_SIZE + 1]),
+        ("restaurant_list near", restaurants.filter(cell_filter(37.5665, 126.9780, 5))),
+        ("restaurant_detail", restaurants.filter(pk=restaurant_id)),
+        ("restaurant_detail reviews",
+         Review.objects.filter(restaurant_id=restaurant_id).select_related("author").order_by("-created_at")),
+        ("review_feed", feed_queryset({})[0].order_by("-id")[:FEED_PAGE_SIZE + 1]),
+        ("review_feed restaurant",
+         feed_queryset({"restaurant": str(restaurant_id)})[0].order_by("-id")[:FEED_PAGE_SIZE + 1]),
+        ("review_feed rating", feed_queryset({"rating": "5"})[0].order_by("-id")[:FEED_PAGE_SIZE + 1]),
+        ("review_feed category",
+         feed_queryset({"category": str(category_id)})[0].order_by("-id")[:FEED_PAGE_SIZE + 1]),
+        ("favorite_list",
+         Favorite.objects.filter(user_id=user_id).select_related("restaurant__category").order_by("-created_at")),
+        ("mypage reviews",
+         Review.objects.filter(author_id=user_id).select_related("restaurant").order_by("-created_at")),
+        ("rating stats",
+         Review.objects.filter(restaurant_id__in=[restaurant_id]).order_by()
+         .values("restaurant_id", "rating").annotate(n=Count("id"))),
+        ("reservation slots",
+         ReservationSlot.objects.filter(
+             restaurant_id=restaurant_id, starts_at__gt=timezone.now(), starts_at__lt=timezone.now() + timedelta(days=14),
+             booked__lte=F("capacity") - 2,
+         ).order_by("starts_at")),
+        ("mypage reservations",
+         Reservation.objects.filter(user_id=user_id, reserved_at__gte=timezone.now())
+         .select_related("restaurant").order_by("reserved_at")),
+        ("featured restaurants", TrendingRestaurant.objects.select_related("restaurant__category").order_by("rank")[:6]),
+        # manage.py purge_tokens 배치 (pk 순서로 끊어 읽기)
+        ("token purge",
+         EmailVerificationToken.objects.filter(created_at__lt=timezone.now() - timedelta(hours=24), pk__gt=0)
+         .order_by("pk").values_list("pk", flat=True)[:500]),
+        ("reset token purge",
+         PasswordResetToken.objects.filter(created_at__lt=timezone.now() - timedelta(hours=1), pk__gt=0)
+         .order_by("pk").values_list("pk", flat=True)[:500]),
+        ("unverified user purge",
+         User.objects.filter(is_active=False, last_login__isnull=True, is_staff=False, pk__gt=0)
+         .order_by("pk").values_list("pk", flat=True)[:500]),
+    ]
+    return queries
+
+
+# id 순서 + LIMIT 쿼리는 "SCAN 테이블" 로 나오지만 rowid 순서로 읽다가 LIMIT 에서 멈추므로 전체 스캔이 아니다
+def rowid_ordered_table(queryset):
+    query = queryset.query
+    if query.high_mark is None or not query.order_by:
+        return None
+    if query.order_by[0].lstrip("-") not in ("id", "pk"):
+        return None
+    return queryset.model._meta.db_table
+
+
+# 실행 계획 한 줄마다 문제(전체 스캔 / 임시 B-tree 정렬)를 찾는다
+# 검색 인덱스(FTS 가상 테이블)의 MATCH 에서 시작하는 쿼리는 검색 결과만 정렬하므로 임시 B-tree 를 허용한다
+def plan_problems(plan, bounded_table=None):
+    problems = []
+    sorts_matches_only = FTS_MATCH in plan
+    for line in plan.splitlines():
+        match = FULL_SCAN.search(line)
+        if match and match.group(1) != bounded_table:
+            problems.append(f"전체 스캔: {match.group(1)}")
+        if TEMP_BTREE in line and not sorts_matches_only:
+            problems.append(f"임시 B-tree: {line.split(TEMP_BTREE, 1)[1].strip()}")
+    return problems
+
+
+class Command(BaseCommand):
+    help = (
+        "주요 쿼리의 EXPLAIN QUERY PLAN 을 확인해 전체 테이블 스캔이나 임시 B-tree 정렬이 있으면 알려줍니다. "
+        "문제가 있으면 0 이 아닌 코드로 종료하므로 배포 전 검사에 쓸 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="문제가 없어도 모든 실행 계획을 출력합니다.")
+        parser.add_argument("--only", nargs="*", help="라벨에 이 문자열이 들어간 쿼리만 검사합니다.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN 검사는 SQLite 에서만 지원해요.")
+
+        flagged = 0
+        for label, queryset in hot_queries():
+            if options["only"] and not any(part in label for part in options["only"]):
+                continue
+            plan = queryset.explain()
+            problems = plan_problems(plan, rowid_ordered_table(queryset))
+            if problems:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f"[!] {label}"))
+                for problem in problems:
+                    self.stdout.write(f"    {problem}")
+            else:
+                self.stdout.write(f"[ok] {label}")
+            if problems or options["verbose_plans"]:
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+
+        if flagged:
+            raise CommandError(f"실행 계획에 문제가 있는 쿼리 {flagged}개")
+        self.stdout.write(self.style.SUCCESS("모든 쿼리가 인덱스를 사용합니다."))
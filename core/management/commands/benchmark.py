@@ -0,0 +1,189 @@
+import json
+import random
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.metrics import percentile
+from favorites.models import Favorite
+from restaurants.models import Restaurant
+from restaurants.pagination import paginate_keyset
+from restaurants.views import PAGE_SIZE, SORT_ORDERINGS
+
+
+class Command(BaseCommand):
+    help = (
+        "주요 페이지(목록 정렬별/검색/주변/상세/즐겨찾기/리뷰 피드)에 요청을 반복해 "
+        "처리량과 p50/p99 응답 시간을 측정합니다. --save/--compare 로 이전 실행과 비교할 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="시나리오별 측정 요청 수")
+        parser.add_argument("--warmup", type=int, default=5, help="시나리오별 측정 전 예열 요청 수")
+        parser.add_argument("--query", default="국밥집", help="검색 시나리오 검색어")
+        parser.add_argument("--only", nargs="*", help="실행할 시나리오 이름")
+        parser.add_argument("--base-url", help="실행 중인 서버 주소 (없으면 테스트 클라이언트로 프로세스 안에서 호출)")
+        parser.add_argument("--concurrency", type=int, default=1, help="--base-url 사용 시 동시 요청 수")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--save", help="결과를 JSON 파일로 저장")
+        parser.add_argument("--compare", help="이전에 --save 한 JSON 과 p50/p99 비교")
+
+    def scenarios(self, options):
+        rng = random.Random(options["seed"])
+        list_url = reverse("restaurants:list")
+        ids = list(Restaurant.objects.order_by("-review_count").values_list("pk", flat=True)[:1000])
+        if not ids:
+            raise CommandError("음식점이 없어요. 먼저 manage.py generate_data 로 데이터를 만들어 주세요.")
+        center = Restaurant.objects.filter(lat__isnull=False).values_list("lat", "lng").first()
+
+        scenarios = {
+            f"list:{sort}": (lambda sort=sort: f"{list_url}?{urlencode({'sort': sort})}", False)
+            for sort in ["latest", "rating", "reviews", "views"]
+        }
+        scenarios["list:page5"] = (lambda: self.nth_page_url(list_url, 5), False)
+        scenarios["search"] = (lambda: f"{list_url}?{urlencode({'q': options['query']})}", False)
+        if center:
+            scenarios["near"] = (lambda: f"{list_url}?{urlencode({'lat': center[0], 'lng': center[1]})}", False)
+        scenarios["detail"] = (lambda: reverse("restaurants:detail", args=[rng.choice(ids)]), False)
+        scenarios["favorites"] = (lambda: reverse("favorites:list"), True)
+        scenarios["review_feed"] = (lambda: reverse("reviews:feed"), False)
+        scenarios["review_list"] = (lambda: reverse("reviews:list"), False)
+
+        if options["only"]:
+            unknown = set(options["only"]) - set(scenarios)
+            if unknown:
+                raise CommandError(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+            scenarios = {name: scenarios[name] for name in options["only"]}
+        return scenarios
+
+    # 커서 페이지네이션이라 n 번째 페이지 커서는 앞 페이지를 따라가서 구한다
+    def nth_page_url(self, list_url, n):
+        if not hasattr(self, "_page_url"):
+            ordering = SORT_ORDERINGS["latest"]
+            qs = Restaurant.objects.select_related("category")
+            cursor = ""
+            for _ in range(n - 1):
+                page = paginate_keyset(qs, ordering, cursor=cursor, per_page=PAGE_SIZE)
+                if not page.has_next():
+                    break
+                cursor = page.next_cursor
+            self._page_url = f"{list_url}?{urlencode({'cursor': cursor})}" if cursor else list_url
+        return self._page_url
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests 는 1 이상이어야 해요.")
+        # 테스트 클라이언트 호스트 허용 + X-Query-Count 헤더로 쿼리 수 수집
+        with override_settings(ALLOWED_HOSTS=["*"], REQUEST_METRICS_HEADERS=True):
+            results = self.run(options)
+
+        self.report(results)
+        if options["compare"]:
+            self.compare(results, options["compare"])
+        if options["save"]:
+            with open(options["save"], "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과 저장: {options['save']}")
+
+    def run(self, options):
+        user = None
+        favorite = Favorite.objects.order_by("user_id").values_list("user_id", flat=True).first()
+        if favorite:
+            user = User.objects.get(pk=favorite)
+
+        results = {}
+        for name, (make_url, needs_login) in self.scenarios(options).items():
+            if needs_login and user is None:
+                self.stderr.write(f"{name}: 즐겨찾기가 있는 회원이 없어 건너뛰어요.")
+                continue
+            if options["base_url"]:
+                if needs_login:
+                    self.stderr.write(f"{name}: --base-url 에서는 로그인 시나리오를 건너뛰어요.")
+                    continue
+                fetch = self.http_fetcher(options["base_url"])
+            else:
+                fetch = self.client_fetcher(user if needs_login else None)
+
+            for _ in range(options["warmup"]):
+                fetch(make_url())
+            urls = [make_url() for _ in range(options["requests"])]
+
+            started = time.perf_counter()
+            if options["base_url"] and options["concurrency"] > 1:
+                with ThreadPoolExecutor(options["concurrency"]) as pool:
+                    samples = list(pool.map(fetch, urls))
+            else:
+                samples = [fetch(url) for url in urls]
+            wall = time.perf_counter() - started
+
+            times = sorted(elapsed for elapsed, _ in samples)
+            queries = [count for _, count in samples if count is not None]
+            results[name] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / wall, 1) if wall else 0,
+                "p50_ms": round(percentile(times, 50) * 1000, 2),
+                "p99_ms": round(percentile(times, 99) * 1000, 2),
+                "queries": round(sum(queries) / len(queries), 1) if queries else None,
+            }
+        return results
+
+    def client_fetcher(self, user):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+
+        def fetch(url):
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+            if response.status_code != 200:
+                raise CommandError(f"{url}: HTTP {response.status_code}")
+            return elapsed, int(response["X-Query-Count"]) if "X-Query-Count" in response else None
+
+        return fetch
+
+    def http_fetcher(self, base_url):
+        base_url = base_url.rstrip("/")
+
+        def fetch(url):
+            started = time.perf_counter()
+            with urllib.request.urlopen(base_url + url) as response:
+                response.read()
+                count = response.headers.get("X-Query-Count")
+            return time.perf_counter() - started, int(count) if count else None
+
+        return fetch
+
+    def report(self, results):
+        self.stdout.write(f"{'시나리오':<14}{'요청':>6}{'req/s':>9}{'p50(ms)':>10}{'p99(ms)':>10}{'쿼리':>6}")
+        for name, row in results.items():
+            queries = "-" if row["queries"] is None else row["queries"]
+            self.stdout.write(
+                f"{name:<16}{row['requests']:>6}{row['rps']:>9}{row['p50_ms']:>10}{row['p99_ms']:>10}{queries:>6}"
+            )
+
+    def compare(self, results, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"비교할 결과 파일을 읽을 수 없어요: {e}")
+        self.stdout.write(f"\n이전 실행({path}) 대비 p50 / p99 변화")
+        for name, row in results.items():
+            old = previous.get(name)
+            if not old:
+                continue
+            self.stdout.write(
+                f"{name:<16}{self.delta(old['p50_ms'], row['p50_ms']):>10}{self.delta(old['p99_ms'], row['p99_ms']):>10}"
+            )
+
+    def delta(self, old, new):
+        if not old:
+            return "-"
+        return f"{(new - old) / old * 100:+.1f}%"
@@ -0,0 +1,172 @@
+import asyncio
+import importlib
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.core.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import clear_url_caches, reverse
+
+from core.metrics import percentile
+from restaurants.models import Restaurant
+
+# ASYNC_READ_VIEWS 는 URLconf 를 불러올 때 읽으므로 바꾼 뒤 다시 불러온다
+URL_MODULES = ["restaurants.urls", "reviews.urls", "favorites.urls", "config.urls"]
+
+
+def reload_urlconfs():
+    for name in URL_MODULES:
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+class Command(BaseCommand):
+    help = (
+        "느린 클라이언트가 동시에 많이 붙는 상황에서 WSGI(스레드 워커 고정) 와 "
+        "ASGI(async 읽기 뷰) 처리량과 p50/p99 응답 시간을 프로세스 안에서 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100, help="동시 접속 클라이언트 수")
+        parser.add_argument("--requests", type=int, default=300, help="모드별 전체 요청 수")
+        parser.add_argument("--workers", type=int, default=8, help="WSGI 워커 스레드 수 (gunicorn gthread 등)")
+        parser.add_argument(
+            "--client-delay", type=float, default=0.05,
+            help="느린 클라이언트가 요청을 보내고 응답을 받는 데 각각 걸리는 시간(초)",
+        )
+        parser.add_argument("--mode", choices=["wsgi", "asgi", "both"], default="both")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        for name in ["clients", "requests", "workers"]:
+            if options[name] < 1:
+                raise CommandError(f"--{name} 는 1 이상이어야 해요.")
+        ids = list(Restaurant.objects.order_by("-review_count").values_list("pk", flat=True)[:1000])
+        if not ids:
+            raise CommandError("음식점이 없어요. 먼저 manage.py generate_data 로 데이터를 만들어 주세요.")
+
+        rng = random.Random(options["seed"])
+        paths = [self.pick_path(rng, ids) for _ in range(options["requests"])]
+        modes = ["wsgi", "asgi"] if options["mode"] == "both" else [options["mode"]]
+
+        results = {}
+        for mode in modes:
+            try:
+                with override_settings(ALLOWED_HOSTS=["*"], ASYNC_READ_VIEWS=mode == "asgi"):
+                    reload_urlconfs()
+                    if mode == "wsgi":
+                        results[mode] = self.run_wsgi(paths, options)
+                    else:
+                        results[mode] = asyncio.run(self.run_asgi(paths, options))
+            finally:
+                reload_urlconfs()
+
+        self.report(results)
+
+    def pick_path(self, rng, ids):
+        kind = rng.random()
+        if kind < 0.4:
+            return reverse("restaurants:detail", args=[rng.choice(ids)]), ""
+        if kind < 0.8:
+            sort = rng.choice(["latest", "rating", "reviews"])
+            return reverse("restaurants:list"), urlencode({"sort": sort})
+        return reverse("reviews:list"), ""
+
+    # WSGI: 워커 스레드가 느린 클라이언트의 요청 읽기/응답 쓰기 동안에도 묶여 있다
+    # (클라이언트마다 스레드, 워커 수만큼만 동시에 처리 — 워커를 기다린 시간도 응답 시간에 포함)
+    def run_wsgi(self, paths, options):
+        handler = WSGIHandler()
+        delay = options["client_delay"]
+        workers = threading.BoundedSemaphore(options["workers"])
+
+        def serve(target):
+            path, query = target
+            environ = {"PATH_INFO": path, "QUERY_STRING": query, "wsgi.input": io.BytesIO()}
+            setup_testing_defaults(environ)
+            status = []
+            started = time.perf_counter()
+            with workers:
+                time.sleep(delay)  # 요청 수신
+                response = handler(environ, lambda s, headers, exc_info=None: status.append(s))
+                try:
+                    body = b"".join(response)
+                finally:
+                    response.close()
+                time.sleep(delay)  # 응답 전송
+            self.check_status(path, int(status[0].split()[0]), body)
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["clients"]) as pool:
+            times = list(pool.map(serve, paths))
+        return self.summarize(times, time.perf_counter() - started)
+
+    # ASGI: 느린 송수신은 이벤트 루프에서 기다리고, 뷰의 DB 작업만 스레드에서 실행된다
+    async def run_asgi(self, paths, options):
+        handler = ASGIHandler()
+        delay = options["client_delay"]
+        slots = asyncio.Semaphore(options["clients"])
+
+        async def serve(target):
+            path, query = target
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+                "query_string": query.encode(), "root_path": "",
+                "headers": [(b"host", b"testserver")],
+                "client": ("127.0.0.1", 0), "server": ("testserver", 80),
+            }
+            messages = []
+
+            async def receive():
+                if not messages:
+                    await asyncio.sleep(delay)  # 요청 수신
+                    messages.append(None)
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await asyncio.Event().wait()  # 응답이 끝날 때까지 연결 유지
+
+            async def send(message):
+                messages.append(message)
+                if message["type"] == "http.response.body" and not message.get("more_body"):
+                    await asyncio.sleep(delay)  # 응답 전송
+
+            async with slots:
+                started = time.perf_counter()
+                await handler(scope, receive, send)
+                elapsed = time.perf_counter() - started
+            start = next(m for m in messages if m and m["type"] == "http.response.start")
+            body = b"".join(m.get("body", b"") for m in messages if m and m["type"] == "http.response.body")
+            self.check_status(path, start["status"], body)
+            return elapsed
+
+        started = time.perf_counter()
+        times = await asyncio.gather(*(serve(target) for target in paths))
+        return self.summarize(times, time.perf_counter() - started)
+
+    def check_status(self, path, status, body):
+        if status != 200:
+            raise CommandError(f"{path}: HTTP {status} {body[:200]!r}")
+
+    def summarize(self, times, wall):
+        times = sorted(times)
+        return {
+            "requests": len(times),
+            "rps": round(len(times) / wall, 1) if wall else 0,
+            "p50_ms": round(percentile(times, 50) * 1000, 2),
+            "p99_ms": round(percentile(times, 99) * 1000, 2),
+        }
+
+    def report(self, results):
+        self.stdout.write(f"{'모드':<8}{'요청':>6}{'req/s':>9}{'p50(ms)':>10}{'p99(ms)':>10}")
+        for mode, row in results.items():
+            self.stdout.write(f"{mode:<10}{row['requests']:>6}{row['rps']:>9}{row['p50_ms']:>10}{row['p99_ms']:>10}")
+        if "wsgi" in results and "asgi" in results and results["wsgi"]["rps"]:
+            ratio = results["asgi"]["rps"] / results["wsgi"]["rps"]
+            self.stdout.write(f"\nASGI 처리량 = WSGI 의 {ratio:.2f}배")
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exports import EXPORTS, FORMATS, export_lines, parse_since
+
+
+class Command(BaseCommand):
+    help = (
+        "리뷰/음식점 데이터를 CSV 또는 JSONL 로 내보냅니다. 행을 chunk 단위로 읽어 바로 쓰므로 "
+        "수백만 행도 메모리에 올리지 않고, --since-id / --since 로 지난번 이후 추가분만 내보낼 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=list(EXPORTS), help="내보낼 데이터")
+        parser.add_argument("--format", choices=list(FORMATS), default="csv")
+        parser.add_argument("--output", "-o", help="저장할 파일 (생략 시 표준 출력)")
+        parser.add_argument("--since-id", type=int, default=0, help="이 id 보다 큰 행만")
+        parser.add_argument("--since", help="이 시각 이후 행만 (음식점은 수정 시각, 리뷰는 작성 시각 기준)")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size 는 1 이상이어야 해요.")
+        try:
+            since = parse_since(options["since"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        lines = export_lines(
+            options["name"], options["format"],
+            since_id=options["since_id"], since=since, chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            try:
+                with open(options["output"], "w", newline="", encoding="utf-8") as f:
+                    count = self.write(f.write, lines)
+            except OSError as e:
+                raise CommandError(f"파일에 쓸 수 없어요: {e}")
+        else:
+            count = self.write(lambda line: self.stdout.write(line, ending=""), lines)
+
+        # 진행 메시지는 표준 에러로 (표준 출력은 데이터)
+        if options["format"] == "csv":
+            count -= 1  # 헤더
+        self.stderr.write(f"{options['name']} {count:,}행 내보냄")
+
+    def write(self, write, lines):
+        count = 0
+        for line in lines:
+            write(line)
+            count += 1
+        return count
@@ -0,0 +1,190 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+from itertools import accumulate, islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.pagecache import invalidate_tags
+from favorites.models import Favorite
+from mypage.models import Reservation, Visit
+from restaurants.geo import cell_for
+from restaurants.models import Category, Restaurant
+from restaurants.ratings import rebuild_rating_stats
+from reviews.models import Review
+
+CATEGORIES = ["한식", "중식", "일식", "양식", "분식", "카페", "치킨", "피자", "술집", "디저트", "아시안", "패스트푸드"]
+ADJECTIVES = ["맛있는", "행복한", "원조", "할매", "진짜", "소문난", "옛날", "착한", "명품", "동네"]
+NOUNS = ["국밥집", "칼국수", "돈까스", "짜장면", "초밥집", "파스타", "떡볶이", "커피집", "통닭집", "피자집", "삼겹살", "냉면집"]
+DISTRICTS = ["강남구", "서초구", "마포구", "종로구", "중구", "용산구", "성동구", "송파구", "영등포구", "관악구"]
+STREETS = ["중앙로", "시장길", "역삼로", "테헤란로", "대학로", "한강대로", "을지로", "도산대로"]
+REVIEW_TEXTS = [
+    "정말 맛있어요. 또 올게요!", "양이 많고 가격도 괜찮아요.", "그냥 무난했어요.",
+    "웨이팅이 길었지만 기다릴 만해요.", "직원분들이 친절해요.", "생각보다 별로였어요.",
+    "분위기가 좋아서 데이트하기 좋아요.", "재방문 의사 있습니다.",
+]
+PASSWORD = "bench1234"
+
+# 서울 근처 좌표 범위 (내 주변 검색 부하용)
+LAT_RANGE = (37.45, 37.70)
+LNG_RANGE = (126.80, 127.18)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = "성능 측정용 대량 데이터(음식점/리뷰/회원/즐겨찾기/예약/방문)를 bulk insert 로 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--restaurants", type=int, default=100_000)
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--reviews", type=int, default=1_000_000)
+        parser.add_argument("--favorites", type=int, default=10, help="회원당 평균 즐겨찾기 수")
+        parser.add_argument("--reservations", type=int, default=50_000)
+        parser.add_argument("--visits", type=int, default=50_000)
+        parser.add_argument("--skew", type=float, default=1.1, help="인기도 Zipf 지수 (클수록 상위 음식점에 리뷰가 몰림)")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="bench", help="생성할 회원 아이디 접두어")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 해요.")
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        started = time.perf_counter()
+
+        categories = self.create_categories()
+        restaurant_ids = self.create_restaurants(options["restaurants"], categories)
+        user_ids = self.create_users(options["users"], options["prefix"])
+        if not restaurant_ids or not user_ids:
+            raise CommandError("음식점과 회원이 한 명(개) 이상 있어야 해요.")
+
+        # 인기도: 무작위 순서의 음식점에 Zipf 가중치 — 소수 음식점에 리뷰/즐겨찾기가 몰린다
+        popular = restaurant_ids[:]
+        self.rng.shuffle(popular)
+        self.popular = popular
+        self.cum_weights = list(accumulate(1 / (rank ** options["skew"]) for rank in range(1, len(popular) + 1)))
+        self.quality = {pk: self.rng.uniform(2.0, 4.8) for pk in restaurant_ids}
+
+        self.create_reviews(options["reviews"], user_ids)
+        self.create_favorites(options["favorites"], user_ids)
+        self.create_reservations(options["reservations"], user_ids)
+        self.create_visits(options["visits"], user_ids)
+
+        self.stdout.write("별점 집계 재계산 중...")
+        rebuild_rating_stats()
+        invalidate_tags("restaurants", "reviews", "trending")
+        self.stdout.write(self.style.SUCCESS(f"완료 ({time.perf_counter() - started:.1f}초)"))
+
+    def pick_restaurants(self, k):
+        return self.rng.choices(self.popular, cum_weights=self.cum_weights, k=k)
+
+    def bulk_insert(self, model, objects, label, **kwargs):
+        started = time.perf_counter()
+        count = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, **kwargs)
+            count += len(batch)
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        self.stdout.write(f"{label} {count}개 ({elapsed:.1f}초, {rate:,.0f}개/초)")
+        return count
+
+    def create_categories(self):
+        Category.objects.bulk_create([Category(name=name) for name in CATEGORIES], ignore_conflicts=True)
+        return list(Category.objects.filter(name__in=CATEGORIES))
+
+    def create_restaurants(self, count, categories):
+        last_id = Restaurant.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+        def rows():
+            for n in range(count):
+                lat = Decimal(f"{self.rng.uniform(*LAT_RANGE):.6f}")
+                lng = Decimal(f"{self.rng.uniform(*LNG_RANGE):.6f}")
+                yield Restaurant(
+                    name=f"{self.rng.choice(ADJECTIVES)} {self.rng.choice(NOUNS)} {last_id + n + 1}",
+                    category=self.rng.choice(categories),
+                    address=f"서울 {self.rng.choice(DISTRICTS)} {self.rng.choice(STREETS)} {self.rng.randint(1, 300)}",
+                    phone=f"02-{self.rng.randint(200, 999)}-{self.rng.randint(1000, 9999)}",
+                    lat=lat,
+                    lng=lng,
+                    geo_cell=cell_for(lat, lng),  # bulk_create 는 save() 를 거치지 않으므로 직접 계산
+                    view_count=int(self.rng.paretovariate(1.2) * 10),
+                )
+
+        self.bulk_insert(Restaurant, rows(), "음식점")
+        return list(Restaurant.objects.filter(pk__gt=last_id).values_list("pk", flat=True))
+
+    def create_users(self, count, prefix):
+        start = User.objects.filter(username__startswith=prefix).count()
+        password = make_password(PASSWORD)  # 해시는 한 번만 계산
+        usernames = [f"{prefix}{n}" for n in range(start + 1, start + count + 1)]
+        self.bulk_insert(
+            User,
+            (User(username=name, email=f"{name}@example.com", password=password) for name in usernames),
+            "회원",
+        )
+        return list(User.objects.filter(username__in=usernames).values_list("pk", flat=True)) if count else []
+
+    def create_reviews(self, count, user_ids):
+        def rows():
+            for batch in batched(range(count), self.batch_size):
+                for restaurant_id in self.pick_restaurants(len(batch)):
+                    rating = round(self.rng.gauss(self.quality[restaurant_id], 1.0))
+                    yield Review(
+                        restaurant_id=restaurant_id,
+                        author_id=self.rng.choice(user_ids),
+                        rating=min(5, max(1, rating)),
+                        content=self.rng.choice(REVIEW_TEXTS),
+                    )
+
+        self.bulk_insert(Review, rows(), "리뷰")
+
+    def create_favorites(self, per_user, user_ids):
+        def rows():
+            for user_id in user_ids:
+                k = min(len(self.popular), int(self.rng.expovariate(1 / per_user))) if per_user else 0
+                for restaurant_id in set(self.pick_restaurants(k)):
+                    yield Favorite(user_id=user_id, restaurant_id=restaurant_id)
+
+        self.bulk_insert(Favorite, rows(), "즐겨찾기", ignore_conflicts=True)
+
+    def create_reservations(self, count, user_ids):
+        def rows():
+            for batch in batched(range(count), self.batch_size):
+                for restaurant_id in self.pick_restaurants(len(batch)):
+                    day = self.rng.randint(-30, 30)
+                    hour = self.rng.randint(11, 21)
+                    yield Reservation(
+                        user_id=self.rng.choice(user_ids),
+                        restaurant_id=restaurant_id,
+                        reserved_at=(self.now + timedelta(days=day)).replace(hour=hour, minute=0, second=0, microsecond=0),
+                    )
+
+        self.bulk_insert(Reservation, rows(), "예약")
+
+    def create_visits(self, count, user_ids):
+        today = self.now.date()
+
+        def rows():
+            for batch in batched(range(count), self.batch_size):
+                for restaurant_id in self.pick_restaurants(len(batch)):
+                    yield Visit(
+                        user_id=self.rng.choice(user_ids),
+                        restaurant_id=restaurant_id,
+                        visited_at=today - timedelta(days=self.rng.randint(0, 365)),
+                    )
+
+        self.bulk_insert(Visit, rows(), "방문")
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.images import backfill_variants, process_pending
+
+
+class Command(BaseCommand):
+    help = "업로드 이미지의 리사이즈/WebP 변환본을 만드는 백그라운드 워커입니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기 작업을 한 번만 처리하고 종료합니다.")
+        parser.add_argument("--backfill", action="store_true", help="변환 작업이 없는 기존 이미지를 먼저 등록합니다.")
+        parser.add_argument("--batch-size", type=int, default=20)
+        parser.add_argument("--max-attempts", type=int, default=3)
+        parser.add_argument("--sleep", type=float, default=5.0, help="대기 작업이 없을 때 쉬는 시간(초)")
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            self.stdout.write(f"기존 이미지 {backfill_variants()}개 변환 작업 등록")
+        while True:
+            done, failed = process_pending(options["batch_size"], options["max_attempts"])
+            if done or failed:
+                self.stdout.write(f"변환 완료 {done}개, 실패 {failed}개")
+            if options["once"]:
+                return
+            if not (done or failed):
+                time.sleep(options["sleep"])
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.mail import send_pending
+
+
+class Command(BaseCommand):
+    help = "발송 대기 중인 이메일(OutgoingEmail)을 SMTP 연결 하나로 묶어 보내는 백그라운드 워커입니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="보낼 메일을 한 번만 처리하고 종료합니다.")
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--max-attempts", type=int, default=5)
+        parser.add_argument("--sleep", type=float, default=5.0, help="보낼 메일이 없을 때 쉬는 시간(초)")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_pending(options["batch_size"], options["max_attempts"])
+            if sent or failed:
+                self.stdout.write(f"발송 {sent}개, 실패 {failed}개")
+            if options["once"]:
+                return
+            # 한 배치를 꽉 채웠으면 쉬지 않고 바로 다음 배치
+            if sent + failed < options["batch_size"]:
+                time.sleep(options["sleep"])
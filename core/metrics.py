@@ -0,0 +1,98 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+
+logger = logging.getLogger("core.metrics")
+
+# 현재 요청의 측정값 (RequestMetricsMiddleware 가 설정, 템플릿 백엔드가 렌더링 시간을 더함)
+current_metrics = contextvars.ContextVar("request_metrics", default=None)
+
+SAMPLES_PER_URL = 1000
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self._render_depth = 0
+
+    # connection.execute_wrapper 로 모든 SQL 실행을 감싼다
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.query_count += 1
+
+    def start_render(self):
+        self._render_depth += 1
+        return time.perf_counter()
+
+    # 중첩 렌더링(render_to_string 안의 render_to_string)은 바깥 것만 센다
+    def end_render(self, start):
+        self._render_depth -= 1
+        if self._render_depth == 0:
+            self.render_time += time.perf_counter() - start
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+# URL 이름별 최근 SAMPLES_PER_URL 개 요청의 (응답 시간, 쿼리 수) — 프로세스 단위
+class RequestStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=SAMPLES_PER_URL))
+
+    def record(self, url_name, elapsed, query_count):
+        with self._lock:
+            self._samples[url_name].append((elapsed, query_count))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        with self._lock:
+            samples = {name: list(values) for name, values in self._samples.items()}
+        result = {}
+        for name, values in sorted(samples.items()):
+            times = sorted(elapsed for elapsed, _ in values)
+            queries = [count for _, count in values]
+            result[name] = {
+                "count": len(values),
+                "p50_ms": round(percentile(times, 50) * 1000, 2),
+                "p95_ms": round(percentile(times, 95) * 1000, 2),
+                "avg_queries": round(sum(queries) / len(queries), 2),
+                "max_queries": max(queries),
+            }
+        return result
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+request_stats = RequestStats()
+
+
+# 뷰별 쿼리 예산 선언 — 초과하면 QUERY_BUDGET_STRICT 일 때 예외(테스트 실패), 아니면 경고 로그
+# 뷰를 감싸지 않고 속성만 붙이므로 async 뷰에도 그대로 쓸 수 있다
+def query_budget(max_queries):
+    def decorator(view_func):
+        view_func.query_budget = max_queries
+        return view_func
+    return decorator
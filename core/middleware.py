@@ -0,0 +1,73 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .metrics import QueryBudgetExceeded, RequestMetrics, current_metrics, logger, request_stats
+
+
+# 요청별 쿼리 수 / SQL 시간 / 렌더링 시간 / 응답 크기 측정
+# - REQUEST_METRICS_HEADERS 가 켜져 있으면 X-Query-Count 등 응답 헤더로 노출
+# - URL 이름별 p50/p95 는 request_stats 에 모아 /stats/requests/ 에서 확인
+# - @query_budget(n) 이 붙은 뷰가 n 개 넘게 쿼리하면 경고 (QUERY_BUDGET_STRICT 면 예외)
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        try:
+            with connection.execute_wrapper(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    # ASGI: async ORM 쿼리는 요청마다 정해진 스레드(sync_to_async)의 DB 연결에서 실행되므로 그 연결에 건다
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        await sync_to_async(lambda: connection.execute_wrappers.append(metrics))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(metrics))()
+            current_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        elapsed = metrics.elapsed
+        size = len(response.content) if not response.streaming else None
+        match = getattr(request, "resolver_match", None)
+        url_name = match.view_name if match and match.view_name else request.path
+
+        request_stats.record(url_name, elapsed, metrics.query_count)
+        logger.debug(
+            "%s %s queries=%d sql=%.1fms render=%.1fms total=%.1fms size=%s",
+            request.method, url_name, metrics.query_count, metrics.sql_time * 1000,
+            metrics.render_time * 1000, elapsed * 1000, size,
+        )
+
+        if getattr(settings, "REQUEST_METRICS_HEADERS", False):
+            response["X-Query-Count"] = str(metrics.query_count)
+            response["X-SQL-Time-Ms"] = f"{metrics.sql_time * 1000:.1f}"
+            response["X-Render-Time-Ms"] = f"{metrics.render_time * 1000:.1f}"
+            response["X-Response-Time-Ms"] = f"{elapsed * 1000:.1f}"
+            if size is not None:
+                response["X-Response-Size"] = str(size)
+
+        budget = getattr(match.func, "query_budget", None) if match else None
+        if budget is not None and metrics.query_count > budget:
+            message = f"{url_name}: 쿼리 {metrics.query_count}개 (예산 {budget}개)"
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:08
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='processedimage',
+            name='processedimage_status_idx',
+        ),
+        migrations.AddField(
+            model_name='processedimage',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='processedimage',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='processedimage_due_idx'),
+        ),
+    ]
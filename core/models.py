@@ -1,3 +1,70 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+# 업로드 이미지의 리사이즈/WebP 변환본 (core.images, process_images 커맨드)
+class ProcessedImage(models.Model):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "대기"),
+        (PROCESSING, "처리 중"),
+        (DONE, "완료"),
+        (FAILED, "실패"),
+    ]
+
+    source       = models.CharField(max_length=255, unique=True)  # 원본 파일 이름 (storage 기준)
+    status       = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    content_hash = models.CharField(max_length=64, blank=True)
+    variants     = models.JSONField(default=dict, blank=True)    # {"320": "variants/ab/abcd...-320.webp", ...}
+    attempts     = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)  # 재시도 대기 (지수 백오프)
+    error        = models.TextField(blank=True)
+    created_at   = models.DateTimeField(auto_now_add=True)
+    updated_at   = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="processedimage_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.source} ({self.status})"
+
+
+# 보낼 이메일 (core.mail, send_emails 커맨드)
+# 요청 안에서는 SMTP 로 보내지 않고 여기에 쌓기만 한다 (회원/토큰 저장과 같은 트랜잭션)
+class OutgoingEmail(models.Model):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "대기"),
+        (SENDING, "보내는 중"),
+        (SENT, "발송 완료"),
+        (FAILED, "실패"),
+    ]
+
+    subject         = models.CharField(max_length=255)
+    body            = models.TextField()
+    html_body       = models.TextField(blank=True)
+    from_email      = models.CharField(max_length=254, blank=True)  # 비어 있으면 DEFAULT_FROM_EMAIL
+    to              = models.JSONField(default=list)
+    status          = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts        = models.PositiveSmallIntegerField(default=0)
+    error           = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)    # 재시도 대기 (지수 백오프)
+    sent_at         = models.DateTimeField(null=True, blank=True)
+    created_at      = models.DateTimeField(auto_now_add=True)
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outgoingemail_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.to)} ({self.status})"
@@ -0,0 +1,135 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+# ---------------------------------------------------------------
+# 비로그인 사용자 페이지 캐시
+# - 키: 경로 + 정리한 쿼리스트링 (순서 정렬, 빈 값 제거)
+# - 태그: 응답을 만들기 전에 읽은 태그 버전을 같이 저장한다.
+#   쓰기 뷰가 invalidate_tags() 로 태그 버전을 바꾸면 그 응답은 더 이상 신선하지 않다.
+# - stale-while-revalidate: 신선 기간이 지났거나 무효화된 응답도 ANONYMOUS_PAGE_CACHE_STALE 동안 보관해 두고,
+#   재생성 잠금(cache.add)을 잡은 요청 하나만 뷰를 실행한다. 나머지 요청은 그동안 이전 응답을 받는다.
+# ---------------------------------------------------------------
+
+
+# 뷰에 캐시 정책을 붙인다 (AnonymousPageCacheMiddleware 가 읽음)
+# tags: 태그 목록 또는 (request, *args, **kwargs) → 태그 목록
+# on_hit: 캐시된 응답을 보낼 때도 해야 하는 일 (예: 조회수 증가)
+def cache_anonymous_page(tags, on_hit=None):
+    def decorator(view_func):
+        view_func.page_cache = (tags, on_hit)
+        return view_func
+    return decorator
+
+
+def _tag_key(tag):
+    return f"pagecache:tag:{tag}"
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def invalidate_tags(*tags):
+    cache.set_many({_tag_key(tag): _new_version() for tag in tags}, None)
+
+
+# 태그 → 현재 버전 (없으면 만들어 둔다 — 캐시에서 밀려난 태그가 예전 버전과 겹치지 않도록)
+def _tag_versions(tags):
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+# 태그 하나의 현재 버전 (API ETag 처럼 "마지막으로 바뀐 때" 표시로도 쓴다 — 버전은 무효화한 시각의 ns)
+def tag_version(tag):
+    return _tag_versions([tag])[_tag_key(tag)]
+
+
+def page_cache_key(request):
+    params = sorted((key, value) for key, values in request.GET.lists() for value in values if value)
+    url = f"{request.path}?{urlencode(params)}"
+    return f"pagecache:page:{hashlib.md5(url.encode()).hexdigest()}"
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _cacheable_request(request):
+    if request.method not in ("GET", "HEAD") or request.user.is_authenticated:
+        return False
+    # 보여줄 메시지(로그아웃 안내 등)가 남아 있으면 캐시된 페이지로 대신하지 않는다 (len 은 메시지를 소비하지 않음)
+    return not len(get_messages(request))
+
+
+def _cacheable_response(request, response):
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    # 페이지에 CSRF 토큰이 들어갔으면 사용자마다 달라야 하므로 저장하지 않는다
+    if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+        return False
+    cache_control = response.get("Cache-Control", "")
+    return "private" not in cache_control and "no-store" not in cache_control
+
+
+def _cached_response(entry, state):
+    response = HttpResponse(entry["content"], status=entry["status"], headers=entry["headers"])
+    response["X-Page-Cache"] = state
+    return response
+
+
+class AnonymousPageCacheMiddleware(MiddlewareMixin):
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        policy = getattr(view_func, "page_cache", None)
+        if policy is None or not getattr(settings, "ANONYMOUS_PAGE_CACHE", False) or not _cacheable_request(request):
+            return None
+        tags, on_hit = policy
+        if callable(tags):
+            tags = tags(request, *view_args, **view_kwargs)
+
+        key = page_cache_key(request)
+        versions = _tag_versions(tags)
+        entry = cache.get(key)
+        if entry is not None:
+            fresh = entry["versions"] == versions and time.time() < entry["fresh_until"]
+            if fresh or not cache.add(_lock_key(key), 1, getattr(settings, "ANONYMOUS_PAGE_CACHE_LOCK_TIMEOUT", 30)):
+                if on_hit:
+                    on_hit(request, *view_args, **view_kwargs)
+                return _cached_response(entry, "hit" if fresh else "stale")
+            request._page_cache_lock = True
+
+        # 뷰 실행 전 버전을 저장 — 렌더링 중에 무효화되면 다음 요청이 다시 만든다
+        request._page_cache = (key, versions)
+        return None
+
+    def process_response(self, request, response):
+        pending = getattr(request, "_page_cache", None)
+        if pending is None:
+            return response
+        key, versions = pending
+        if request.method == "GET" and _cacheable_response(request, response):
+            timeout = getattr(settings, "ANONYMOUS_PAGE_CACHE_TIMEOUT", 60)
+            entry = {
+                "content": response.content,
+                "status": response.status_code,
+                "headers": dict(response.items()),
+                "versions": versions,
+                "fresh_until": time.time() + timeout,
+            }
+            cache.set(key, entry, timeout + getattr(settings, "ANONYMOUS_PAGE_CACHE_STALE", 60 * 10))
+            response["X-Page-Cache"] = "miss"
+        if getattr(request, "_page_cache_lock", False):
+            cache.delete(_lock_key(key))
+        return response
@@ -0,0 +1,25 @@
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import current_metrics
+
+
+# 기본 DjangoTemplates 와 같고, 요청 측정 중이면 렌더링에 걸린 시간을 더한다 (RequestMetricsMiddleware)
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+        start = metrics.start_render()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.end_render(start)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
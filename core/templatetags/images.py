@@ -0,0 +1,30 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from core.images import variants_for
+
+register = template.Library()
+
+
+# {% responsive_img restaurant.thumbnail alt=restaurant.name sizes="300px" %}
+# 변환본이 있으면 WebP srcset, 없으면 원본 src 만 출력 (여러 장이면 뷰에서 prefetch_variants 로 미리 읽어 둔다)
+@register.simple_tag
+def responsive_img(image, sizes="100vw", css_class="", **attrs):
+    if not image:
+        return ""
+    attrs.setdefault("alt", "")
+    attrs.setdefault("loading", "lazy")
+    if css_class:
+        attrs["class"] = css_class
+
+    variants = variants_for(image)
+    if variants:
+        widths = sorted(variants)
+        attrs["srcset"] = ", ".join(f"{default_storage.url(variants[w])} {w}w" for w in widths)
+        attrs["sizes"] = sizes
+        attrs["src"] = default_storage.url(variants[widths[len(widths) // 2]])
+    else:
+        attrs["src"] = image.url
+    return format_html("<img{}>", flatatt(attrs))
@@ -0,0 +1,13 @@
+from django.test.runner import DiscoverRunner
+
+
+# 테스트 DB 를 지우기 전에 조회수 버퍼와 추천 대기열 버퍼를 비운다
+# (남은 값을 종료 시 flush(atexit, restaurants.apps)가 원래 DB 에 쓰지 않도록)
+class TestRunner(DiscoverRunner):
+    def teardown_databases(self, old_config, **kwargs):
+        from restaurants.recommendations import like_changes
+        from restaurants.viewcounts import view_counter
+
+        view_counter.clear()
+        like_changes.clear()
+        super().teardown_databases(old_config, **kwargs)
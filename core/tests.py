@@ -1,3 +1,654 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.template import Context, Template
+from django.http import Http404, HttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.test import AsyncRequestFactory, Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from PIL import Image
+
+from favorites import views as favorite_views
+from favorites.models import Favorite
+from restaurants import views as restaurant_views
+from restaurants.models import Category, Restaurant
+from restaurants.ratings import find_rating_mismatches
+from restaurants.trending import compute_trending
+from restaurants.viewcounts import view_counter
+from reviews import views as review_views
+from reviews.models import Review
+from .cache import FileCache
+from .db import atomic_with_retry
+from .images import enqueue_variants, get_variants, process_pending
+from .mail import enqueue_email, send_pending
+from .management.commands.audit_query_plans import plan_problems
+from .metrics import QueryBudgetExceeded, request_stats
+from .middleware import RequestMetricsMiddleware
+from .models import OutgoingEmail, ProcessedImage
+from .pagecache import _tag_versions, invalidate_tags, page_cache_key
+
+
+def make_png(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ImagePipelineTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root, IMAGE_VARIANT_WIDTHS=[320, 640, 1280])
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+
+    def upload(self, data, name="photo.png"):
+        restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        restaurant.thumbnail.save(name, ContentFile(data))
+        return restaurant.thumbnail
+
+    def render(self, field):
+        return Template("{% load images %}{% responsive_img image alt='사진' %}").render(Context({"image": field}))
+
+    def test_variants_are_generated_and_used_in_srcset(self):
+        field = self.upload(make_png(1000, 500))
+        enqueue_variants(field)
+        self.assertNotIn("srcset", self.render(field))
+
+        self.assertEqual(process_pending(), (1, 0))
+        variants = get_variants(field.name)
+        self.assertEqual(sorted(variants), [320, 640, 1000])
+        for name in variants.values():
+            self.assertTrue(name.endswith(".webp"))
+            with default_storage.open(name) as f:
+                self.assertEqual(Image.open(f).format, "WEBP")
+
+        html = self.render(field)
+        self.assertIn("320w", html)
+        self.assertIn("1000w", html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_same_content_reuses_hashed_files(self):
+        data = make_png(400, 400)
+        first, second = self.upload(data, "a.png"), self.upload(data, "b.png")
+        enqueue_variants(first)
+        enqueue_variants(second)
+        process_pending()
+        self.assertEqual(get_variants(first.name), get_variants(second.name))
+
+    @override_settings(IMAGE_RETRY_BACKOFF=60)
+    def test_broken_image_backs_off_then_is_dead_lettered(self):
+        field = self.upload(b"not an image")
+        enqueue_variants(field)
+        self.assertEqual(process_pending(max_attempts=3), (0, 1))
+        job = ProcessedImage.objects.get(source=field.name)
+        self.assertEqual((job.status, job.attempts), (ProcessedImage.PENDING, 1))
+        self.assertGreater(job.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        # 재시도 시각 전에는 건드리지 않는다
+        self.assertEqual(process_pending(max_attempts=3), (0, 0))
+
+        for _ in range(2):
+            ProcessedImage.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now())
+            process_pending(max_attempts=3)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (ProcessedImage.FAILED, 3))
+        ProcessedImage.objects.filter(pk=job.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(process_pending(), (0, 0))
+        self.assertNotIn("srcset", self.render(field))
+
+    def test_stale_processing_is_requeued(self):
+        field = self.upload(make_png(200, 100))
+        enqueue_variants(field)
+        ProcessedImage.objects.filter(source=field.name).update(
+            status=ProcessedImage.PROCESSING, updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(process_pending(), (1, 0))
+        self.assertEqual(sorted(get_variants(field.name)), [200])
+
+
+    def test_pages_prefetch_variants_in_one_query(self):
+        user = User.objects.create_user(username="tester", password="pass12345")
+        fields = [self.upload(make_png(100, 100), f"thumb{i}.png") for i in range(5)]
+        for field in fields[:2]:
+            enqueue_variants(field)
+        process_pending()
+        for restaurant in Restaurant.objects.all():
+            Favorite.objects.create(user=user, restaurant=restaurant)
+        self.client.force_login(user)
+
+        for url in [reverse("restaurants:list"), reverse("favorites:list")]:
+            cache.clear()
+            with CaptureQueriesContext(connections["default"]) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len([q for q in queries if "core_processedimage" in q["sql"]]), 1, url)
+            self.assertEqual(response.content.decode().count("100w"), 2)
+
+    def test_backfill_enqueues_existing_images(self):
+        field = self.upload(make_png(100, 100))
+        review = Review.objects.create(restaurant=Restaurant.objects.get(), author=User.objects.create_user("writer"), rating=5, content="x")
+        review.photo.save("review.png", ContentFile(make_png(80, 80)))
+        Restaurant.objects.create(name="사진 없음", address="서울")
+
+        out = StringIO()
+        call_command("process_images", "--backfill", "--once", stdout=out)
+        self.assertIn("기존 이미지 2개", out.getvalue())
+        self.assertEqual(sorted(get_variants(field.name)), [100])
+        self.assertEqual(sorted(get_variants(review.photo.name)), [80])
+        call_command("process_images", "--backfill", "--once", stdout=out)
+        self.assertIn("기존 이미지 0개", out.getvalue())
+
+    def test_ready_variants_invalidate_anonymous_pages(self):
+        field = self.upload(make_png(100, 100))
+        restaurant = Restaurant.objects.get()
+        review = Review.objects.create(restaurant=restaurant, author=User.objects.create_user("writer"), rating=5, content="x")
+        review.photo.save("review.png", ContentFile(make_png(80, 80)))
+        tags = [f"restaurant:{restaurant.pk}", "reviews", "restaurants"]
+        before = _tag_versions(tags)
+        enqueue_variants(field)
+        enqueue_variants(review.photo)
+        process_pending()
+        after = _tag_versions(tags)
+        for key in before:
+            self.assertNotEqual(before[key], after[key], key)
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        request_stats.clear()
+        Restaurant.objects.create(name="측정식당", address="서울")
+
+    @override_settings(REQUEST_METRICS_HEADERS=True)
+    def test_metrics_headers(self):
+        response = self.client.get(reverse("restaurants:list"))
+        self.assertGreaterEqual(int(response["X-Query-Count"]), 1)
+        self.assertGreater(float(response["X-Render-Time-Ms"]), 0)
+        self.assertEqual(int(response["X-Response-Size"]), len(response.content))
+        self.assertIn("X-SQL-Time-Ms", response)
+
+    @override_settings(REQUEST_METRICS_HEADERS=False)
+    def test_headers_off(self):
+        response = self.client.get(reverse("restaurants:list"))
+        self.assertNotIn("X-Query-Count", response)
+
+    def test_stats_per_url_name(self):
+        for _ in range(3):
+            self.client.get(reverse("restaurants:list"))
+        self.assertEqual(self.client.get(reverse("request_stats")).status_code, 302)
+
+        User.objects.create_user("admin", password="pw", is_staff=True)
+        self.client.login(username="admin", password="pw")
+        stats = self.client.get(reverse("request_stats")).json()["stats"]
+        self.assertEqual(stats["restaurants:list"]["count"], 3)
+        self.assertLessEqual(stats["restaurants:list"]["p50_ms"], stats["restaurants:list"]["p95_ms"])
+
+    def test_query_budget(self):
+        with mock.patch.object(restaurant_views.restaurant_list, "query_budget", 0):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse("restaurants:list"))
+            with override_settings(QUERY_BUDGET_STRICT=False), self.assertLogs("core.metrics", "WARNING"):
+                self.assertEqual(self.client.get(reverse("restaurants:list")).status_code, 200)
+
+
+# settings.ASYNC_READ_VIEWS 로 URLconf 에 연결되는 async 읽기 뷰 (미들웨어 없이 직접 호출)
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        view_counter.clear()
+        self.user = User.objects.create_user("eater", password="pw")
+        self.restaurants = [
+            Restaurant.objects.create(name=f"비동기식당{i}", address="서울", avg_rating=i, review_count=1)
+            for i in range(3)
+        ]
+        Favorite.objects.create(user=self.user, restaurant=self.restaurants[1])
+        Review.objects.create(restaurant=self.restaurants[1], author=self.user, rating=4, content="비동기 리뷰")
+
+    def tearDown(self):
+        view_counter.clear()
+
+    def request(self, path, user=None, **params):
+        request = AsyncRequestFactory().get(path, params)
+        request.user = user or AnonymousUser()
+
+        async def auser():
+            return request.user
+
+        request.auser = auser
+        return request
+
+    async def test_list_matches_sync_ordering(self):
+        response = await restaurant_views.restaurant_list_async(
+            self.request(reverse("restaurants:list"), self.user, sort="rating")
+        )
+        content = response.content.decode()
+        positions = [content.index(r.name) for r in reversed(self.restaurants)]
+        self.assertEqual(positions, sorted(positions))
+
+    async def test_detail_runs_independent_parts(self):
+        restaurant = self.restaurants[1]
+        response = await restaurant_views.restaurant_detail_async(
+            self.request(reverse("restaurants:detail", args=[restaurant.pk]), self.user), pk=restaurant.pk
+        )
+        self.assertContains(response, "비동기 리뷰")
+        self.assertEqual(view_counter.pending(restaurant.pk), 1)
+
+        with self.assertRaises(Http404):
+            await restaurant_views.restaurant_detail_async(self.request("/restaurants/0/"), pk=0)
+
+    async def test_review_and_favorite_lists(self):
+        response = await review_views.review_list_async(self.request(reverse("reviews:list")))
+        self.assertContains(response, "비동기 리뷰")
+
+        response = await favorite_views.favorite_list_async(self.request(reverse("favorites:list"), self.user))
+        self.assertContains(response, "비동기식당1")
+        self.assertNotContains(response, "비동기식당2")
+
+        response = await favorite_views.favorite_list_async(self.request(reverse("favorites:list")))
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(REQUEST_METRICS_HEADERS=True)
+    async def test_middleware_counts_async_queries(self):
+        async def view(request):
+            return HttpResponse(str(await Restaurant.objects.acount()))
+
+        response = await RequestMetricsMiddleware(view)(self.request("/"))
+        self.assertEqual(response.content, b"3")
+        self.assertEqual(response["X-Query-Count"], "1")
+
+
+class LoadBenchmarkTests(TestCase):
+    def test_generate_data_and_benchmark(self):
+        call_command(
+            "generate_data", restaurants=60, users=10, reviews=500, favorites=3,
+            reservations=20, visits=20, batch_size=100, stdout=StringIO(),
+        )
+        self.assertEqual(Restaurant.objects.count(), 60)
+        self.assertEqual(Review.objects.count(), 500)
+        self.assertFalse(Restaurant.objects.filter(lat__isnull=False, geo_cell__isnull=True).exists())
+        self.assertEqual(find_rating_mismatches(), [])
+
+        # 인기도 쏠림: 상위 10% 음식점이 리뷰의 상당 부분을 가져간다
+        counts = sorted(Restaurant.objects.values_list("review_count", flat=True), reverse=True)
+        self.assertGreater(sum(counts[:6]), 500 * 0.3)
+
+        Favorite.objects.get_or_create(user=User.objects.first(), restaurant=Restaurant.objects.first())
+        out = StringIO()
+        call_command("benchmark", requests=3, warmup=1, stdout=out, stderr=StringIO())
+        for name in ["list:rating", "list:page5", "search", "near", "detail", "favorites", "review_feed"]:
+            self.assertIn(name, out.getvalue())
+
+
+# WSGI/ASGI 핸들러가 워커 스레드의 별도 DB 연결로 읽으므로 데이터를 커밋해야 보인다
+class AsgiBenchmarkTests(TransactionTestCase):
+    def test_benchmark_asgi_runs_both_modes(self):
+        for i in range(3):
+            Restaurant.objects.create(name=f"벤치식당{i}", address="서울")
+        out = StringIO()
+        call_command("benchmark_asgi", requests=6, clients=3, workers=2, client_delay=0, stdout=out)
+        self.assertIn("wsgi", out.getvalue())
+        self.assertIn("ASGI 처리량", out.getvalue())
+        # 끝나면 설정대로(동기 뷰) URLconf 로 돌아온다
+        self.assertIs(resolve(reverse("restaurants:list")).func, restaurant_views.restaurant_list)
+
+
+class QueryPlanAuditTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command("audit_query_plans", stdout=out)
+        self.assertNotIn("[!]", out.getvalue())
+
+    def test_flags_full_scan_and_temp_btree(self):
+        plan = "2 0 0 SCAN reviews_review\n9 0 0 USE TEMP B-TREE FOR ORDER BY"
+        self.assertEqual(len(plan_problems(plan)), 2)
+        self.assertEqual(plan_problems("3 0 0 SCAN reviews_review USING INDEX review_rating_id_idx"), [])
+        # id 역순 + LIMIT 은 rowid 순서로 읽다가 멈추므로 허용
+        self.assertEqual(plan_problems("2 0 0 SCAN reviews_review", bounded_table="reviews_review"), [])
+        # 검색 결과만 정렬하는 경우도 허용
+        plan = "6 0 0 SCAN restaurants_restaurant_search VIRTUAL TABLE INDEX 0:M2\n56 0 0 USE TEMP B-TREE FOR ORDER BY"
+        self.assertEqual(plan_problems(plan), [])
+
+
+# 테스트 DB 는 메모리 DB 라서 WAL 이 안 되므로, 같은 OPTIONS 로 임시 파일 DB 에 따로 연결해서 확인
+# (설정에 없는 별칭으로 스레드마다 연결을 직접 만든다)
+class SQLiteConcurrencyTests(SimpleTestCase):
+    alias = "concurrency"
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.settings_dict = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(self.tmpdir, "stress.sqlite3"),
+        }
+        self.connect()
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("CREATE TABLE counter (id INTEGER PRIMARY KEY, n INTEGER NOT NULL)")
+            cursor.execute("INSERT INTO counter (id, n) VALUES (1, 0)")
+
+    def tearDown(self):
+        connections[self.alias].close()
+        del connections[self.alias]
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def connect(self):
+        connections[self.alias] = DatabaseWrapper(self.settings_dict, self.alias)
+
+    def run_threads(self, target, count):
+        errors = []
+
+        def run():
+            self.connect()
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections[self.alias].close()
+
+        threads = [threading.Thread(target=run) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def read_counter(self):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT n FROM counter WHERE id = 1")
+            return cursor.fetchone()[0]
+
+    def test_pragmas(self):
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_reads_are_not_blocked_by_writer(self):
+        locked, release = threading.Event(), threading.Event()
+
+        def writer():
+            with transaction.atomic(using=self.alias):
+                with connections[self.alias].cursor() as cursor:
+                    cursor.execute("UPDATE counter SET n = 100 WHERE id = 1")
+                locked.set()
+                release.wait(5)
+
+        def run_writer():
+            self.connect()
+            try:
+                writer()
+            finally:
+                connections[self.alias].close()
+
+        thread = threading.Thread(target=run_writer)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(5))
+            started = time.perf_counter()
+            durations = []
+            for _ in range(20):
+                self.assertEqual(self.read_counter(), 0)  # 커밋 전 값
+                durations.append(time.perf_counter() - started)
+            self.assertLess(durations[-1], 0.5)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(self.read_counter(), 100)
+
+    def test_concurrent_writers_retry_on_lock(self):
+        # busy timeout 을 아주 짧게 줘서 잠금 충돌이 실제로 나게 하고, 재시도로 모두 반영되는지 확인
+        self.settings_dict["OPTIONS"] = {**self.settings_dict["OPTIONS"], "timeout": 0.001}
+        connections[self.alias].close()
+        self.connect()
+
+        @atomic_with_retry(using=self.alias, attempts=50, backoff=0.002)
+        def increment():
+            with connections[self.alias].cursor() as cursor:
+                cursor.execute("UPDATE counter SET n = n + 1 WHERE id = 1")
+            time.sleep(0.001)  # 잠금을 잠깐 쥐고 있는다
+
+        def worker():
+            for _ in range(25):
+                increment()
+
+        with mock.patch("core.db.time.sleep", wraps=time.sleep) as backoff:
+            self.run_threads(worker, 8)
+        self.assertGreater(backoff.call_count, 0)  # 실제로 잠금 충돌이 나서 재시도했다
+        self.assertEqual(self.read_counter(), 200)
+
+
+class BrokenEmailBackend(BaseEmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError("SMTP 서버 응답 없음")
+
+
+class EmailOutboxTests(TestCase):
+    def test_batch_shares_one_connection(self):
+        for n in range(3):
+            enqueue_email(f"메일 {n}", "본문", [f"user{n}@example.com"], html_body="<b>본문</b>")
+        with mock.patch("core.mail.get_connection", wraps=get_connection) as connect:
+            self.assertEqual(send_pending(batch_size=10), (3, 0))
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual([m.subject for m in mail.outbox], ["메일 0", "메일 1", "메일 2"])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.SENT).exists())
+        self.assertEqual(send_pending(), (0, 0))
+
+    @override_settings(EMAIL_BACKEND="core.tests.BrokenEmailBackend", EMAIL_RETRY_BACKOFF=60)
+    def test_retry_with_backoff_then_dead_letter(self):
+        email = enqueue_email("메일", "본문", ["user@example.com"])
+        self.assertEqual(send_pending(max_attempts=3), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutgoingEmail.PENDING, 1))
+        self.assertIn("SMTP", email.error)
+        self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+        # 재시도 시각 전에는 건드리지 않는다
+        self.assertEqual(send_pending(max_attempts=3), (0, 0))
+
+        for attempts in (2, 3):
+            OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+            send_pending(max_attempts=3)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutgoingEmail.FAILED, 3))
+
+        OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(send_pending(max_attempts=3), (0, 0))
+
+    def test_stale_sending_is_requeued(self):
+        email = enqueue_email("메일", "본문", ["user@example.com"])
+        OutgoingEmail.objects.filter(pk=email.pk).update(
+            status=OutgoingEmail.SENDING, updated_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(send_pending(), (1, 0))
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.restaurant = Restaurant.objects.create(name="내보낼집", address="서울")
+        self.reviews = [
+            Review.objects.create(restaurant=self.restaurant, author=self.user, rating=4, content=f"리뷰, {i}")
+            for i in range(3)
+        ]
+
+    def test_command_csv_incremental(self):
+        out, err = StringIO(), StringIO()
+        call_command("export_data", "reviews", since_id=self.reviews[0].pk, chunk_size=1, stdout=out, stderr=err)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "id,restaurant_id,author_id,rating,content,created_at")
+        self.assertEqual(len(lines), 3)
+        self.assertIn('"리뷰, 1"', lines[1])
+        self.assertIn("2행", err.getvalue())
+
+        out = StringIO()
+        call_command("export_data", "reviews", since="2999-01-01", stdout=out, stderr=StringIO())
+        self.assertEqual(len(out.getvalue().splitlines()), 1)
+
+    def test_staff_streaming_endpoint(self):
+        url = reverse("export", args=["restaurants"])
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.user)
+        response = self.client.get(url, {"format": "jsonl"})
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="restaurants.jsonl"', response["Content-Disposition"])
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([(row["name"], row["category"]) for row in rows], [("내보낼집", None)])
+
+        self.assertEqual(self.client.get(url, {"since": "어제"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("export", args=["users"])).status_code, 400)
+
+
+@override_settings(ANONYMOUS_PAGE_CACHE=True, ANONYMOUS_PAGE_CACHE_TIMEOUT=60, ANONYMOUS_PAGE_CACHE_STALE=600)
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        view_counter.clear()
+        self.addCleanup(view_counter.clear)
+        self.user = User.objects.create_user(username="tester", password="pass12345")
+        self.category = Category.objects.create(name="한식")
+        self.restaurant = Restaurant.objects.create(name="맛집", address="서울", category=self.category)
+        self.detail_url = reverse("restaurants:detail", args=[self.restaurant.pk])
+        self.anonymous = Client()
+
+    def test_hit_skips_view_but_counts_views(self):
+        self.assertEqual(self.anonymous.get(self.detail_url)["X-Page-Cache"], "miss")
+        with self.assertNumQueries(0):
+            response = self.anonymous.get(self.detail_url)
+        self.assertEqual(response["X-Page-Cache"], "hit")
+        self.assertContains(response, "맛집")
+        self.assertEqual(view_counter.pending(self.restaurant.pk), 2)
+
+        # 로그인 사용자는 캐시를 거치지 않는다
+        self.client.force_login(self.user)
+        self.assertNotIn("X-Page-Cache", self.client.get(self.detail_url))
+
+    def test_normalized_query_string(self):
+        url = reverse("restaurants:list")
+        self.anonymous.get(url, {"sort": "rating", "category": self.category.pk})
+        response = self.anonymous.get(f"{url}?q=&category={self.category.pk}&sort=rating")
+        self.assertEqual(response["X-Page-Cache"], "hit")
+
+    def test_review_write_invalidates_tagged_pages(self):
+        list_url = reverse("restaurants:list")
+        other = Category.objects.create(name="일식")
+        for url in [self.detail_url, reverse("reviews:list"), f"{list_url}?category={other.pk}"]:
+            self.anonymous.get(url)
+
+        self.client.force_login(self.user)
+        self.client.post(reverse("reviews:create", args=[self.restaurant.pk]), {"rating": 5, "content": "최고예요"})
+
+        response = self.anonymous.get(self.detail_url)
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "최고예요")
+        self.assertContains(self.anonymous.get(reverse("reviews:list")), "최고예요")
+        # 다른 카테고리 목록은 그대로
+        self.assertEqual(self.anonymous.get(f"{list_url}?category={other.pk}")["X-Page-Cache"], "hit")
+
+    def test_stale_while_revalidate(self):
+        self.anonymous.get(self.detail_url)
+        key = page_cache_key(RequestFactory().get(self.detail_url))
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(name="새이름")
+        invalidate_tags(f"restaurant:{self.restaurant.pk}")
+
+        # 다른 요청이 다시 만드는 중(잠금)이면 이전 응답을 그대로 보낸다
+        cache.add(f"{key}:lock", 1)
+        response = self.anonymous.get(self.detail_url)
+        self.assertEqual(response["X-Page-Cache"], "stale")
+        self.assertNotContains(response, "새이름")
+
+        cache.delete(f"{key}:lock")
+        response = self.anonymous.get(self.detail_url)
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "새이름")
+        self.assertIsNone(cache.get(f"{key}:lock"))
+
+        # 신선 기간이 지나도 잠금을 잡은 한 요청만 다시 만든다
+        with mock.patch("core.pagecache.time.time", return_value=time.time() + 120):
+            self.assertEqual(self.anonymous.get(self.detail_url)["X-Page-Cache"], "miss")
+        self.assertEqual(self.anonymous.get(self.detail_url)["X-Page-Cache"], "hit")
+
+    def test_home_invalidated_by_trending_update(self):
+        self.anonymous.get("/")
+        self.assertEqual(self.anonymous.get("/")["X-Page-Cache"], "hit")
+        compute_trending()
+        self.assertEqual(self.anonymous.get("/")["X-Page-Cache"], "miss")
+
+
+# 워커 프로세스 두 개 = 같은 캐시 폴더를 쓰는 FileCache 인스턴스 두 개
+# (LocMemCache 였다면 한쪽의 무효화/잠금이 다른 쪽에 보이지 않는다)
+@override_settings(ANONYMOUS_PAGE_CACHE=True, ANONYMOUS_PAGE_CACHE_TIMEOUT=60, ANONYMOUS_PAGE_CACHE_STALE=600)
+class SharedCacheTests(TestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        self.worker_a, self.worker_b = [FileCache(location, {}) for _ in range(2)]
+        self.restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        self.detail_url = reverse("restaurants:detail", args=[self.restaurant.pk])
+        self.anonymous = Client()
+
+    def get_on(self, worker):
+        with mock.patch("core.pagecache.cache", worker):
+            return self.anonymous.get(self.detail_url)
+
+    def test_default_cache_is_shared_between_processes(self):
+        self.assertNotIn("locmem", settings.CACHES["default"]["BACKEND"])
+
+    def test_invalidation_on_one_worker_reaches_the_other(self):
+        self.assertEqual(self.get_on(self.worker_a)["X-Page-Cache"], "miss")
+        self.assertEqual(self.get_on(self.worker_b)["X-Page-Cache"], "hit")
+
+        tag = f"restaurant:{self.restaurant.pk}"
+        before = _tag_versions([tag])
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(name="새이름")
+        with mock.patch("core.pagecache.cache", self.worker_a):
+            invalidate_tags(tag)
+        with mock.patch("core.pagecache.cache", self.worker_b):
+            self.assertNotEqual(_tag_versions([tag]), before)
+        response = self.get_on(self.worker_b)
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "새이름")
+
+    def test_rebuild_lock_is_shared(self):
+        self.get_on(self.worker_a)
+        with mock.patch("core.pagecache.cache", self.worker_a):
+            invalidate_tags(f"restaurant:{self.restaurant.pk}")
+        key = page_cache_key(RequestFactory().get(self.detail_url))
+
+        # 워커 A 가 다시 만드는 중이면 워커 B 는 잠금을 못 잡고 이전 응답을 보낸다
+        self.assertTrue(self.worker_a.add(f"{key}:lock", 1, 30))
+        self.assertFalse(self.worker_b.add(f"{key}:lock", 1, 30))
+        self.assertEqual(self.get_on(self.worker_b)["X-Page-Cache"], "stale")
+
+        self.worker_a.delete(f"{key}:lock")
+        self.assertEqual(self.get_on(self.worker_b)["X-Page-Cache"], "miss")
+
+    def test_add_replaces_expired_entry(self):
+        self.worker_a.add("lock", 1, 30)
+        with mock.patch("django.core.cache.backends.filebased.time.time", return_value=time.time() + 60):
+            self.assertTrue(self.worker_b.add("lock", 2, 30))
+            self.assertEqual(self.worker_a.get("lock"), 2)
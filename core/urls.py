@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("stats/requests/", views.request_stats_view, name="request_stats"),
+    path("exports/<str:name>/", views.export_view, name="export"),
 ]
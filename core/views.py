@@ -1,4 +1,49 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 
+from restaurants.trending import get_featured_restaurants
+from .exports import EXPORTS, FORMATS, export_lines, parse_since
+from .images import prefetch_variants
+from .metrics import request_stats
+from .pagecache import cache_anonymous_page
+
+@cache_anonymous_page(["trending"])
 def home(request):
-    return render(request, 'home.html')
+    # 인기 맛집은 update_trending 이 미리 계산한 순위 테이블에서 (캐시)
+    featured_restaurants = get_featured_restaurants()
+    prefetch_variants(restaurant.thumbnail for restaurant in featured_restaurants)
+    return render(request, 'home.html', {
+        'featured_restaurants': featured_restaurants,
+    })
+
+
+# URL 이름별 응답 시간 p50/p95, 쿼리 수 (이 프로세스가 받은 최근 요청 기준)
+@staff_member_required
+def request_stats_view(request):
+    return JsonResponse({"stats": request_stats.summary()})
+
+
+# 리뷰/음식점 CSV·JSONL 내보내기 (스트리밍 — 전체를 메모리에 올리지 않음)
+# ?format=csv|jsonl &since_id=123 &since=2026-01-01 (증분)
+@staff_member_required
+def export_view(request, name):
+    if name not in EXPORTS:
+        return HttpResponseBadRequest(f"내보낼 수 있는 데이터: {', '.join(EXPORTS)}")
+    file_format = request.GET.get("format", "csv")
+    if file_format not in FORMATS:
+        return HttpResponseBadRequest("format 은 csv 또는 jsonl 이에요.")
+    since_id = request.GET.get("since_id", "")
+    if since_id and not since_id.isdigit():
+        return HttpResponseBadRequest("since_id 는 숫자여야 해요.")
+    try:
+        since = parse_since(request.GET.get("since", ""))
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    response = StreamingHttpResponse(
+        export_lines(name, file_format, since_id=int(since_id or 0), since=since),
+        content_type=f"{FORMATS[file_format]}; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.{file_format}"'
+    return response
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .models import Favorite
+
+
+# 사용자별 즐겨찾기 음식점 id 집합 캐시
+# 목록/상세의 하트 표시를 카드마다 쿼리하지 않고 한 번에 판단하기 위함 (toggle_favorite 에서 무효화)
+# 토글을 처리한 워커가 지운 값을 다른 워커도 안 보게 하려면 공유 캐시(settings.CACHES)여야 한다.
+# CACHES 를 프로세스마다 따로인 LocMemCache 로 바꿔 둔 경우엔 다른 워커의 하트가 틀릴 수 있으므로 몇 초만 보관
+LOCAL_CACHE_TIMEOUT = 5
+
+
+def _cache_key(user_id):
+    return f"favorites:ids:{user_id}"
+
+
+def _timeout():
+    timeout = getattr(settings, "FAVORITE_IDS_CACHE_TIMEOUT", 60 * 60)
+    if isinstance(caches["default"], LocMemCache):
+        return min(timeout, LOCAL_CACHE_TIMEOUT)
+    return timeout
+
+
+def get_favorite_ids(user):
+    if not user.is_authenticated:
+        return frozenset()
+    key = _cache_key(user.pk)
+    ids = cache.get(key)
+    if ids is None:
+        ids = frozenset(Favorite.objects.filter(user=user).values_list("restaurant_id", flat=True))
+        cache.set(key, ids, _timeout())
+    return ids
+
+
+async def aget_favorite_ids(user):
+    if not user.is_authenticated:
+        return frozenset()
+    key = _cache_key(user.pk)
+    ids = await cache.aget(key)
+    if ids is None:
+        ids = frozenset([pk async for pk in Favorite.objects.filter(user=user).values_list("restaurant_id", flat=True)])
+        await cache.aset(key, ids, _timeout())
+    return ids
+
+
+def invalidate_favorite_ids(user_id):
+    cache.delete(_cache_key(user_id))
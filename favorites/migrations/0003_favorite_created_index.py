@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favorites', '0002_favorite_user_created_index'),
+        ('restaurants', '0007_trending_restaurant'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(fields=['created_at', 'restaurant'], name='favorite_created_idx'),
+        ),
+    ]
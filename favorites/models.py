@@ -11,6 +11,12 @@ class Favorite(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["user", "restaurant"], name="unique_favorite")
         ]
+        indexes = [
+            # 즐겨찾기 목록 / 마이페이지 (최신순)
+            models.Index(fields=["user", "-created_at"], name="favorite_user_created_idx"),
+            # 인기 맛집 점수 — 최근 즐겨찾기 집계 (restaurants.trending)
+            models.Index(fields=["created_at", "restaurant"], name="favorite_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} ♥ {self.restaurant.name}"
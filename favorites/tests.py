@@ -1,3 +1,76 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.cache import FileCache
+from restaurants.models import Category, Restaurant
+from .cache import _timeout, get_favorite_ids
+from .models import Favorite
+
+
+class FavoriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="tester", password="pass12345")
+        self.client.force_login(self.user)
+        category = Category.objects.create(name="한식")
+        self.restaurants = [
+            Restaurant.objects.create(name=f"식당{i}", address="서울", category=category)
+            for i in range(5)
+        ]
+
+    def toggle(self, restaurant):
+        return self.client.post(
+            reverse("favorites:toggle", args=[restaurant.pk]),
+            HTTP_ACCEPT="application/json",
+        ).json()["is_favorite"]
+
+    def test_favorite_list_is_a_single_query(self):
+        for restaurant in self.restaurants:
+            Favorite.objects.create(user=self.user, restaurant=restaurant)
+        # 세션 + 사용자 + 즐겨찾기 목록
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("favorites:list"))
+        self.assertEqual(len(response.context["favorites"]), 5)
+
+    def test_toggle_invalidates_cached_ids(self):
+        restaurant = self.restaurants[0]
+        self.assertEqual(get_favorite_ids(self.user), frozenset())
+        self.assertTrue(self.toggle(restaurant))
+        self.assertEqual(get_favorite_ids(self.user), {restaurant.pk})
+        self.assertFalse(self.toggle(restaurant))
+        self.assertEqual(get_favorite_ids(self.user), frozenset())
+
+    def test_list_and_detail_hearts_use_cached_ids(self):
+        self.toggle(self.restaurants[1])
+        response = self.client.get(reverse("restaurants:list"))
+        self.assertEqual(response.context["user_favorites"], {self.restaurants[1].pk})
+
+        url = reverse("restaurants:detail", args=[self.restaurants[1].pk])
+        self.client.get(url)
+        # 세션 + 사용자 + 음식점 (즐겨찾기 여부와 리뷰 섹션은 캐시)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertTrue(response.context["is_favorite"])
+
+    def test_toggle_on_one_worker_clears_ids_on_another(self):
+        # 워커 두 개 = 같은 캐시 폴더를 쓰는 캐시 인스턴스 두 개
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        worker_a, worker_b = [FileCache(location, {}) for _ in range(2)]
+        restaurant = self.restaurants[2]
+        with mock.patch("favorites.cache.cache", worker_b):
+            self.assertEqual(get_favorite_ids(self.user), frozenset())
+        with mock.patch("favorites.cache.cache", worker_a):
+            self.toggle(restaurant)
+        with mock.patch("favorites.cache.cache", worker_b):
+            self.assertEqual(get_favorite_ids(self.user), {restaurant.pk})
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_per_process_cache_keeps_ids_briefly(self):
+        self.assertLessEqual(_timeout(), 5)
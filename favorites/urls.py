@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -5,5 +6,5 @@ app_name = "favorites"
 
 urlpatterns = [
     path("toggle/<int:restaurant_id>/", views.toggle_favorite, name="toggle"),
-    path("", views.favorite_list, name="list"),
+    path("", views.favorite_list_async if settings.ASYNC_READ_VIEWS else views.favorite_list, name="list"),
 ]
\ No newline at end of file
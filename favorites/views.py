@@ -1,22 +1,34 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, render, redirect
 from django.http import JsonResponse
+from core.db import atomic_with_retry
+from core.images import prefetch_variants
+from core.metrics import query_budget
 from restaurants.models import Restaurant
+from restaurants.recommendations import like_changes
+from .cache import invalidate_favorite_ids
 from .models import Favorite
 
 
+# 즐겨찾기 추가/해제 → 추가됐으면 True (잠금 충돌이면 재시도)
+@atomic_with_retry
+def _toggle(user, restaurant):
+    obj, created = Favorite.objects.get_or_create(user=user, restaurant=restaurant)
+    if not created:
+        obj.delete()
+    return created
+
+
 # 즐겨찾기 토글 (AJAX + 일반 요청 둘 다 처리)
+# 쿼리: 세션, 사용자, 음식점, 즐겨찾기 조회 + 추가/삭제(savepoint 포함) — 추천 대기열은 요청 밖에서 (like_changes)
 @login_required
+@query_budget(7)
 def toggle_favorite(request, restaurant_id):
     restaurant = get_object_or_404(Restaurant, pk=restaurant_id)
-    obj, created = Favorite.objects.get_or_create(
-        user=request.user, restaurant=restaurant
-    )
-    if not created:
-        obj.delete()
-        is_favorite = False
-    else:
-        is_favorite = True
+    is_favorite = _toggle(request.user, restaurant)
+    invalidate_favorite_ids(request.user.pk)
+    like_changes.add(request.user.pk, restaurant.pk)  # 비슷한 음식점 다시 계산 — 요청 밖에서 모아서 쌓는다
 
     # AJAX 요청이면 JSON 반환, 일반 요청이면 상세페이지로 이동
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or \
@@ -29,24 +41,31 @@ def toggle_favorite(request, restaurant_id):
 
 # 즐겨찾기 목록
 @login_required
+@query_budget(4)
 def favorite_list(request):
-    from django.db.models import Avg, Count
-
-    favorites = Favorite.objects.filter(
+    # 쿼리 1번: 음식점/카테고리는 JOIN, avg_rating·review_count 는 Restaurant 에 저장된 집계 컬럼
+    favorites = list(Favorite.objects.filter(
         user=request.user
-    ).select_related('restaurant').prefetch_related(
-        'restaurant__reviews'
-    ).order_by('-created_at')
-
-    # 각 음식점에 avg_rating, review_count 추가
-    for fav in favorites:
-        fav.restaurant.avg_rating = fav.restaurant.reviews.aggregate(
-            avg=Avg('rating')
-        )['avg']
-        if fav.restaurant.avg_rating:
-            fav.restaurant.avg_rating = round(fav.restaurant.avg_rating, 1)
-        fav.restaurant.review_count = fav.restaurant.reviews.count()
+    ).select_related('restaurant__category').order_by('-created_at'))
+    prefetch_variants(favorite.restaurant.thumbnail for favorite in favorites)
 
     return render(request, 'favorites/list.html', {
         'favorites': favorites,
-    })
\ No newline at end of file
+    })
+
+
+# 즐겨찾기 목록 (ASGI 용 async 버전 — settings.ASYNC_READ_VIEWS)
+@login_required
+@query_budget(4)
+async def favorite_list_async(request):
+    user = await request.auser()
+    favorites = [
+        favorite async for favorite in Favorite.objects.filter(
+            user=user
+        ).select_related('restaurant__category').order_by('-created_at')
+    ]
+    await sync_to_async(prefetch_variants)([favorite.restaurant.thumbnail for favorite in favorites])
+
+    return await sync_to_async(render)(request, 'favorites/list.html', {
+        'favorites': favorites,
+    })
@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Reservation, Visit
+from .models import Reservation, ReservationSchedule, ReservationSlot, Visit
 
 admin.site.register(Reservation)
+admin.site.register(ReservationSchedule)
+admin.site.register(ReservationSlot)
 admin.site.register(Visit)
\ No newline at end of file
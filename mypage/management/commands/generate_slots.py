@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mypage.reservations import days_ahead, generate_slots
+
+
+class Command(BaseCommand):
+    help = (
+        "음식점별 예약 시간표로 앞으로 며칠치 예약 시간대를 미리 만들고 지난 시간대는 지웁니다. "
+        "이미 만든 시간대(예약 인원 포함)는 그대로 둡니다. 하루 한 번 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="오늘부터 만들 날 수 (기본 settings.RESERVATION_DAYS_AHEAD)")
+        parser.add_argument("--restaurant", type=int, action="append", help="이 음식점만 (여러 번 줄 수 있음)")
+
+    def handle(self, *args, **options):
+        days = options["days"] or days_ahead()
+        if days < 1:
+            raise CommandError("--days 는 1 이상이어야 해요.")
+        created = generate_slots(options["restaurant"], days)
+        self.stdout.write(self.style.SUCCESS(f"{days}일치 예약 시간대 {created}개를 새로 만들었어요."))
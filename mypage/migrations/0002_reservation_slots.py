@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mypage', '0001_initial'),
+        ('restaurants', '0011_similar_restaurants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='party_size',
+            field=models.PositiveSmallIntegerField(default=2),
+        ),
+        migrations.CreateModel(
+            name='ReservationSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, '월'), (1, '화'), (2, '수'), (3, '목'), (4, '금'), (5, '토'), (6, '일')])),
+                ('opens_at', models.TimeField()),
+                ('closes_at', models.TimeField()),
+                ('slot_minutes', models.PositiveSmallIntegerField(default=60)),
+                ('capacity', models.PositiveSmallIntegerField(default=20)),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_schedules', to='restaurants.restaurant')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReservationSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('starts_at', models.DateTimeField()),
+                ('capacity', models.PositiveSmallIntegerField()),
+                ('booked', models.PositiveSmallIntegerField(default=0)),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservation_slots', to='restaurants.restaurant')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='slot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reservations', to='mypage.reservationslot'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['user', 'reserved_at'], name='reservation_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationschedule',
+            constraint=models.CheckConstraint(condition=models.Q(('closes_at__gt', models.F('opens_at')), ('slot_minutes__gt', 0)), name='reservation_schedule_hours'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationslot',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'starts_at'), name='reservation_slot_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationslot',
+            constraint=models.CheckConstraint(condition=models.Q(('booked__lte', models.F('capacity'))), name='reservation_slot_capacity'),
+        ),
+    ]
@@ -4,12 +4,66 @@ from restaurants.models import Restaurant
 
 User = settings.AUTH_USER_MODEL
 
+# 음식점별 예약 시간표 — 요일마다 여러 줄(점심/저녁 등)을 둘 수 있다
+# manage.py generate_slots 가 이 시간표로 앞으로 RESERVATION_DAYS_AHEAD 일치 ReservationSlot 을 미리 만든다
+class ReservationSchedule(models.Model):
+    WEEKDAYS = [(0, "월"), (1, "화"), (2, "수"), (3, "목"), (4, "금"), (5, "토"), (6, "일")]
+
+    restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name="reservation_schedules")
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAYS)
+    opens_at = models.TimeField()
+    closes_at = models.TimeField()    # 마지막 시간대는 이 시각 전에 끝난다
+    slot_minutes = models.PositiveSmallIntegerField(default=60)
+    capacity = models.PositiveSmallIntegerField(default=20)  # 시간대마다 받을 수 있는 인원
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(closes_at__gt=models.F("opens_at"), slot_minutes__gt=0), name="reservation_schedule_hours",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.restaurant} {self.get_weekday_display()} {self.opens_at:%H:%M}-{self.closes_at:%H:%M}"
+
+
+# 예약 시간대 + 지금까지 예약된 인원 (mypage.reservations)
+# 예약/취소는 booked 를 조건부 UPDATE 로 바꾸고, booked <= capacity 는 DB 제약으로도 지킨다
+class ReservationSlot(models.Model):
+    restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name="reservation_slots")
+    starts_at = models.DateTimeField()
+    capacity = models.PositiveSmallIntegerField()
+    booked = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # (음식점, 시작 시각) 인덱스 하나로 "앞으로 14일 빈 시간대" 를 찾는다
+            models.UniqueConstraint(fields=["restaurant", "starts_at"], name="reservation_slot_unique"),
+            models.CheckConstraint(condition=models.Q(booked__lte=models.F("capacity")), name="reservation_slot_capacity"),
+        ]
+
+    def __str__(self):
+        return f"{self.restaurant} {self.starts_at:%Y-%m-%d %H:%M} ({self.booked}/{self.capacity})"
+
+    @property
+    def remaining(self):
+        return self.capacity - self.booked
+
+
 class Reservation(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
+    slot = models.ForeignKey(ReservationSlot, on_delete=models.SET_NULL, null=True, blank=True, related_name="reservations")
     reserved_at = models.DateTimeField()
+    party_size = models.PositiveSmallIntegerField(default=2)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 마이페이지 예약 목록 (사용자별, 예약 시각 순)
+            models.Index(fields=["user", "reserved_at"], name="reservation_user_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user} - {self.restaurant}"
 
@@ -0,0 +1,130 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from core.db import atomic_with_retry
+from .models import Reservation, ReservationSchedule, ReservationSlot
+
+# ---------------------------------------------------------------
+# 예약 시간대
+# - 시간표(ReservationSchedule)로 앞으로 RESERVATION_DAYS_AHEAD 일치 시간대를 ReservationSlot 에 미리 만들어 둔다
+#   (manage.py generate_slots — 하루 한 번. 이미 만든 시간대는 예약이 걸려 있을 수 있으므로 그대로 둔다)
+# - 빈 시간대 조회: (음식점, 시작 시각) 인덱스 범위 + "booked + 인원 <= capacity" 조건, 쿼리 1번
+# - 예약: "booked + 인원 <= capacity 일 때만 booked += 인원" 조건부 UPDATE 한 번으로 자리를 잡는다.
+#   바뀐 행이 없으면 자리가 없는 것 — 동시에 들어온 예약이 같은 자리를 두 번 가져갈 수 없다
+#   (SQLite 는 BEGIN IMMEDIATE 로 쓰기가 차례로 처리되고, 행 잠금 DB 는 잠금을 잡은 뒤 조건을 다시 확인한다.
+#    그래도 booked <= capacity 는 DB 제약으로 한 번 더 막는다)
+# ---------------------------------------------------------------
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+def days_ahead():
+    return getattr(settings, "RESERVATION_DAYS_AHEAD", 14)
+
+
+def max_party_size():
+    return getattr(settings, "RESERVATION_MAX_PARTY_SIZE", 8)
+
+
+# 예약을 받는 기간의 끝 (오늘 포함 days 일 뒤 자정)
+def _window_end(today, days):
+    return timezone.make_aware(datetime.combine(today + timedelta(days=days), time.min))
+
+
+# 시간표 한 줄 → 그날의 시간대 시작 시각들 (마지막 시간대도 closes_at 전에 끝난다)
+def _slot_times(schedule, day):
+    start = datetime.combine(day, schedule.opens_at)
+    end = datetime.combine(day, schedule.closes_at)
+    step = timedelta(minutes=schedule.slot_minutes)
+    while start + step <= end:
+        yield timezone.make_aware(start)
+        start += step
+
+
+# 시간표 → 앞으로 days 일치 시간대를 만든다 → 새로 만든 시간대 수
+# 지난 시간대는 지운다 (예약에는 reserved_at 이 남으므로 slot 만 비워진다)
+def generate_slots(restaurant_ids=None, days=None, today=None):
+    today = today or timezone.localdate()
+    days = days or days_ahead()
+    schedules = ReservationSchedule.objects.all()
+    if restaurant_ids is not None:
+        schedules = schedules.filter(restaurant_id__in=restaurant_ids)
+    by_weekday = defaultdict(list)
+    for schedule in schedules:
+        by_weekday[schedule.weekday].append(schedule)
+
+    slots = [
+        ReservationSlot(restaurant_id=schedule.restaurant_id, starts_at=starts_at, capacity=schedule.capacity)
+        for day in (today + timedelta(days=offset) for offset in range(days))
+        for schedule in by_weekday[day.weekday()]
+        for starts_at in _slot_times(schedule, day)
+    ]
+    window = ReservationSlot.objects.filter(starts_at__gte=_window_end(today, 0), starts_at__lt=_window_end(today, days))
+    if restaurant_ids is not None:
+        window = window.filter(restaurant_id__in=restaurant_ids)
+    created = _insert_slots(slots, window)
+    ReservationSlot.objects.filter(starts_at__lt=_window_end(today, 0)).delete()
+    return created
+
+
+# 이미 있는 시간대는 건너뛰고 넣는다 → 새로 들어간 수
+# (ignore_conflicts 라 DB 가 넣은 행 수를 알려주지 않으므로, 만든 기간·음식점 안의 행 수를 앞뒤로 센다.
+#  한 트랜잭션이라 그 사이 다른 generate_slots 가 끼어들지 않는다)
+@atomic_with_retry
+def _insert_slots(slots, window):
+    before = window.count()
+    ReservationSlot.objects.bulk_create(slots, batch_size=1000, ignore_conflicts=True)
+    return window.count() - before
+
+
+# 예약 가능한 시간대 (지금 이후 ~ 예약 기간 끝, party_size 명이 들어갈 자리가 남은 것) — 쿼리 1번
+def available_slots(restaurant_id, party_size=1, now=None):
+    now = now or timezone.now()
+    return list(
+        ReservationSlot.objects.filter(
+            restaurant_id=restaurant_id,
+            starts_at__gt=now,
+            starts_at__lt=_window_end(timezone.localdate(now), days_ahead()),
+            booked__lte=F("capacity") - party_size,
+        ).order_by("starts_at")
+    )
+
+
+# 예약 → Reservation (그 음식점의 시간대가 아니거나, 자리가 없거나, 지난 시간대면 SlotUnavailable)
+@atomic_with_retry
+def book(user, restaurant_id, slot_id, party_size):
+    slots = ReservationSlot.objects.filter(pk=slot_id, restaurant_id=restaurant_id)
+    taken = slots.filter(
+        starts_at__gt=timezone.now(), booked__lte=F("capacity") - party_size,
+    ).update(booked=F("booked") + party_size)
+    if not taken:
+        raise SlotUnavailable
+    starts_at = slots.values_list("starts_at", flat=True).get()
+    return Reservation.objects.create(
+        user=user, restaurant_id=restaurant_id, slot_id=slot_id, reserved_at=starts_at, party_size=party_size,
+    )
+
+
+# 예약 취소 — 지운 경우에만 자리를 돌려놓는다 (같은 예약을 두 번 취소해도 한 번만 반영)
+@atomic_with_retry
+def cancel(reservation):
+    deleted, _ = Reservation.objects.filter(pk=reservation.pk).delete()
+    if deleted and reservation.slot_id:
+        ReservationSlot.objects.filter(pk=reservation.slot_id).update(booked=F("booked") - reservation.party_size)
+    return bool(deleted)
+
+
+# 탈퇴 — CASCADE 로 지워질 예약의 자리를 돌려놓는다 (사용자를 지우는 트랜잭션 안에서 호출)
+def release_reservations(user):
+    rows = (
+        Reservation.objects.filter(user=user, slot__isnull=False).order_by()
+        .values("slot_id").annotate(seats=Sum("party_size"))
+    )
+    for row in rows:
+        ReservationSlot.objects.filter(pk=row["slot_id"]).update(booked=F("booked") - row["seats"])
@@ -1,3 +1,153 @@
-from django.test import TestCase
+import threading
+from datetime import time, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from restaurants.models import Restaurant
+from .models import Reservation, ReservationSchedule, ReservationSlot
+from .reservations import SlotUnavailable, available_slots, book, cancel, generate_slots
+
+
+# 매일 11:00 ~ 14:00, 한 시간 단위 → 하루 3개 시간대
+def add_daily_schedule(restaurant, capacity=10):
+    ReservationSchedule.objects.bulk_create([
+        ReservationSchedule(
+            restaurant=restaurant, weekday=weekday, opens_at=time(11), closes_at=time(14), slot_minutes=60, capacity=capacity,
+        )
+        for weekday in range(7)
+    ])
+
+
+class ReservationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="pass12345")
+        self.restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        self.other = Restaurant.objects.create(name="옆집", address="서울")
+        add_daily_schedule(self.restaurant)
+        self.tomorrow = timezone.localdate() + timedelta(days=1)
+
+    def test_generate_slots_is_idempotent_and_drops_past_slots(self):
+        past = ReservationSlot.objects.create(
+            restaurant=self.restaurant, starts_at=timezone.now() - timedelta(days=3), capacity=10,
+        )
+        out = StringIO()
+        call_command("generate_slots", "--days", "14", stdout=out)
+        self.assertIn("42개", out.getvalue())
+        self.assertEqual(generate_slots(days=14), 0)
+        self.assertFalse(ReservationSlot.objects.filter(pk=past.pk).exists())
+        self.assertFalse(ReservationSlot.objects.filter(restaurant=self.other).exists())
+
+    def test_generate_slots_counts_only_generated_window(self):
+        # 기간 밖 / 다른 음식점의 시간대는 새로 만든 수에 섞이지 않는다
+        add_daily_schedule(self.other)
+        generate_slots([self.other.pk], today=self.tomorrow, days=14)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(generate_slots([self.restaurant.pk], today=self.tomorrow, days=2), 6)
+        counts = [q["sql"] for q in ctx.captured_queries if "COUNT(" in q["sql"]]
+        self.assertEqual(len(counts), 2)
+        self.assertTrue(all('"starts_at" >=' in sql and '"restaurant_id" IN' in sql for sql in counts))
+        self.assertEqual(generate_slots(today=self.tomorrow, days=3), 3)  # 셋째 날 맛집만
+
+    def test_available_slots_single_query(self):
+        generate_slots(today=self.tomorrow, days=14)
+        slot = ReservationSlot.objects.filter(restaurant=self.restaurant).order_by("starts_at").first()
+        ReservationSlot.objects.filter(pk=slot.pk).update(booked=9)
+        with self.assertNumQueries(1):
+            slots = available_slots(self.restaurant.pk, party_size=2)
+        # 오늘부터 14일 기간 안(내일 ~ 13일 뒤)만, 2명이 들어갈 자리가 없는 시간대는 빠진다
+        self.assertEqual(len(slots), 13 * 3 - 1)
+        self.assertNotIn(slot, slots)
+        self.assertIn(slot, available_slots(self.restaurant.pk, party_size=1))
+        self.assertEqual(available_slots(self.other.pk), [])
+
+    def test_book_rejects_full_past_and_foreign_slots(self):
+        generate_slots(today=self.tomorrow, days=1)
+        slot = ReservationSlot.objects.filter(restaurant=self.restaurant).first()
+        book(self.user, self.restaurant.pk, slot.pk, 8)
+        with self.assertRaises(SlotUnavailable):
+            book(self.user, self.restaurant.pk, slot.pk, 3)
+        with self.assertRaises(SlotUnavailable):
+            book(self.user, self.other.pk, slot.pk, 1)
+        ReservationSlot.objects.filter(pk=slot.pk).update(starts_at=timezone.now() - timedelta(hours=1))
+        with self.assertRaises(SlotUnavailable):
+            book(self.user, self.restaurant.pk, slot.pk, 1)
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 8)
+        # 조건부 UPDATE 를 거치지 않아도 DB 제약이 초과 예약을 막는다
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ReservationSlot.objects.filter(pk=slot.pk).update(booked=F("capacity") + 1)
+
+    def test_reserve_and_cancel_views(self):
+        generate_slots(today=self.tomorrow, days=1)
+        slot = ReservationSlot.objects.filter(restaurant=self.restaurant).order_by("starts_at").first()
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("reserve", args=[self.restaurant.pk]), {"party_size": 4})
+        self.assertContains(response, f'value="{slot.pk}"')
+        response = self.client.post(reverse("reserve", args=[self.restaurant.pk]), {"slot": slot.pk, "party_size": 4})
+        self.assertRedirects(response, reverse("mypage"))
+        reservation = Reservation.objects.get(user=self.user)
+        self.assertEqual((reservation.slot_id, reservation.reserved_at, reservation.party_size), (slot.pk, slot.starts_at, 4))
+        self.assertContains(self.client.get(reverse("mypage")), "4명")
+
+        self.client.post(reverse("cancel_reservation", args=[reservation.pk]))
+        self.assertFalse(cancel(reservation))  # 두 번 취소해도 자리는 한 번만 돌려놓는다
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 0)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_delete_account_releases_seats(self):
+        generate_slots(today=self.tomorrow, days=1)
+        slot = ReservationSlot.objects.filter(restaurant=self.restaurant).first()
+        book(self.user, self.restaurant.pk, slot.pk, 3)
+        self.client.force_login(self.user)
+        self.client.post("/users/delete-account/", {"password": "pass12345"})
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 0)
+
+
+# 스레드마다 자기 DB 연결로 같은 시간대를 동시에 예약 — 데이터를 커밋해야 다른 연결에서 보인다
+@override_settings(DB_WRITE_RETRY_ATTEMPTS=100, DB_WRITE_RETRY_BACKOFF=0.002)
+class ReservationConcurrencyTests(TransactionTestCase):
+    def test_simultaneous_bookings_never_overbook(self):
+        restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        add_daily_schedule(restaurant, capacity=10)
+        generate_slots(today=timezone.localdate() + timedelta(days=1), days=1)
+        slot = ReservationSlot.objects.filter(restaurant=restaurant).first()
+        users = [User.objects.create_user(username=f"guest{i}") for i in range(20)]
+
+        barrier = threading.Barrier(len(users))
+        results, errors = [], []
+
+        def run(user):
+            try:
+                barrier.wait()
+                book(user, restaurant.pk, slot.pk, 2)
+                results.append("booked")
+            except SlotUnavailable:
+                results.append("full")
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results.count("booked"), 5)
+        self.assertEqual(results.count("full"), 15)
+        slot.refresh_from_db()
+        self.assertEqual(slot.booked, 10)
+        self.assertEqual(Reservation.objects.filter(slot=slot).count(), 5)
@@ -3,4 +3,6 @@ from . import views
 
 urlpatterns = [
     path('', views.mypage, name='mypage'),
+    path('reserve/<int:restaurant_id>/', views.reserve, name='reserve'),
+    path('reservations/<int:reservation_id>/cancel/', views.cancel_reservation, name='cancel_reservation'),
 ]
\ No newline at end of file
@@ -1,13 +1,74 @@
+from itertools import groupby
+
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+
+from core.metrics import query_budget
+from restaurants.models import Restaurant
+from .models import Reservation, Visit
+from .reservations import SlotUnavailable, available_slots, book, cancel, max_party_size
+
+
+def _party_size(value, default=2):
+    try:
+        party_size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return min(max(party_size, 1), max_party_size())
+
 
 @login_required
+@query_budget(4)
 def mypage(request):
-    # 🔧 DB 연결 전 임시 데이터
-    reservations = []
-    visits = []
+    # 다가오는 예약 (사용자, 예약 시각 인덱스) + 방문한 맛집
+    reservations = Reservation.objects.filter(
+        user=request.user, reserved_at__gte=timezone.now(),
+    ).select_related('restaurant').order_by('reserved_at')
+    visits = Visit.objects.filter(user=request.user).select_related('restaurant').order_by('-visited_at')
 
     return render(request, 'mypage/mypage.html', {
         'reservations': reservations,
         'visits': visits,
-    })
\ No newline at end of file
+    })
+
+
+# 예약하기 — GET: 앞으로 예약 가능한 시간대 (날짜별), POST: 시간대 하나 예약
+@login_required
+@query_budget(8)
+def reserve(request, restaurant_id):
+    restaurant = get_object_or_404(Restaurant, pk=restaurant_id)
+
+    if request.method == 'POST':
+        party_size = _party_size(request.POST.get('party_size'))
+        try:
+            book(request.user, restaurant.pk, int(request.POST.get('slot', '')), party_size)
+        except (SlotUnavailable, ValueError):
+            messages.error(request, '방금 자리가 다 찼거나 예약할 수 없는 시간이에요. 다른 시간을 골라주세요.')
+            return redirect('reserve', restaurant_id=restaurant.pk)
+        messages.success(request, f'{restaurant.name} 예약이 완료됐어요! 📅')
+        return redirect('mypage')
+
+    party_size = _party_size(request.GET.get('party_size'))
+    slots = available_slots(restaurant.pk, party_size)
+    days = [
+        (day, list(day_slots))
+        for day, day_slots in groupby(slots, key=lambda slot: timezone.localtime(slot.starts_at).date())
+    ]
+    return render(request, 'mypage/reserve.html', {
+        'restaurant': restaurant,
+        'days': days,
+        'party_size': party_size,
+        'party_sizes': range(1, max_party_size() + 1),
+    })
+
+
+# 예약 취소
+@login_required
+def cancel_reservation(request, reservation_id):
+    reservation = get_object_or_404(Reservation, pk=reservation_id, user=request.user)
+    if request.method == 'POST':
+        cancel(reservation)
+        messages.success(request, '예약이 취소됐어요.')
+    return redirect('mypage')
@@ -1,5 +1,52 @@
+import atexit
+
 from django.apps import AppConfig
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
 
 
 class RestaurantsConfig(AppConfig):
     name = 'restaurants'
+
+    def ready(self):
+        from core.images import variants_ready
+        from .recommendations import like_changes
+        from .search import ensure_search_triggers
+        from .viewcounts import view_counter
+
+        # SQLite 테이블 재생성으로 지워진 검색 인덱스 트리거 복구
+        post_migrate.connect(ensure_search_triggers, sender=self)
+
+        # 종료 시 아직 반영되지 않은 조회수 / 추천 재계산 대기열 저장
+        atexit.register(view_counter.flush)
+        atexit.register(like_changes.flush)
+
+        # 관리자 화면 등에서 음식점/카테고리를 저장하거나 지워도 페이지 캐시와 API ETag 가 바뀌도록
+        for signal in (post_save, post_delete):
+            signal.connect(invalidate_restaurant_tags, sender="restaurants.Restaurant")
+            signal.connect(invalidate_restaurant_tags, sender="restaurants.Category")
+
+        variants_ready.connect(refresh_thumbnail_pages)
+
+
+# 커밋된 뒤에 태그 버전을 바꾼다 (커밋 전에 바꾸면 다른 요청이 새 버전으로 예전 데이터를 캐시할 수 있다)
+def invalidate_restaurant_tags(sender, instance, **kwargs):
+    from core.pagecache import invalidate_tags
+
+    if sender._meta.model_name == "category":
+        tags = [f"category:{instance.pk}"]
+    else:
+        tags = [f"restaurant:{instance.pk}", f"category:{instance.category_id}"]
+    transaction.on_commit(lambda: invalidate_tags("restaurants", *tags))
+
+
+# 썸네일 변환본이 생기면 그 썸네일을 보여 주는 비로그인 페이지 캐시(상세, 카테고리/전체 목록, 홈)를 무효화
+def refresh_thumbnail_pages(sender, sources, **kwargs):
+    from core.pagecache import invalidate_tags
+    from .models import Restaurant
+
+    tags = set()
+    for pk, category_id in Restaurant.objects.filter(thumbnail__in=sources).values_list("pk", "category_id"):
+        tags.update([f"restaurant:{pk}", f"category:{category_id}"])
+    if tags:
+        invalidate_tags("restaurants", "trending", *tags)
@@ -0,0 +1,278 @@
+import bisect
+import heapq
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+
+from .models import Category, Restaurant
+
+# ---------------------------------------------------------------
+# 검색어 자동완성 인덱스 (프로세스 메모리)
+# - 음식점 이름/주소, 카테고리 이름의 "단어로 시작하는 부분"("서울 강남구 역삼동" → 강남구 역삼동, 역삼동)을
+#   정렬된 배열에 넣고 bisect 로 접두사 범위를 찾는다
+# - 이름/카테고리는 초성 문자열도 따로 넣어 "ㅅㅌㅂㅅ" 같은 초성 검색을 받는다
+# - 인기순 상위 k 개는 범위를 다 훑지 않고, 32 / 1024 / 32768 칸 블록마다 미리 골라 둔 상위 목록을 합쳐서 찾는다
+#   (인기도는 항목마다 하나라서, 전체 상위 k 안의 항목은 자기가 들어 있는 어느 블록에서도 상위 k 안에 있다)
+# - 첫 검색 때 만들고, AUTOCOMPLETE_REBUILD_INTERVAL 마다 백그라운드에서 새로 만들어 바꿔 낀다
+#   새로 등록된 음식점은 그 사이 작은 정렬 목록(recent)에 바로 추가된다 (등록을 처리한 프로세스 기준)
+# ---------------------------------------------------------------
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JONGSEONG = [
+    "", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+    "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ",
+]
+HANGUL_FIRST, HANGUL_LAST = 0xAC00, 0xD7A3
+SYLLABLES_PER_CHOSEONG = 21 * 28
+BLOCK_SIZES = (32, 1024, 32768)
+TEXT, CHOSEONG_KEYS = "text", "choseong"
+
+
+def normalize(text):
+    return " ".join(unicodedata.normalize("NFC", text or "").casefold().split())
+
+
+def _is_syllable(char):
+    return HANGUL_FIRST <= ord(char) <= HANGUL_LAST
+
+
+# 음절 → 초성 (str.translate 용 표)
+_CHOSEONG_TABLE = {
+    code: CHOSEONG[(code - HANGUL_FIRST) // SYLLABLES_PER_CHOSEONG] for code in range(HANGUL_FIRST, HANGUL_LAST + 1)
+}
+
+
+def choseong(text):
+    return text.translate(_CHOSEONG_TABLE)
+
+
+# "서울 강남구 역삼동" → ["서울 강남구 역삼동", "강남구 역삼동", "역삼동"] (번지 같은 숫자로 시작하는 건 제외)
+def word_keys(text):
+    words = normalize(text).split()
+    return [" ".join(words[i:]) for i in range(len(words)) if not words[i][0].isdigit()]
+
+
+def _after(prefix):
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+# 초성 하나로 시작하는 음절 범위 ("ㄱ" → 가 ~ 깋)
+def _choseong_block(char):
+    start = HANGUL_FIRST + CHOSEONG.index(char) * SYLLABLES_PER_CHOSEONG
+    return chr(start), chr(start + SYLLABLES_PER_CHOSEONG)
+
+
+# 검색어 → [(배열 종류, 시작 키, 끝 키(미포함))]
+# 입력 중인 마지막 글자는 완성되지 않았을 수 있으므로 범위를 넓힌다
+def query_ranges(query):
+    if all(char in CHOSEONG or char == " " for char in query):
+        return [(CHOSEONG_KEYS, query, _after(query))]
+    head, last = query[:-1], query[-1]
+    if last in CHOSEONG:
+        # "김ㅊ" → 김치, 김초밥 ...
+        start, end = _choseong_block(last)
+        return [(TEXT, head + start, head + end)]
+    if _is_syllable(last):
+        jong = (ord(last) - HANGUL_FIRST) % 28
+        if jong == 0:
+            # 받침을 아직 안 쳤을 수 있다 "마" → 마, 막, 맛, 망 ...
+            return [(TEXT, query, head + chr(ord(last) + 28))]
+        ranges = [(TEXT, query, _after(query))]
+        if JONGSEONG[jong] in CHOSEONG:
+            # 받침이 다음 글자의 초성일 수 있다 "맛" → 마시, 마사 ...
+            start, end = _choseong_block(JONGSEONG[jong])
+            base = head + chr(ord(last) - jong)
+            ranges.append((TEXT, base + start, base + end))
+        return ranges
+    return [(TEXT, query, _after(query))]
+
+
+class PrefixIndex:
+    def __init__(self, limit):
+        self.limit = limit
+        self.suggestions = []  # 항목 번호 → (종류, id, 이름, 주소)
+        self.rank_keys = []    # 항목 번호 → (-인기도, 번호) — 작을수록 앞 (음식점: 리뷰 수, 카테고리: 음식점 수)
+        self.restaurant_ids = set()
+        self._keys = {TEXT: [], CHOSEONG_KEYS: []}
+        self._items = {TEXT: [], CHOSEONG_KEYS: []}
+        self._tops = {TEXT: {}, CHOSEONG_KEYS: {}}
+        self._recent = {TEXT: [], CHOSEONG_KEYS: []}  # 만든 뒤 추가된 (키, 항목 번호) — 정렬 유지
+        self._entries = {TEXT: [], CHOSEONG_KEYS: []}
+
+    def _add_item(self, suggestion, popularity, names, addresses=""):
+        item = len(self.suggestions)
+        self.suggestions.append(suggestion)
+        self.rank_keys.append((-popularity, item))
+        keys = {TEXT: set(word_keys(addresses)), CHOSEONG_KEYS: set()}
+        for name in names:
+            name_keys = word_keys(name)
+            keys[TEXT].update(name_keys)
+            keys[CHOSEONG_KEYS].update(choseong(key) for key in name_keys)
+        return item, keys
+
+    def add(self, suggestion, popularity, names, addresses=""):
+        item, keys = self._add_item(suggestion, popularity, names, addresses)
+        for kind, kind_keys in keys.items():
+            self._entries[kind].extend((key, item) for key in kind_keys)
+
+    def add_restaurant(self, pk, name, address, review_count=0):
+        self.restaurant_ids.add(pk)
+        self.add(("restaurant", pk, name, address), review_count, [name], address)
+
+    # 만든 뒤에 추가 — 블록 구조는 그대로 두고 recent 에 넣는다
+    def add_recent_restaurant(self, pk, name, address, review_count=0):
+        self.restaurant_ids.add(pk)
+        item, keys = self._add_item(("restaurant", pk, name, address), review_count, [name], address)
+        for kind, kind_keys in keys.items():
+            for key in kind_keys:
+                bisect.insort(self._recent[kind], (key, item))
+
+    @property
+    def recent_count(self):
+        return len(self._recent[TEXT])
+
+    def _best(self, candidates, limit):
+        return heapq.nsmallest(limit, set(candidates), key=self.rank_keys.__getitem__)
+
+    # 정렬 + 블록별 상위 목록 계산
+    def finish(self):
+        for kind, entries in self._entries.items():
+            entries.sort()
+            self._keys[kind] = [key for key, _ in entries]
+            items = self._items[kind] = [item for _, item in entries]
+            tops, smaller = {}, None
+            for size in BLOCK_SIZES:
+                if size > len(items):
+                    break
+                if smaller is None:
+                    blocks = [items[start:start + size] for start in range(0, len(items) - size + 1, size)]
+                else:
+                    step = size // smaller[0]
+                    blocks = [
+                        [item for top in smaller[1][start:start + step] for item in top]
+                        for start in range(0, len(items) // size * step, step)
+                    ]
+                tops[size] = [tuple(self._best(block, self.limit)) for block in blocks]
+                smaller = (size, tops[size])
+            self._tops[kind] = tops
+        self._entries = None
+        return self
+
+    # [lo, hi) 를 정렬된 블록(큰 것부터)과 낱개로 나눠 후보를 모은다
+    def _collect(self, kind, lo, hi, candidates):
+        items, tops = self._items[kind], self._tops[kind]
+        while lo < hi:
+            for size in reversed(BLOCK_SIZES):
+                if size in tops and lo % size == 0 and lo + size <= hi:
+                    candidates.extend(tops[size][lo // size])
+                    lo += size
+                    break
+            else:
+                end = min(hi, lo - lo % BLOCK_SIZES[0] + BLOCK_SIZES[0])
+                candidates.extend(items[lo:end])
+                lo = end
+
+    def search(self, query, limit):
+        query = normalize(query)
+        if not query:
+            return []
+        limit = min(limit, self.limit)
+        candidates = []
+        for kind, start, end in query_ranges(query):
+            keys = self._keys[kind]
+            self._collect(kind, bisect.bisect_left(keys, start), bisect.bisect_left(keys, end), candidates)
+            recent = self._recent[kind]
+            candidates.extend(
+                item for _, item in recent[bisect.bisect_left(recent, (start,)):bisect.bisect_left(recent, (end,))]
+            )
+        return [self.suggestions[item] for item in self._best(candidates, limit)]
+
+
+def build_index(limit):
+    index = PrefixIndex(limit)
+    categories = Category.objects.annotate(restaurant_count=Count("restaurant")).values_list(
+        "pk", "name", "restaurant_count",
+    )
+    for pk, name, restaurant_count in categories:
+        index.add(("category", pk, name, ""), restaurant_count, [name])
+    for pk, name, address, review_count in Restaurant.objects.order_by("pk").values_list(
+        "pk", "name", "address", "review_count",
+    ).iterator(chunk_size=5000):
+        index.add_restaurant(pk, name, address, review_count)
+    return index.finish()
+
+
+# 프로세스에 하나 — 첫 검색 때 만들고, 오래되면 백그라운드 스레드에서 새로 만들어 바꿔 낀다
+class AutocompleteIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._built_at = None
+        self._rebuilding = False
+        self._added = []  # 새로 만드는 동안 추가된 음식점 (새 인덱스에 다시 넣는다)
+
+    @property
+    def limit(self):
+        return getattr(settings, "AUTOCOMPLETE_MAX_RESULTS", 10)
+
+    def _due(self):
+        interval = getattr(settings, "AUTOCOMPLETE_REBUILD_INTERVAL", 60 * 10)
+        return (
+            self._index.recent_count >= getattr(settings, "AUTOCOMPLETE_MAX_RECENT", 1000)
+            or time.monotonic() - self._built_at >= interval
+        )
+
+    def _get(self):
+        with self._lock:
+            if self._index is not None:
+                if not self._rebuilding and self._due():
+                    self._rebuilding = True
+                    self._added = []
+                    threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+                return self._index
+        index = build_index(self.limit)
+        with self._lock:
+            if self._index is None:
+                self._index, self._built_at = index, time.monotonic()
+            return self._index
+
+    def _rebuild_in_background(self):
+        try:
+            index = build_index(self.limit)
+        except Exception:
+            with self._lock:
+                self._rebuilding = False
+            raise
+        finally:
+            connection.close()
+        with self._lock:
+            for restaurant in self._added:
+                if restaurant[0] not in index.restaurant_ids:
+                    index.add_recent_restaurant(*restaurant)
+            self._index, self._built_at = index, time.monotonic()
+            self._rebuilding, self._added = False, []
+
+    def search(self, query, limit=None):
+        return self._get().search(query, limit or self.limit)
+
+    # 음식점 등록 시 (아직 인덱스를 만들지 않았으면 첫 검색 때 DB 에서 같이 읽힌다)
+    def add_restaurant(self, restaurant):
+        entry = (restaurant.pk, restaurant.name, restaurant.address, restaurant.review_count)
+        with self._lock:
+            if self._index is None:
+                return
+            if self._rebuilding:
+                self._added.append(entry)
+            if restaurant.pk not in self._index.restaurant_ids:
+                self._index.add_recent_restaurant(*entry)
+
+    def clear(self):
+        with self._lock:
+            self._index = self._built_at = None
+            self._rebuilding, self._added = False, []
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,98 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Value, When
+
+from .geo import within_radius
+from .search import search_queryset
+
+# 목록 필터 옆 개수 (카테고리별, 별점 구간별)
+# - 검색어로만 거른 집합을 (카테고리, 별점 구간) 으로 한 번 GROUP BY 하고 검색어별로 캐시한다
+#   (목록과 같은 search_queryset 에 같은 검색어를 넣는다. 내 주변 검색이면 목록과 같은 반경 안의 음식점만 — 캐시하지 않음)
+# - 카테고리/별점 필터는 그 결과에서 더해서 계산 → 카테고리 개수는 선택한 별점 조건을, 별점 개수는 선택한 카테고리를 반영
+#   (자기 자신의 필터는 빼고 센다 — 다른 카테고리를 눌렀을 때 몇 개가 나올지 보여 주기 위해)
+RATING_BUCKETS = [4, 3, 2]  # "N점 이상"
+CATEGORY_ICONS = {
+    "한식": "🍚", "일식": "🍣", "양식": "🍝", "중식": "🥟", "카페": "☕", "분식": "🥚", "디저트": "🍰",
+}
+
+
+def _bucket_for(avg_rating):
+    return next((value for value in RATING_BUCKETS if avg_rating >= value), 0)
+
+
+def _rating_bucket():
+    return Case(
+        *[When(avg_rating__gte=value, then=Value(value)) for value in RATING_BUCKETS],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+# (카테고리 id, 카테고리 이름, 별점 구간, 개수) 목록 — 쿼리 1번
+def facet_rows(queryset):
+    rows = (
+        queryset.order_by()
+        .annotate(rating_bucket=_rating_bucket())
+        .values_list("category_id", "category__name", "rating_bucket")
+        .annotate(count=Count("pk"))
+    )
+    return list(rows)
+
+
+# 반경 안 음식점(거리 계산은 파이썬)으로 같은 모양의 목록을 만든다
+def near_facet_rows(queryset, near):
+    lat, lng, radius, _ = near
+    counts = {}
+    for restaurant in within_radius(queryset, lat, lng, radius):
+        category = restaurant.category
+        key = (restaurant.category_id, category.name if category else None, _bucket_for(restaurant.avg_rating))
+        counts[key] = counts.get(key, 0) + 1
+    return [(*key, count) for key, count in counts.items()]
+
+
+# q 는 목록이 검색하는 값 그대로 — 캐시 키도 그 값으로 (공백/대소문자를 합치면 검색 결과가 다른 검색어가 키를 같이 쓴다)
+def get_facet_rows(q, near=None):
+    q = q.strip()
+    queryset, _ = search_queryset(q)
+    if near:
+        return near_facet_rows(queryset, near)
+    key = f"restaurants:facets:{hashlib.md5(q.encode()).hexdigest()}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = facet_rows(queryset)
+        cache.set(key, rows, getattr(settings, "RESTAURANT_FACET_CACHE_TIMEOUT", 60 * 5))
+    return rows
+
+
+def _matches_category(category_id, name, selected):
+    return not selected or str(category_id) == selected or name == selected
+
+
+# 템플릿용 요약 — category 는 id 또는 이름 (목록 필터와 같은 규칙), min_rating 은 None 또는 정수
+def summarize_facets(rows, category="", min_rating=None):
+    categories = {}
+    ratings = dict.fromkeys(RATING_BUCKETS, 0)
+    for category_id, name, bucket, count in rows:
+        if category_id is not None:
+            entry = categories.setdefault(category_id, {"id": category_id, "name": name, "count": 0})
+            if min_rating is None or bucket >= min_rating:
+                entry["count"] += count
+        if _matches_category(category_id, name, category):
+            for value in RATING_BUCKETS:
+                if bucket >= value:
+                    ratings[value] += count
+
+    # 검색 결과에 있는 카테고리는 별점 조건으로 0개가 돼도 보여 준다 (템플릿에서 누를 수 없게 표시)
+    category_facets = sorted(categories.values(), key=lambda entry: (-entry["count"], entry["name"]))
+    for entry in category_facets:
+        entry["icon"] = CATEGORY_ICONS.get(entry["name"], "🍽️")
+        entry["active"] = bool(category) and _matches_category(entry["id"], entry["name"], category)
+    return {
+        "categories": category_facets,
+        "ratings": [
+            {"value": value, "count": count, "active": value == min_rating}
+            for value, count in ratings.items()
+        ],
+    }
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from core.images import prefetch_variants
+
+
+# 상세 페이지 리뷰 섹션 캐시
+# 키에 restaurant.review_version 이 들어가므로 리뷰가 바뀌면 자동으로 새 키를 쓰고,
+# 이전 버전은 만료 시간이 지나면 사라진다.
+def _cache_key(restaurant):
+    return f"restaurants:detail:reviews:{restaurant.pk}:v{restaurant.review_version}"
+
+
+def _actions_marker(review_pk):
+    return f"<!--review-actions:{review_pk}-->"
+
+
+def get_review_section(restaurant):
+    key = _cache_key(restaurant)
+    section = cache.get(key)
+    if section is None:
+        reviews = list(restaurant.reviews.select_related("author").order_by("-created_at"))
+        prefetch_variants(review.photo for review in reviews)
+        authors = {}
+        for review in reviews:
+            authors.setdefault(review.author_id, []).append(review.pk)
+        section = {
+            "html": render_to_string("restaurants/_reviews.html", {"reviews": reviews}),
+            "authors": authors,  # 작성자 id → 리뷰 id 목록 (수정/삭제 버튼용)
+        }
+        cache.set(key, section, getattr(settings, "REVIEW_FRAGMENT_CACHE_TIMEOUT", 60 * 60 * 24))
+    return section
+
+
+# 캐시된 섹션에 현재 사용자 본인 리뷰의 수정/삭제 버튼만 채워 넣는다
+def render_review_section(restaurant, user):
+    section = get_review_section(restaurant)
+    html = section["html"]
+    if user.is_authenticated:
+        for review_pk in section["authors"].get(user.pk, []):
+            actions = render_to_string("restaurants/_review_actions.html", {"review_pk": review_pk})
+            html = html.replace(_actions_marker(review_pk), actions)
+    return mark_safe(html)
@@ -0,0 +1,80 @@
+import math
+
+from django.db.models import Q
+
+# 좌표 기반 "내 주변" 검색
+# 위도/경도를 CELL_SIZE 도 단위 격자로 나눈 번호(geo_cell)를 인덱스 컬럼으로 저장해 두고,
+# 검색 반경을 덮는 격자 범위만 인덱스로 읽은 뒤(바운딩 박스 프리필터) 그 후보에 대해서만 거리를 계산한다.
+CELL_SIZE = 0.01                    # 약 1.1km (위도 기준)
+CELLS_PER_ROW = int(360 / CELL_SIZE)
+EARTH_RADIUS_KM = 6371.0
+
+
+def _row(lat):
+    return int(math.floor((lat + 90) / CELL_SIZE))
+
+
+def _col(lng):
+    return int(math.floor((lng + 180) / CELL_SIZE)) % CELLS_PER_ROW
+
+
+def cell_for(lat, lng):
+    if lat is None or lng is None:
+        return None
+    return _row(float(lat)) * CELLS_PER_ROW + _col(float(lng))
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (float(lat1), float(lng1), float(lat2), float(lng2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+# (lat, lng) 중심 radius_km 반경을 덮는 바운딩 박스 → (min_lat, max_lat, min_lng, max_lng)
+def bounding_box(lat, lng, radius_km):
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(lat))
+    d_lng = 180.0 if cos_lat < 1e-6 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return max(-90.0, lat - d_lat), min(90.0, lat + d_lat), lng - d_lng, lng + d_lng
+
+
+# 바운딩 박스를 덮는 격자 행마다 geo_cell 범위 조건 하나씩 (각각 인덱스 범위 스캔)
+def cell_filter(lat, lng, radius_km):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    if max_lng - min_lng >= 360:
+        col_ranges = [(0, CELLS_PER_ROW - 1)]
+    else:
+        first, last = _col(min_lng), _col(max_lng)
+        # 날짜변경선(±180°)을 넘으면 두 구간으로 나뉜다
+        col_ranges = [(first, last)] if first <= last else [(first, CELLS_PER_ROW - 1), (0, last)]
+
+    condition = Q()
+    for row in range(_row(min_lat), _row(max_lat) + 1):
+        base = row * CELLS_PER_ROW
+        for start, end in col_ranges:
+            condition |= Q(geo_cell__range=(base + start, base + end))
+    return condition
+
+
+def within_radius(queryset, lat, lng, radius_km):
+    results = []
+    for restaurant in queryset.filter(cell_filter(lat, lng, radius_km)):
+        distance = haversine_km(lat, lng, restaurant.lat, restaurant.lng)
+        if distance <= radius_km:
+            restaurant.distance_km = distance
+            results.append(restaurant)
+    results.sort(key=lambda r: (r.distance_km, r.pk))
+    return results
+
+
+# 가까운 순 k개 — 작은 반경부터 두 배씩 넓혀 가며 k개가 찰 때까지 찾는다
+def nearest(queryset, lat, lng, k, max_radius_km, start_radius_km=0.5):
+    radius = min(start_radius_km, max_radius_km)
+    while True:
+        results = within_radius(queryset, lat, lng, radius)
+        if len(results) >= k or radius >= max_radius_km:
+            return results[:k]
+        radius = min(radius * 2, max_radius_km)
@@ -0,0 +1,86 @@
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.pagecache import invalidate_tags
+from restaurants.geo import cell_for
+from restaurants.models import Restaurant
+
+
+def normalize_address(address):
+    return " ".join(address.split())
+
+
+class Command(BaseCommand):
+    help = "주소→좌표 CSV 파일(address,lat,lng 헤더)로 좌표가 없는 음식점의 lat/lng 를 채웁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="주소→좌표 CSV 파일 경로")
+        parser.add_argument("--overwrite", action="store_true", help="이미 좌표가 있는 음식점도 다시 채웁니다.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 매칭 결과만 보고합니다.")
+
+    def load_lookup(self, path):
+        lookup = {}
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or not {"address", "lat", "lng"} <= set(reader.fieldnames):
+                    raise CommandError("CSV 헤더에 address, lat, lng 가 필요해요.")
+                for line, row in enumerate(reader, start=2):
+                    try:
+                        lat, lng = Decimal(row["lat"]), Decimal(row["lng"])
+                    except (InvalidOperation, TypeError):
+                        self.stderr.write(f"{line}행: 좌표를 읽을 수 없어 건너뛰어요.")
+                        continue
+                    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                        self.stderr.write(f"{line}행: 좌표 범위를 벗어나 건너뛰어요.")
+                        continue
+                    lookup[normalize_address(row["address"])] = (
+                        lat.quantize(Decimal("0.000001")),
+                        lng.quantize(Decimal("0.000001")),
+                    )
+        except OSError as e:
+            raise CommandError(f"파일을 열 수 없어요: {e}")
+        return lookup
+
+    def handle(self, *args, **options):
+        lookup = self.load_lookup(options["path"])
+        batch_size = options["batch_size"]
+
+        qs = Restaurant.objects.all()
+        if not options["overwrite"]:
+            qs = qs.filter(lat__isnull=True)
+
+        matched = missing = 0
+        last_id = 0
+        now = timezone.now()
+        while True:
+            batch = list(
+                qs.filter(pk__gt=last_id).order_by("pk").only("pk", "address", "lat", "lng")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].pk
+
+            changed = []
+            for restaurant in batch:
+                coords = lookup.get(normalize_address(restaurant.address))
+                if coords is None:
+                    missing += 1
+                    continue
+                restaurant.lat, restaurant.lng = coords
+                restaurant.geo_cell = cell_for(*coords)
+                restaurant.updated_at = now
+                changed.append(restaurant)
+            matched += len(changed)
+            if changed and not options["dry_run"]:
+                Restaurant.objects.bulk_update(changed, ["lat", "lng", "geo_cell", "updated_at"])
+                invalidate_tags("restaurants")  # bulk_update 는 post_save 를 보내지 않는다
+
+        prefix = "[dry-run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}좌표 채움 {matched}개, 주소를 찾지 못함 {missing}개"
+        ))
@@ -0,0 +1,186 @@
+import csv
+import json
+import os
+import time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.db import atomic_with_retry
+from core.pagecache import invalidate_tags
+from restaurants.geo import cell_for
+from restaurants.models import Category, Restaurant
+
+# 모델 필드 길이 (넘으면 잘못된 행으로 건너뜀)
+MAX_LENGTHS = {"name": 100, "address": 255, "phone": 30, "category": 50}
+
+
+def normalize(value):
+    return " ".join(str(value or "").split())
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV(헤더 name,address,category,phone,description,lat,lng) 또는 JSONL 파일의 음식점을 "
+        "배치 단위 bulk_create 로 가져옵니다. 파일을 한 줄씩 읽으므로 파일 크기와 상관없이 메모리 사용량이 일정하고, "
+        "이름+주소가 같은 음식점은 건너뛰며 카테고리는 이름으로 찾거나 새로 만듭니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="가져올 파일 (.csv / .jsonl)")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="파일 형식 (생략 시 확장자로 판단)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="저장하지 않고 결과만 보고합니다. (저장하지 않으므로 서로 다른 배치에 있는 파일 안 중복은 세지 못해요)",
+        )
+        parser.add_argument("--progress-every", type=int, default=10_000, help="이 행 수마다 진행 상황 출력")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 해요.")
+        self.dry_run = options["dry_run"]
+        self.categories = {}  # 이름 → id (카테고리는 수가 적으므로 전부 기억)
+        self.stats = {"rows": 0, "created": 0, "duplicates": 0, "invalid": 0, "categories": 0}
+        self.started = time.perf_counter()
+        next_report = options["progress_every"]
+
+        for path in options["paths"]:
+            rows = self.read(path, options["format"] or self.guess_format(path))
+            while batch := list(islice(rows, options["batch_size"])):
+                self.import_batch(batch)
+                if options["progress_every"] and self.stats["rows"] >= next_report:
+                    self.report("진행")
+                    next_report += options["progress_every"]
+
+        prefix = "[dry-run] " if self.dry_run else ""
+        self.report(f"{prefix}완료", style=self.style.SUCCESS)
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise CommandError(f"{path}: 파일 형식을 알 수 없어요. --format 으로 지정해 주세요.")
+
+    # 파일을 한 줄씩 읽어 (행 번호, 정리된 값) 을 내보낸다 — 잘못된 행은 여기서 걸러진다
+    def read(self, path, file_format):
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                if file_format == "csv":
+                    reader = csv.DictReader(f)
+                    if not reader.fieldnames or not {"name", "address"} <= set(reader.fieldnames):
+                        raise CommandError(f"{path}: CSV 헤더에 name, address 가 필요해요.")
+                    records = enumerate(reader, start=2)
+                else:
+                    records = self.jsonl_records(path, f)
+                for line, record in records:
+                    self.stats["rows"] += 1
+                    row = self.clean(record)
+                    if isinstance(row, str):
+                        self.stats["invalid"] += 1
+                        self.stderr.write(f"{path}:{line}: {row} — 건너뛰어요.")
+                        continue
+                    yield row
+        except OSError as e:
+            raise CommandError(f"파일을 열 수 없어요: {e}")
+
+    def jsonl_records(self, path, f):
+        for line, text in enumerate(f, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError:
+                record = None
+            yield line, record if isinstance(record, dict) else "JSON 객체가 아니에요"
+
+    # 행 하나를 모델 값으로 정리 → dict, 잘못된 행이면 이유 문자열
+    def clean(self, record):
+        if isinstance(record, str):
+            return record
+        row = {field: normalize(record.get(field)) for field in ["name", "address", "category", "phone"]}
+        row["description"] = str(record.get("description") or "").strip()
+        if not row["name"] or not row["address"]:
+            return "name, address 는 필수예요"
+        for field, max_length in MAX_LENGTHS.items():
+            if len(row[field]) > max_length:
+                return f"{field} 가 {max_length}자를 넘어요"
+
+        lat, lng = record.get("lat"), record.get("lng")
+        if lat in (None, "") and lng in (None, ""):
+            row["lat"] = row["lng"] = None
+        else:
+            try:
+                lat, lng = Decimal(str(lat)), Decimal(str(lng))
+            except InvalidOperation:
+                return "좌표를 읽을 수 없어요"
+            if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                return "좌표 범위를 벗어났어요"
+            row["lat"], row["lng"] = lat.quantize(Decimal("0.000001")), lng.quantize(Decimal("0.000001"))
+        return row
+
+    def import_batch(self, batch):
+        # 배치 안 중복 → 이미 저장된 음식점과 중복 (이름+주소 인덱스로 배치당 쿼리 1번)
+        unique = {}
+        for row in batch:
+            unique.setdefault((row["name"], row["address"]), row)
+        existing = set(
+            Restaurant.objects.filter(name__in={name for name, _ in unique})
+            .filter(address__in={address for _, address in unique})
+            .values_list("name", "address")
+        )
+        rows = [row for key, row in unique.items() if key not in existing]
+        self.stats["duplicates"] += len(batch) - len(rows)
+
+        if self.dry_run:
+            new_categories = {row["category"] for row in rows if row["category"]} - set(self.categories)
+            new_categories -= set(Category.objects.filter(name__in=new_categories).values_list("name", flat=True))
+            self.categories.update(dict.fromkeys(new_categories))
+            self.stats["categories"] += len(new_categories)
+            self.stats["created"] += len(rows)
+            return
+        self.stats["created"] += self.save_batch(rows)
+        invalidate_tags("restaurants")  # bulk_create 는 post_save 를 보내지 않는다
+
+    @atomic_with_retry
+    def save_batch(self, rows):
+        self.resolve_categories({row["category"] for row in rows if row["category"]})
+        Restaurant.objects.bulk_create([
+            Restaurant(
+                name=row["name"],
+                address=row["address"],
+                category_id=self.categories.get(row["category"]),
+                phone=row["phone"],
+                description=row["description"],
+                lat=row["lat"],
+                lng=row["lng"],
+                geo_cell=cell_for(row["lat"], row["lng"]),  # bulk_create 는 save() 를 거치지 않으므로 직접 계산
+            )
+            for row in rows
+        ])
+        return len(rows)
+
+    # 처음 보는 카테고리 이름만 조회/생성해서 이름 → id 에 추가
+    def resolve_categories(self, names):
+        names -= set(self.categories)
+        if not names:
+            return
+        found = dict(Category.objects.filter(name__in=names).values_list("name", "pk"))
+        missing = names - set(found)
+        if missing:
+            Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+            found.update(Category.objects.filter(name__in=missing).values_list("name", "pk"))
+            self.stats["categories"] += len(missing)
+        self.categories.update(found)
+
+    def report(self, label, style=None):
+        elapsed = time.perf_counter() - self.started
+        rate = self.stats["rows"] / elapsed if elapsed else 0
+        message = (
+            f"{label}: {self.stats['rows']:,}행 ({rate:,.0f}행/초) — 추가 {self.stats['created']:,}, "
+            f"중복 {self.stats['duplicates']:,}, 오류 {self.stats['invalid']:,}, 새 카테고리 {self.stats['categories']}"
+        )
+        self.stdout.write(style(message) if style else message)
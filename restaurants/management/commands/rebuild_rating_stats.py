@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.pagecache import invalidate_tags
+from restaurants.ratings import find_rating_mismatches, rebuild_rating_stats
+
+
+class Command(BaseCommand):
+    help = "음식점 리뷰 집계(리뷰 수/별점 합계/평균/별점 분포)를 리뷰 테이블 기준으로 재생성하거나 검증합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true", help="갱신하지 않고 불일치만 보고합니다.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("ids", nargs="*", type=int, help="대상 음식점 ID (생략 시 전체)")
+
+    def handle(self, *args, **options):
+        restaurant_ids = options["ids"] or None
+        batch_size = options["batch_size"]
+
+        if options["verify"]:
+            mismatches = find_rating_mismatches(restaurant_ids, batch_size=batch_size)
+            for pk, diff in mismatches:
+                details = ", ".join(
+                    f"{field}: {stored} != {actual}" for field, (stored, actual) in diff.items()
+                )
+                self.stdout.write(f"restaurant {pk}: {details}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)}개 음식점의 리뷰 집계가 맞지 않아요.")
+            self.stdout.write(self.style.SUCCESS("리뷰 집계가 모두 일치해요."))
+            return
+
+        updated = rebuild_rating_stats(restaurant_ids, batch_size=batch_size)
+        invalidate_tags("restaurants", *[f"restaurant:{pk}" for pk in restaurant_ids or ()])
+        self.stdout.write(self.style.SUCCESS(f"{updated}개 음식점의 리뷰 집계를 재생성했어요."))
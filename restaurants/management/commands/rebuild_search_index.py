@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurants.search import rebuild_search_index, search_index_available
+
+
+class Command(BaseCommand):
+    help = "음식점 이름/주소 전문 검색 인덱스(FTS5)를 음식점 테이블 기준으로 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        if not search_index_available():
+            raise CommandError("검색 인덱스가 없어요. (SQLite FTS5 trigram 지원 여부와 migrate 상태를 확인하세요)")
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS("검색 인덱스를 다시 만들었어요."))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurants.recommendations import process_queue, rebuild_all
+
+
+class Command(BaseCommand):
+    help = (
+        "즐겨찾기/높은 별점 리뷰를 함께 남긴 사용자 수로 음식점 사이 코사인 유사도를 계산해 "
+        "음식점별 비슷한 음식점 상위 몇 개를 저장합니다. 기본은 즐겨찾기/리뷰가 바뀐 음식점만 다시 계산하고, "
+        "--full 은 전체를 다시 계산합니다 (하루 한 번 정도 권장)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="처음 한 번은 전체를 다시 계산합니다.")
+        parser.add_argument("--once", action="store_true", help="한 번만 처리하고 종료합니다.")
+        parser.add_argument("--neighbors", type=int, help="음식점마다 저장할 이웃 수 (기본 settings.RECOMMENDATION_NEIGHBORS)")
+        parser.add_argument("--interval", type=float, default=60.0, help="쌓인 변경을 다시 확인하기까지 쉬는 시간(초)")
+
+    def handle(self, *args, **options):
+        if options["neighbors"] is not None and options["neighbors"] < 1:
+            raise CommandError("--neighbors 는 1 이상이어야 해요.")
+        full = options["full"]
+        while True:
+            started = time.perf_counter()
+            if full:
+                restaurants, saved = rebuild_all(k=options["neighbors"])
+                label, full = "전체", False
+            else:
+                restaurants, saved = process_queue(k=options["neighbors"])
+                label = "변경"
+            if restaurants or options["once"]:
+                self.stdout.write(
+                    f"{label} 음식점 {restaurants}개의 비슷한 음식점 {saved}개 저장 ({time.perf_counter() - started:.2f}초)"
+                )
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
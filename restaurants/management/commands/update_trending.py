@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurants.trending import compute_trending
+
+
+class Command(BaseCommand):
+    help = (
+        "최근 리뷰/즐겨찾기(시간 감쇠), 별점, 조회수로 인기 점수를 계산해 인기 맛집 순위 테이블을 갱신합니다. "
+        "cron 으로 --once 를 돌리거나 --interval 로 계속 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="한 번만 계산하고 종료합니다.")
+        parser.add_argument("--size", type=int, help="저장할 순위 개수 (기본 settings.TRENDING_SIZE)")
+        parser.add_argument("--interval", type=float, default=600.0, help="다시 계산하기까지 쉬는 시간(초)")
+
+    def handle(self, *args, **options):
+        if options["size"] is not None and options["size"] < 1:
+            raise CommandError("--size 는 1 이상이어야 해요.")
+        while True:
+            started = time.perf_counter()
+            saved = compute_trending(size=options["size"])
+            self.stdout.write(f"인기 맛집 {saved}개 갱신 ({time.perf_counter() - started:.2f}초)")
+            if options["once"]:
+                return
+            time.sleep(options["interval"])
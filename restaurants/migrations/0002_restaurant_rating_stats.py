@@ -0,0 +1,81 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:47
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_stats(apps, schema_editor):
+    Restaurant = apps.get_model('restaurants', 'Restaurant')
+    Review = apps.get_model('reviews', 'Review')
+
+    stats = {}
+    rows = Review.objects.order_by().values('restaurant_id', 'rating').annotate(n=Count('id'))
+    for row in rows:
+        entry = stats.setdefault(row['restaurant_id'], {'review_count': 0, 'rating_sum': 0})
+        entry[f"rating_{row['rating']}_count"] = row['n']
+        entry['review_count'] += row['n']
+        entry['rating_sum'] += row['rating'] * row['n']
+
+    for restaurant_id, entry in stats.items():
+        entry['avg_rating'] = entry['rating_sum'] / entry['review_count']
+        Restaurant.objects.filter(pk=restaurant_id).update(**entry)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0001_initial'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='avg_rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['-avg_rating', '-review_count', '-id'], name='restaurant_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['-review_count', '-id'], name='restaurant_review_count_idx'),
+        ),
+        migrations.RunPython(backfill_rating_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:20
+
+from django.db import migrations, transaction
+from django.db.utils import OperationalError
+
+from restaurants.search import TRIGGER_SQL
+
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE restaurants_restaurant_search USING fts5(
+        name, address,
+        content='restaurants_restaurant', content_rowid='id',
+        tokenize='trigram'
+    )
+    """,
+    *TRIGGER_SQL.values(),
+    "INSERT INTO restaurants_restaurant_search(restaurants_restaurant_search) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS restaurants_restaurant_search_ai",
+    "DROP TRIGGER IF EXISTS restaurants_restaurant_search_ad",
+    "DROP TRIGGER IF EXISTS restaurants_restaurant_search_au",
+    "DROP TABLE IF EXISTS restaurants_restaurant_search",
+]
+
+
+# SQLite 이고 FTS5 trigram 을 지원할 때만 생성 (없으면 restaurants.search 가 LIKE 검색으로 동작)
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for sql in CREATE_SQL:
+                schema_editor.execute(sql)
+    except OperationalError:
+        pass
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0002_restaurant_rating_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0003_restaurant_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='review_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0004_restaurant_review_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='geo_cell',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='lat',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='lng',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0005_restaurant_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['-view_count', '-id'], name='restaurant_view_count_idx'),
+        ),
+    ]
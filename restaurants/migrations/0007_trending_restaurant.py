@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0006_restaurant_view_count_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingRestaurant',
+            fields=[
+                ('restaurant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='restaurants.restaurant')),
+                ('rank', models.PositiveIntegerField(unique=True)),
+                ('score', models.FloatField()),
+                ('recent_reviews', models.FloatField(default=0)),
+                ('recent_favorites', models.FloatField(default=0)),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
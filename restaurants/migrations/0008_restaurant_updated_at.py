@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0007_trending_restaurant'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['updated_at'], name='restaurant_updated_idx'),
+        ),
+    ]
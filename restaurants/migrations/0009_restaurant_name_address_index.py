@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0008_restaurant_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['name', 'address'], name='restaurant_name_address_idx'),
+        ),
+    ]
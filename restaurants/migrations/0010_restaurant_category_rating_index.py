@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0009_restaurant_name_address_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['category', 'avg_rating'], name='restaurant_category_rating_idx'),
+        ),
+    ]
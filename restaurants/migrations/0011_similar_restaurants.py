@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0010_restaurant_category_rating_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationUpdate',
+            fields=[
+                ('restaurant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='restaurants.restaurant')),
+                ('queued_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SimilarRestaurant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('common_users', models.PositiveIntegerField()),
+                ('neighbor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='restaurants.restaurant')),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar', to='restaurants.restaurant')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('restaurant', 'rank'), name='similar_restaurant_rank')],
+            },
+        ),
+    ]
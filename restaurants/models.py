@@ -13,14 +13,100 @@ class Restaurant(models.Model):
     phone = models.CharField(max_length=30, blank=True)
     description = models.TextField(blank=True)
 
-    # 지도/좌표는 나중에
-    # lat = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
-    # lng = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    # 좌표 (geo_cell 은 저장 시 자동 계산되는 격자 번호 — restaurants.geo 참고)
+    lat = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    lng = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True)
+    geo_cell = models.BigIntegerField(null=True, blank=True, editable=False, db_index=True)
 
     thumbnail = models.ImageField(upload_to="restaurants/thumbs/", blank=True, null=True)
 
     view_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    # API ETag/Last-Modified 기준 — save() 외의 update() 로 바꿀 때도 같이 갱신할 것 (조회수는 제외)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # 리뷰 집계 (restaurants.ratings 에서 리뷰 작성/수정/삭제 시 함께 갱신)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    avg_rating = models.FloatField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    # 리뷰가 작성/수정/삭제될 때마다 증가 — 상세 페이지 리뷰 섹션 캐시 키 (restaurants.fragments)
+    review_version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-avg_rating", "-review_count", "-id"], name="restaurant_rating_idx"),
+            models.Index(fields=["-review_count", "-id"], name="restaurant_review_count_idx"),
+            models.Index(fields=["-view_count", "-id"], name="restaurant_view_count_idx"),
+            models.Index(fields=["updated_at"], name="restaurant_updated_idx"),
+            # 가져오기 중복 검사 (manage.py import_restaurants)
+            models.Index(fields=["name", "address"], name="restaurant_name_address_idx"),
+            # 목록 필터 개수 GROUP BY 카테고리, 별점 구간 (restaurants.facets) — 커버링 인덱스
+            models.Index(fields=["category", "avg_rating"], name="restaurant_category_rating_idx"),
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        from .geo import cell_for
+
+        self.geo_cell = cell_for(self.lat, self.lng)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"lat", "lng"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geo_cell"}
+        super().save(*args, **kwargs)
+
+    @property
+    def rating_distribution(self):
+        # (별점, 개수, 비율%) 목록 — 5점 → 1점 순서
+        total = self.review_count
+        distribution = []
+        for star in range(5, 0, -1):
+            count = getattr(self, f"rating_{star}_count")
+            pct = (count / total * 100) if total > 0 else 0
+            distribution.append((star, count, round(pct)))
+        return distribution
+
+
+# 인기 맛집 순위 (restaurants.trending, manage.py update_trending 이 주기적으로 통째로 다시 채운다)
+# 홈 화면에서 리뷰/즐겨찾기를 매번 집계하지 않도록 상위 몇십 개만 저장
+class TrendingRestaurant(models.Model):
+    restaurant = models.OneToOneField(Restaurant, on_delete=models.CASCADE, primary_key=True, related_name="trending")
+    rank = models.PositiveIntegerField(unique=True)
+    score = models.FloatField()
+    recent_reviews = models.FloatField(default=0)    # 시간 감쇠를 적용한 최근 리뷰 수
+    recent_favorites = models.FloatField(default=0)  # 시간 감쇠를 적용한 최근 즐겨찾기 수
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.rank}. {self.restaurant_id} ({self.score:.2f})"
+
+
+# 비슷한 음식점 (restaurants.recommendations, manage.py update_recommendations 가 채운다)
+# 즐겨찾기/높은 별점 리뷰를 같이 남긴 사용자 수로 계산한 코사인 유사도 상위 몇 개 — 상세 페이지는 읽기만 한다
+class SimilarRestaurant(models.Model):
+    restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name="similar")
+    neighbor = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    common_users = models.PositiveIntegerField()  # 둘 다 좋아한 사용자 수
+
+    class Meta:
+        constraints = [
+            # 상세 페이지 조회 WHERE restaurant_id = ? ORDER BY rank
+            models.UniqueConstraint(fields=["restaurant", "rank"], name="similar_restaurant_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.restaurant_id} → {self.rank}. {self.neighbor_id} ({self.score:.3f})"
+
+
+# 비슷한 음식점을 다시 계산할 음식점 (즐겨찾기/리뷰가 바뀔 때 쌓이고 update_recommendations 가 비운다)
+class RecommendationUpdate(models.Model):
+    restaurant = models.OneToOneField(Restaurant, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    queued_at = models.DateTimeField()
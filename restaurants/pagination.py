@@ -0,0 +1,148 @@
+import base64
+import json
+
+from django.core.cache import cache
+from django.db.models import Q
+
+
+# 키셋(커서) 페이지네이션
+# OFFSET 없이 "마지막으로 본 행의 정렬 키" 다음부터 읽기 때문에 깊은 페이지도 첫 페이지와 비용이 같다.
+# ordering 은 숫자 컬럼 + 마지막에 고유한 "-id" 타이브레이커로 구성해야 한다. 예) ["-view_count", "-id"]
+
+
+def encode_cursor(values, direction, number):
+    payload = json.dumps({"k": values, "d": direction, "p": number}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, ordering):
+    # 잘못된 커서는 None → 첫 페이지
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction, number = data["k"], data["d"], int(data["p"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    if direction not in ("n", "p") or not isinstance(values, list) or len(values) != len(ordering):
+        return None
+    if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return None
+    return values, direction, max(number, 1)
+
+
+def _split(ordering):
+    return [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+
+# (a, b, id) 보다 "뒤"에 오는 행: a < va OR (a = va AND b < vb) OR (a = va AND b = vb AND id < vid)
+def _after(ordering, values, forward=True):
+    condition = Q()
+    equal = {}
+    for (field, desc), value in zip(_split(ordering), values):
+        lookup = "lt" if desc == forward else "gt"
+        condition |= Q(**equal, **{f"{field}__{lookup}": value})
+        equal[field] = value
+    return condition
+
+
+def _reverse(ordering):
+    return [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+
+
+class KeysetPage:
+    def __init__(self, object_list, ordering, number, has_next, has_previous, per_page, total_count=None):
+        self.object_list = object_list
+        self.ordering = ordering
+        self.number = number
+        self.per_page = per_page
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.total_count = total_count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def _key(self, obj):
+        return [getattr(obj, field) for field, _ in _split(self.ordering)]
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return ""
+        return encode_cursor(self._key(self.object_list[-1]), "n", self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or self.number <= 2:
+            return ""  # 빈 커서 = 첫 페이지
+        return encode_cursor(self._key(self.object_list[0]), "p", self.number - 1)
+
+    @property
+    def num_pages(self):
+        # total_count 가 있을 때만 (근사치)
+        if self.total_count is None:
+            return None
+        return max(1, -(-self.total_count // self.per_page))
+
+
+# 커서를 풀어서 이번 페이지를 읽을 queryset (per_page + 1 개) → (queryset, 방향, 페이지 번호)
+def _page_query(queryset, ordering, cursor, per_page):
+    decoded = decode_cursor(cursor, ordering)
+    if decoded is None:
+        return queryset.order_by(*ordering)[:per_page + 1], None, 1
+
+    values, direction, number = decoded
+    if direction == "n":
+        return queryset.filter(_after(ordering, values)).order_by(*ordering)[:per_page + 1], direction, number
+    # 이전 페이지: 역순으로 읽고 다시 뒤집는다
+    return (
+        queryset.filter(_after(ordering, values, forward=False)).order_by(*_reverse(ordering))[:per_page + 1],
+        direction, number,
+    )
+
+
+def _make_page(rows, ordering, direction, number, per_page, total_count):
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction is None:
+        return KeysetPage(rows, ordering, 1, has_more, False, per_page, total_count)
+    if direction == "n":
+        return KeysetPage(rows, ordering, number, has_more, True, per_page, total_count)
+    return KeysetPage(rows[::-1], ordering, number, True, has_more, per_page, total_count)
+
+
+def paginate_keyset(queryset, ordering, cursor=None, per_page=12, total_count=None):
+    query, direction, number = _page_query(queryset, ordering, cursor, per_page)
+    return _make_page(list(query), ordering, direction, number, per_page, total_count)
+
+
+async def apaginate_keyset(queryset, ordering, cursor=None, per_page=12, total_count=None):
+    query, direction, number = _page_query(queryset, ordering, cursor, per_page)
+    rows = [row async for row in query]
+    return _make_page(rows, ordering, direction, number, per_page, total_count)
+
+
+# 페이지 바 표시용 근사 개수 — 필터 조합별 COUNT(*) 결과를 잠시 캐시해서 매 요청 COUNT 를 피한다
+def approximate_count(queryset, cache_key, timeout=300):
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+    return count
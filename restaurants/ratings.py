@@ -0,0 +1,126 @@
+from collections import Counter
+
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from core.db import atomic_with_retry
+from .models import Restaurant
+
+STARS = range(1, 6)
+STAT_FIELDS = ["review_count", "rating_sum", "avg_rating"] + [f"rating_{star}_count" for star in STARS]
+
+
+# 리뷰 1건 추가/삭제/수정을 집계 컬럼과 review_version 에 반영 (UPDATE 1번)
+# 반드시 리뷰 저장/삭제와 같은 transaction.atomic() 안에서 호출할 것
+def apply_rating_change(restaurant_id, added=None, removed=None):
+    star_delta = Counter()
+    if added is not None:
+        star_delta[added] += 1
+    if removed is not None:
+        star_delta[removed] -= 1
+
+    # 별점이 그대로인 수정도 리뷰 내용은 바뀌므로 버전은 항상 올린다
+    updates = {"review_version": F("review_version") + 1, "updated_at": timezone.now()}
+    star_delta = {star: delta for star, delta in star_delta.items() if delta}
+    if star_delta:
+        count_delta = sum(star_delta.values())
+        sum_delta = sum(star * delta for star, delta in star_delta.items())
+        new_count = F("review_count") + count_delta
+        new_sum = F("rating_sum") + sum_delta
+        for star, delta in star_delta.items():
+            updates[f"rating_{star}_count"] = F(f"rating_{star}_count") + delta
+        updates["review_count"] = new_count
+        updates["rating_sum"] = new_sum
+        # SET 절의 F()는 갱신 전 값을 읽으므로 새 합계/개수로 평균을 바로 계산할 수 있다
+        updates["avg_rating"] = Case(
+            When(review_count=-count_delta, then=Value(0.0)),
+            default=Cast(new_sum, FloatField()) / new_count,
+            output_field=FloatField(),
+        )
+    Restaurant.objects.filter(pk=restaurant_id).update(**updates)
+
+
+# 리뷰 테이블에서 주어진 음식점들의 집계를 다시 계산 (GROUP BY 1번)
+def compute_rating_stats(restaurant_ids):
+    from reviews.models import Review
+
+    stats = {
+        pk: {field: 0 for field in STAT_FIELDS}
+        for pk in restaurant_ids
+    }
+    rows = (
+        Review.objects.filter(restaurant_id__in=restaurant_ids)
+        .order_by()
+        .values("restaurant_id", "rating")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        entry = stats[row["restaurant_id"]]
+        entry[f"rating_{row['rating']}_count"] = row["n"]
+        entry["review_count"] += row["n"]
+        entry["rating_sum"] += row["rating"] * row["n"]
+
+    for entry in stats.values():
+        if entry["review_count"]:
+            entry["avg_rating"] = entry["rating_sum"] / entry["review_count"]
+        else:
+            entry["avg_rating"] = 0
+    return stats
+
+
+def _iter_id_batches(restaurant_ids, batch_size):
+    if restaurant_ids is None:
+        last_id = 0
+        while True:
+            ids = list(
+                Restaurant.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+    else:
+        restaurant_ids = sorted(set(restaurant_ids))
+        for start in range(0, len(restaurant_ids), batch_size):
+            yield restaurant_ids[start:start + batch_size]
+
+
+# 배치 하나 — 집계 계산부터 버전 증가까지 한 트랜잭션 (SQLite 는 BEGIN IMMEDIATE 로 쓰기 잠금을 먼저 잡으므로
+# 그 사이 리뷰 쓰기가 끼어들어 이전 집계로 덮이거나, 집계만 바뀌고 캐시 버전은 그대로 남지 않는다)
+@atomic_with_retry
+def _rebuild_batch(ids):
+    stats = compute_rating_stats(ids)
+    restaurants = list(Restaurant.objects.filter(pk__in=ids).only("pk", *STAT_FIELDS))
+    for restaurant in restaurants:
+        for field, value in stats[restaurant.pk].items():
+            setattr(restaurant, field, value)
+    Restaurant.objects.bulk_update(restaurants, STAT_FIELDS)
+    Restaurant.objects.filter(pk__in=ids).update(review_version=F("review_version") + 1, updated_at=timezone.now())
+    return len(restaurants)
+
+
+# 집계 컬럼 재생성 (restaurant_ids 가 None 이면 전체, batch_size 단위로 나눠 처리)
+def rebuild_rating_stats(restaurant_ids=None, batch_size=1000):
+    return sum(_rebuild_batch(ids) for ids in _iter_id_batches(restaurant_ids, batch_size))
+
+
+# 저장된 집계와 실제 리뷰 집계가 다른 음식점 목록 [(pk, {field: (저장값, 실제값)})]
+def find_rating_mismatches(restaurant_ids=None, batch_size=1000):
+    mismatches = []
+    for ids in _iter_id_batches(restaurant_ids, batch_size):
+        stats = compute_rating_stats(ids)
+        for row in Restaurant.objects.filter(pk__in=ids).values("pk", *STAT_FIELDS):
+            expected = stats[row["pk"]]
+            diff = {}
+            for field in STAT_FIELDS:
+                if field == "avg_rating":
+                    if abs(row[field] - expected[field]) > 1e-6:
+                        diff[field] = (row[field], expected[field])
+                elif row[field] != expected[field]:
+                    diff[field] = (row[field], expected[field])
+            if diff:
+                mismatches.append((row["pk"], diff))
+    return mismatches
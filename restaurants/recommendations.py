@@ -0,0 +1,306 @@
+import heapq
+import logging
+import math
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from core.db import atomic_with_retry
+from core.pagecache import invalidate_tags
+from .models import RecommendationUpdate, SimilarRestaurant
+
+logger = logging.getLogger("restaurants.recommendations")
+
+# ---------------------------------------------------------------
+# "이 맛집을 저장한 사람들이 함께 저장한 곳" (아이템 기반 협업 필터링)
+# - 사용자가 "좋아한" 음식점: 즐겨찾기 + 별점 RECOMMENDATION_MIN_RATING 이상 리뷰
+# - 두 음식점의 유사도 = 둘 다 좋아한 사용자 수 / sqrt(각각 좋아한 사용자 수의 곱)  (0/1 벡터의 코사인)
+# - 필요한 것은 (1) 계산할 음식점을 좋아한 사용자들의 좋아요 집합과 (2) 이웃 후보마다 좋아한 사용자 수뿐이다
+#   - 전체 재계산: 좋아요 관계 전체를 한 번 읽어 둘 다 만든다
+#   - 쌓인 변경만 다시 계산: 그 음식점들을 좋아한 사용자 → 그 사용자들의 좋아요 → 후보별 사용자 수(집계 쿼리)만 읽는다
+# - 음식점 BATCH_SIZE 개씩 행을 계산해서 상위 k 개만 SimilarRestaurant 에 저장한다
+# - 즐겨찾기/리뷰가 바뀌면 RecommendationUpdate 에 영향받는 음식점만 쌓고(요청 밖에서 — LikeChangeBuffer),
+#   update_recommendations 가 그 행만 다시 계산
+#   (그 밖의 음식점이 받는 작은 변화는 --full 재계산 때 반영)
+# ---------------------------------------------------------------
+BATCH_SIZE = 500
+SIMILAR_CACHE_TIMEOUT = 60 * 60
+
+
+def _similar_cache_key(restaurant_id):
+    return f"restaurants:similar:{restaurant_id}"
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+# 좋아요 (사용자 id, 음식점 id) 쿼리 두 개 — 즐겨찾기, 높은 별점 리뷰
+def _like_pairs(user_ids=None, restaurant_ids=None):
+    from favorites.models import Favorite
+    from reviews.models import Review
+
+    favorites = Favorite.objects.order_by()
+    reviews = Review.objects.filter(rating__gte=getattr(settings, "RECOMMENDATION_MIN_RATING", 4)).order_by()
+    if user_ids is not None:
+        favorites, reviews = favorites.filter(user_id__in=user_ids), reviews.filter(author_id__in=user_ids)
+    if restaurant_ids is not None:
+        favorites = favorites.filter(restaurant_id__in=restaurant_ids)
+        reviews = reviews.filter(restaurant_id__in=restaurant_ids)
+    return [favorites.values_list("user_id", "restaurant_id"), reviews.values_list("author_id", "restaurant_id")]
+
+
+# 너무 많이 좋아한 사용자는 모든 쌍에 조금씩 끼어 유사도를 흐리고 계산량(개수²)만 늘리므로 "함께 좋아한 수"에서 뺀다
+# (음식점마다 좋아한 사용자 수에는 그대로 센다 — 변경분 계산에서 집계 쿼리로 같은 값을 얻기 위해)
+def _drop_heavy_users(user_likes):
+    max_likes = getattr(settings, "RECOMMENDATION_MAX_USER_LIKES", 500)
+    for user_id in [user_id for user_id, liked in user_likes.items() if len(liked) > max_likes]:
+        del user_likes[user_id]
+    return user_likes
+
+
+# 좋아요 관계 전체 → ({사용자: 음식점 집합}, {음식점: 사용자 집합}, {음식점: 좋아한 사용자 수})
+def load_likes():
+    user_likes = defaultdict(set)
+    for queryset in _like_pairs():
+        for user_id, restaurant_id in queryset.iterator(chunk_size=10_000):
+            user_likes[user_id].add(restaurant_id)
+    restaurant_likers = defaultdict(set)
+    for user_id, liked in user_likes.items():
+        for restaurant_id in liked:
+            restaurant_likers[restaurant_id].add(user_id)
+    liker_counts = {restaurant_id: len(likers) for restaurant_id, likers in restaurant_likers.items()}
+    return _drop_heavy_users(user_likes), restaurant_likers, liker_counts
+
+
+# 음식점별 좋아한 사용자 수 = 즐겨찾기 수 + 높은 별점 리뷰 작성자 수 - 둘 다 한 사용자 수 (음식점 인덱스 범위 집계)
+def _liker_counts(restaurant_ids):
+    from favorites.models import Favorite
+    from reviews.models import Review
+
+    min_rating = getattr(settings, "RECOMMENDATION_MIN_RATING", 4)
+    counts = Counter()
+    for chunk in _chunks(restaurant_ids):
+        reviews = Review.objects.filter(restaurant_id__in=chunk, rating__gte=min_rating).order_by()
+        favorited = Favorite.objects.filter(user_id=OuterRef("author_id"), restaurant_id=OuterRef("restaurant_id"))
+        for queryset, sign in [
+            (Favorite.objects.filter(restaurant_id__in=chunk).order_by().values("restaurant_id").annotate(n=Count("pk")), 1),
+            (reviews.values("restaurant_id").annotate(n=Count("author_id", distinct=True)), 1),
+            (reviews.filter(Exists(favorited)).values("restaurant_id").annotate(n=Count("author_id", distinct=True)), -1),
+        ]:
+            for row in queryset:
+                counts[row["restaurant_id"]] += sign * row["n"]
+    return counts
+
+
+# restaurant_ids 를 다시 계산하는 데 필요한 만큼만 읽는다 (load_likes 와 같은 모양)
+def load_likes_for(restaurant_ids):
+    restaurant_likers = defaultdict(set)
+    for chunk in _chunks(restaurant_ids):
+        for queryset in _like_pairs(restaurant_ids=chunk):
+            for user_id, restaurant_id in queryset:
+                restaurant_likers[restaurant_id].add(user_id)
+
+    user_likes = defaultdict(set)
+    for chunk in _chunks(set().union(*restaurant_likers.values())):
+        for queryset in _like_pairs(user_ids=chunk):
+            for user_id, restaurant_id in queryset:
+                user_likes[user_id].add(restaurant_id)
+    _drop_heavy_users(user_likes)
+    return user_likes, restaurant_likers, _liker_counts(set(restaurant_likers).union(*user_likes.values()))
+
+
+# 음식점 하나의 이웃 상위 k 개 → [(유사도, 이웃 id, 함께 좋아한 사용자 수)]
+def neighbors_for(restaurant_id, likes, k, min_common):
+    user_likes, restaurant_likers, liker_counts = likes
+    likers = restaurant_likers.get(restaurant_id)
+    if not likers:
+        return []
+    common = Counter()
+    for user_id in likers:
+        common.update(user_likes.get(user_id, ()))
+    del common[restaurant_id]
+    size = liker_counts[restaurant_id]
+    scored = (
+        (count / math.sqrt(size * liker_counts[neighbor_id]), neighbor_id, count)
+        for neighbor_id, count in common.items()
+        if count >= min_common
+    )
+    return heapq.nlargest(k, scored, key=lambda row: (row[0], row[2], -row[1]))
+
+
+@atomic_with_retry
+def _replace_neighbors(rows_by_restaurant):
+    SimilarRestaurant.objects.filter(restaurant_id__in=list(rows_by_restaurant)).delete()
+    SimilarRestaurant.objects.bulk_create([
+        SimilarRestaurant(restaurant_id=restaurant_id, neighbor_id=neighbor_id, rank=rank, score=score, common_users=common)
+        for restaurant_id, rows in rows_by_restaurant.items()
+        for rank, (score, neighbor_id, common) in enumerate(rows, start=1)
+    ])
+
+
+# restaurant_ids 의 이웃을 BATCH_SIZE 개씩 다시 계산해 저장 → 저장한 이웃 행 수
+# likes 를 주지 않으면 그 음식점들에 필요한 좋아요만 읽는다
+def update_neighbors(restaurant_ids, likes=None, k=None):
+    restaurant_ids = sorted(restaurant_ids)
+    likes = likes or load_likes_for(restaurant_ids)
+    k = k or getattr(settings, "RECOMMENDATION_NEIGHBORS", 6)
+    min_common = getattr(settings, "RECOMMENDATION_MIN_COMMON_USERS", 2)
+    saved = 0
+    for batch in _chunks(restaurant_ids):
+        rows = {pk: neighbors_for(pk, likes, k, min_common) for pk in batch}
+        _replace_neighbors(rows)
+        saved += sum(len(neighbors) for neighbors in rows.values())
+        cache.delete_many([_similar_cache_key(pk) for pk in batch])
+        invalidate_tags(*[f"restaurant:{pk}" for pk in batch])  # 비로그인 상세 페이지 캐시
+    return saved
+
+
+# 전체 재계산 — 좋아요가 하나라도 있는 음식점 + 지금 이웃이 저장돼 있는 음식점(이웃이 없어졌으면 지운다)
+def rebuild_all(k=None):
+    likes = load_likes()
+    restaurant_ids = set(likes[1]) | set(SimilarRestaurant.objects.values_list("restaurant_id", flat=True).distinct())
+    saved = update_neighbors(restaurant_ids, likes, k)
+    RecommendationUpdate.objects.all().delete()
+    return len(restaurant_ids), saved
+
+
+# 쌓인 음식점만 다시 계산 → (음식점 수, 저장한 이웃 행 수)
+# 계산하는 동안 다시 쌓인 음식점은 queued_at 이 새로 바뀌므로 지우지 않고 다음 번에 처리한다
+def process_queue(k=None):
+    started = timezone.now()
+    restaurant_ids = list(RecommendationUpdate.objects.filter(queued_at__lte=started).values_list("pk", flat=True))
+    if not restaurant_ids:
+        return 0, 0
+    saved = update_neighbors(restaurant_ids, k=k)
+    RecommendationUpdate.objects.filter(pk__in=restaurant_ids, queued_at__lte=started).delete()
+    return len(restaurant_ids), saved
+
+
+# 좋아요가 바뀐 {사용자 id: {음식점 id, ...}} → 그 음식점들과, 그 사용자들이 좋아하는 다른 음식점들의 행을 쌓는다
+# (음식점 id 가 None 이면 그 사용자가 좋아하는 음식점만 — 탈퇴 직전)
+@atomic_with_retry
+def _queue_changes(changes):
+    from favorites.models import Favorite
+    from reviews.models import Review
+
+    min_rating = getattr(settings, "RECOMMENDATION_MIN_RATING", 4)
+    restaurant_ids = set().union(*changes.values()) - {None}
+    for user_ids in _chunks(changes):
+        liked = Favorite.objects.filter(user_id__in=user_ids).order_by().values_list("restaurant_id", flat=True).union(
+            Review.objects.filter(author_id__in=user_ids, rating__gte=min_rating)
+            .order_by().values_list("restaurant_id", flat=True)
+        )
+        restaurant_ids.update(liked)
+    now = timezone.now()
+    RecommendationUpdate.objects.bulk_create(
+        [RecommendationUpdate(restaurant_id=pk, queued_at=now) for pk in restaurant_ids],
+        update_conflicts=True, unique_fields=["restaurant"], update_fields=["queued_at"],
+    )
+
+
+# user_id 의 좋아요가 restaurant_id 에서 바뀌었을 때 바로 쌓는다 (탈퇴처럼 좋아요가 곧 지워지는 경우)
+def queue_like_change(user_id, restaurant_id=None):
+    _queue_changes({user_id: {restaurant_id}})
+
+
+# 좋아요 변경 버퍼
+# 즐겨찾기 토글/리뷰 쓰기 요청마다 RecommendationUpdate 를 쓰지 않고 프로세스 메모리에 (사용자, 음식점) 을 모았다가
+# RECOMMENDATION_QUEUE_FLUSH_INTERVAL 초마다(백그라운드 타이머) 또는 사용자 RECOMMENDATION_QUEUE_FLUSH_THRESHOLD 명마다
+# 한 번에 쌓는다. 프로세스 종료 시에도 flush (RestaurantsConfig.ready) — 조회수 버퍼(restaurants.viewcounts)와 같은 방식.
+# 프로세스가 갑자기 죽어 잃어버린 변경은 update_recommendations --full 때 반영된다
+class LikeChangeBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = defaultdict(set)
+        self._timer = None
+
+    @property
+    def interval(self):
+        return getattr(settings, "RECOMMENDATION_QUEUE_FLUSH_INTERVAL", 5)
+
+    def add(self, user_id, restaurant_id):
+        with self._lock:
+            self._pending[user_id].add(restaurant_id)
+            due = len(self._pending) >= getattr(settings, "RECOMMENDATION_QUEUE_FLUSH_THRESHOLD", 100)
+            self._schedule()
+        if due:
+            self.try_flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(set)
+        if not pending:
+            return 0
+        try:
+            _queue_changes(pending)
+        except Exception:
+            # 반영 못 한 변경은 버리지 않고 다시 쌓아 둔다
+            with self._lock:
+                for user_id, restaurant_ids in pending.items():
+                    self._pending[user_id] |= restaurant_ids
+            raise
+        return len(pending)
+
+    def try_flush(self):
+        try:
+            return self.flush()
+        except Exception:
+            logger.exception("추천 재계산 대기열 반영 실패 — 다음 flush 때 다시 시도")
+            return 0
+
+    # 주기 타이머 (lock 을 잡은 상태에서 호출)
+    def _schedule(self):
+        if self._timer is not None or not getattr(settings, "RECOMMENDATION_QUEUE_BACKGROUND_FLUSH", True):
+            return
+        self._timer = threading.Timer(self.interval, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.try_flush()
+        finally:
+            connections.close_all()  # 타이머 스레드의 DB 연결
+        with self._lock:
+            if self._pending:
+                self._schedule()
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+like_changes = LikeChangeBuffer()
+
+
+# 리뷰 작성/수정/삭제 — 별점이 (전이든 후든) 기준 이상일 때만 좋아요가 바뀐다
+def queue_review_change(user_id, restaurant_id, *ratings):
+    if any(rating >= getattr(settings, "RECOMMENDATION_MIN_RATING", 4) for rating in ratings):
+        like_changes.add(user_id, restaurant_id)
+
+
+# 상세 페이지용 — 저장된 이웃을 읽기만 한다 (캐시, 다시 계산할 때 무효화)
+def get_similar_restaurants(restaurant_id):
+    key = _similar_cache_key(restaurant_id)
+    restaurants = cache.get(key)
+    if restaurants is None:
+        restaurants = [
+            similar.neighbor
+            for similar in SimilarRestaurant.objects.filter(restaurant_id=restaurant_id)
+            .select_related("neighbor__category").order_by("rank")
+        ]
+        cache.set(key, restaurants, SIMILAR_CACHE_TIMEOUT)
+    return restaurants
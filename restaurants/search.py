@@ -0,0 +1,104 @@
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# SQLite FTS5 (trigram 토크나이저) 검색 인덱스
+# - 테이블/트리거는 migrations/0003_restaurant_search_index.py 에서 생성
+# - restaurants_restaurant 의 INSERT/UPDATE(name, address)/DELETE 트리거로 자동 동기화
+#   (SQLite 에서 AddField 등은 테이블을 새로 만들면서 트리거를 지우므로 migrate 후 ensure_search_triggers 로 복구)
+# - trigram 은 3글자 이상이어야 인덱스를 탈 수 있으므로 짧은 검색어는 기존 LIKE 검색으로 처리
+SEARCH_TABLE = "restaurants_restaurant_search"
+MIN_QUERY_LENGTH = 3
+
+TRIGGER_SQL = {
+    "restaurants_restaurant_search_ai": """
+        CREATE TRIGGER IF NOT EXISTS restaurants_restaurant_search_ai
+        AFTER INSERT ON restaurants_restaurant BEGIN
+            INSERT INTO restaurants_restaurant_search(rowid, name, address)
+            VALUES (new.id, new.name, new.address);
+        END
+    """,
+    "restaurants_restaurant_search_ad": """
+        CREATE TRIGGER IF NOT EXISTS restaurants_restaurant_search_ad
+        AFTER DELETE ON restaurants_restaurant BEGIN
+            INSERT INTO restaurants_restaurant_search(restaurants_restaurant_search, rowid, name, address)
+            VALUES ('delete', old.id, old.name, old.address);
+        END
+    """,
+    "restaurants_restaurant_search_au": """
+        CREATE TRIGGER IF NOT EXISTS restaurants_restaurant_search_au
+        AFTER UPDATE OF name, address ON restaurants_restaurant BEGIN
+            INSERT INTO restaurants_restaurant_search(restaurants_restaurant_search, rowid, name, address)
+            VALUES ('delete', old.id, old.name, old.address);
+            INSERT INTO restaurants_restaurant_search(rowid, name, address)
+            VALUES (new.id, new.name, new.address);
+        END
+    """,
+}
+
+_available = None
+
+
+def search_index_available():
+    global _available
+    if _available is None:
+        _available = (
+            connection.vendor == "sqlite"
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available
+
+
+# 검색어 전체를 하나의 phrase 로 감싸면 trigram 인덱스에서 부분 문자열 검색과 같은 의미가 된다
+def match_expression(q):
+    return '"' + q.replace('"', '""') + '"'
+
+
+# 검색 필터 적용 → (queryset, 순위 정렬 가능 여부)
+# 순위가 가능하면 search_rank (bm25, 작을수록 관련도 높음) 가 annotate 된다
+# 검색 테이블을 rowid 로 조인해서 MATCH 는 한 번만 실행한다 (음식점 행마다 순위를 다시 찾는 서브쿼리를 만들지 않는다)
+def search_restaurants(qs, q):
+    if len(q) < MIN_QUERY_LENGTH or not search_index_available():
+        return qs.filter(Q(name__icontains=q) | Q(address__icontains=q)), False
+
+    table = connection.ops.quote_name(SEARCH_TABLE)
+    restaurant_table = connection.ops.quote_name(qs.model._meta.db_table)
+    qs = qs.extra(
+        tables=[SEARCH_TABLE],
+        where=[f"{table} MATCH %s", f"{table}.rowid = {restaurant_table}.id"],
+        params=[match_expression(q)],
+    ).annotate(search_rank=RawSQL(f"{table}.rank", ()))
+    return qs, True
+
+
+# 검색어로만 거른 음식점 → (queryset, 순위 정렬 가능 여부)
+# 목록(views._list_queryset)과 필터 옆 개수(facets.get_facet_rows)가 같은 결과 집합에서 시작하도록 둘 다 이것을 쓴다
+def search_queryset(q):
+    from .models import Restaurant  # 마이그레이션이 이 모듈을 불러오므로 모델은 함수 안에서
+
+    queryset = Restaurant.objects.select_related("category")
+    if not q:
+        return queryset, False
+    return search_restaurants(queryset, q)
+
+
+def rebuild_search_index(using="default"):
+    conn = connections[using]
+    table = conn.ops.quote_name(SEARCH_TABLE)
+    with conn.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+
+# 검색 테이블은 있는데 트리거가 빠져 있으면 다시 만들고 인덱스를 재생성 (post_migrate)
+def ensure_search_triggers(using="default", **kwargs):
+    conn = connections[using]
+    if conn.vendor != "sqlite" or SEARCH_TABLE not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in TRIGGER_SQL if name not in existing]
+        for name in missing:
+            cursor.execute(TRIGGER_SQL[name])
+    if missing:
+        rebuild_search_index(using)
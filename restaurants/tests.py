@@ -1,3 +1,709 @@
-from django.test import TestCase
+import os
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.utils import timezone
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from favorites.models import Favorite
+from reviews.forms import ReviewForm
+from reviews.models import Review
+from reviews.views import _delete_review, _update_review
+from .autocomplete import PrefixIndex, autocomplete_index, choseong, query_ranges
+from .facets import get_facet_rows, summarize_facets
+from .geo import cell_for, haversine_km, nearest
+from .models import Category, RecommendationUpdate, Restaurant, SimilarRestaurant, TrendingRestaurant
+from .ratings import apply_rating_change, find_rating_mismatches, rebuild_rating_stats
+from .recommendations import (
+    get_similar_restaurants, like_changes, load_likes, load_likes_for, process_queue, rebuild_all,
+)
+from .search import search_index_available
+from .trending import compute_trending, get_featured_restaurants
+from .viewcounts import view_counter
+from .views import SORT_ORDERINGS
+
+
+class RatingStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="pass12345")
+        self.restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        self.client.force_login(self.user)
+
+    def post_review(self, rating):
+        return self.client.post(
+            reverse("reviews:create", args=[self.restaurant.pk]),
+            {"rating": rating, "content": "좋아요"},
+        )
+
+    def test_create_edit_delete_keep_stats_in_sync(self):
+        self.post_review(5)
+        self.post_review(3)
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.review_count, 2)
+        self.assertEqual(self.restaurant.rating_sum, 8)
+        self.assertAlmostEqual(self.restaurant.avg_rating, 4.0)
+        self.assertEqual(self.restaurant.rating_5_count, 1)
+        self.assertEqual(self.restaurant.rating_3_count, 1)
+
+        review = Review.objects.get(rating=3)
+        self.client.post(reverse("reviews:edit", args=[review.pk]), {"rating": 1, "content": "별로"})
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.rating_3_count, 0)
+        self.assertEqual(self.restaurant.rating_1_count, 1)
+        self.assertAlmostEqual(self.restaurant.avg_rating, 3.0)
+
+        for review in Review.objects.all():
+            self.client.post(reverse("reviews:delete", args=[review.pk]))
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.review_count, 0)
+        self.assertEqual(self.restaurant.avg_rating, 0)
+        self.assertEqual(find_rating_mismatches(), [])
+
+    def test_stale_edit_and_delete_use_current_row(self):
+        # 두 요청이 같은 리뷰를 먼저 읽어 둔 경우 — 뒤에 처리되는 요청은 그 사이 바뀐 DB 값을 기준으로 한다
+        self.post_review(5)
+        first, second = Review.objects.get(), Review.objects.get()
+        Review.objects.filter(pk=first.pk).update(rating=2)
+        apply_rating_change(self.restaurant.pk, added=2, removed=5)
+
+        form = ReviewForm({"rating": 4, "content": "좋아요"}, instance=second)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(_update_review(form), 2)
+        self.assertEqual(_delete_review(first), 4)
+        self.assertIsNone(_delete_review(second))
+        form = ReviewForm({"rating": 3, "content": "좋아요"}, instance=second)
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(_update_review(form))  # 지워진 리뷰를 다시 만들지 않는다
+        self.assertFalse(Review.objects.exists())
+        self.restaurant.refresh_from_db()
+        self.assertEqual((self.restaurant.review_count, self.restaurant.rating_sum), (0, 0))
+        self.assertEqual(find_rating_mismatches(), [])
+
+    def test_account_deletion_updates_stats(self):
+        self.post_review(4)
+        self.client.post(reverse("users:delete_account"), {"password": "pass12345"})
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.review_count, 0)
+        self.assertEqual(self.restaurant.rating_4_count, 0)
+
+    def test_rebuild_command_repairs_drift(self):
+        Review.objects.create(restaurant=self.restaurant, author=self.user, rating=2, content="x")
+        with self.assertRaises(CommandError):
+            call_command("rebuild_rating_stats", "--verify", stdout=StringIO())
+        call_command("rebuild_rating_stats", stdout=StringIO())
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.review_count, 1)
+        self.assertEqual(self.restaurant.rating_2_count, 1)
+        self.assertEqual(find_rating_mismatches(), [])
+
+    def test_list_sorts_by_stored_rating(self):
+        other = Restaurant.objects.create(name="다른집", address="부산", avg_rating=4.5, review_count=2)
+        response = self.client.get(reverse("restaurants:list"), {"sort": "rating"})
+        self.assertEqual(list(response.context["restaurants"])[0], other)
+
+
+
+# 배치 트랜잭션이 실제로 커밋/롤백되는지 보려면 테스트 전체를 감싸는 트랜잭션이 없어야 한다
+class RatingRebuildTransactionTests(TransactionTestCase):
+    def test_batch_is_all_or_nothing(self):
+        restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        Review.objects.create(restaurant=restaurant, author=User.objects.create_user("tester"), rating=2, content="x")
+        # 집계는 썼는데 버전 증가 전에 실패 → 집계도 되돌린다
+        with mock.patch("restaurants.ratings.timezone.now", side_effect=OperationalError("disk I/O error")):
+            with self.assertRaises(OperationalError):
+                rebuild_rating_stats()
+        restaurant.refresh_from_db()
+        self.assertEqual((restaurant.review_count, restaurant.review_version), (0, 0))
+
+        self.assertEqual(rebuild_rating_stats(), 1)
+        restaurant.refresh_from_db()
+        self.assertEqual((restaurant.review_count, restaurant.review_version), (1, 1))
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        # 같은 조회수 묶음을 만들어 id 타이브레이커를 검증
+        for i in range(30):
+            Restaurant.objects.create(name=f"식당{i}", address="서울", view_count=i % 4)
+
+    def walk(self, sort):
+        seen, cursor = [], ""
+        while True:
+            response = self.client.get(reverse("restaurants:list"), {"sort": sort, "cursor": cursor})
+            page = response.context["restaurants"]
+            seen.extend(r.pk for r in page)
+            if not page.has_next():
+                return seen, page
+            cursor = page.next_cursor
+
+    def test_each_sort_visits_every_row_once_in_order(self):
+        for sort, ordering in SORT_ORDERINGS.items():
+            if sort == "relevance":
+                continue
+            seen, _ = self.walk(sort)
+            expected = list(Restaurant.objects.order_by(*ordering).values_list("pk", flat=True))
+            self.assertEqual(seen, expected, sort)
+
+    def test_previous_cursor_returns_same_page(self):
+        first = self.client.get(reverse("restaurants:list"), {"sort": "views"}).context["restaurants"]
+        second = self.client.get(
+            reverse("restaurants:list"), {"sort": "views", "cursor": first.next_cursor}
+        ).context["restaurants"]
+        third = self.client.get(
+            reverse("restaurants:list"), {"sort": "views", "cursor": second.next_cursor}
+        ).context["restaurants"]
+        back = self.client.get(
+            reverse("restaurants:list"), {"sort": "views", "cursor": third.previous_cursor}
+        ).context["restaurants"]
+        self.assertEqual([r.pk for r in back], [r.pk for r in second])
+        self.assertEqual(back.number, 2)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        response = self.client.get(reverse("restaurants:list"), {"cursor": "garbage!"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["restaurants"].number, 1)
+
+    @override_settings(RESTAURANT_LIST_APPROX_COUNT=True)
+    def test_approximate_count_is_opt_in(self):
+        cache.clear()
+        page = self.client.get(reverse("restaurants:list")).context["restaurants"]
+        self.assertEqual(page.total_count, 30)
+        self.assertEqual(page.num_pages, 3)
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.kimbap = Restaurant.objects.create(name="김밥천국 강남점", address="서울 강남구 테헤란로")
+        self.pasta = Restaurant.objects.create(name="파스타하우스", address="서울 마포구 김밥골목")
+        Restaurant.objects.create(name="스시야", address="부산 해운대구")
+
+    def search(self, q, **params):
+        response = self.client.get(reverse("restaurants:list"), {"q": q, **params})
+        return [r.pk for r in response.context["restaurants"]]
+
+    def test_index_is_available_on_sqlite(self):
+        self.assertTrue(search_index_available())
+
+    def test_matches_name_and_address_substrings(self):
+        self.assertCountEqual(self.search("김밥천"), [self.kimbap.pk])
+        self.assertCountEqual(self.search("강남구"), [self.kimbap.pk])
+        self.assertCountEqual(self.search("파스타"), [self.pasta.pk])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.kimbap.name = "라멘집"
+        self.kimbap.save()
+        self.assertEqual(self.search("라멘집"), [self.kimbap.pk])
+        self.pasta.delete()
+        self.assertEqual(self.search("파스타"), [])
+
+    def test_short_query_falls_back_to_like(self):
+        self.assertCountEqual(self.search("김밥"), [self.kimbap.pk, self.pasta.pk])
+
+    def test_ranked_search_runs_match_once(self):
+        jongno = Restaurant.objects.create(name="김밥천국 종로점", address="서울 종로구")
+        with CaptureQueriesContext(connection) as queries:
+            self.assertCountEqual(self.search("김밥천"), [self.kimbap.pk, jongno.pk])
+        matching = [q["sql"] for q in queries if "MATCH" in q["sql"]]
+        self.assertTrue(matching)
+        for sql in matching:
+            self.assertEqual(sql.count("MATCH"), 1, sql)
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+            self.assertNotIn("CORRELATED", plan)
+
+    def test_ranked_results_paginate(self):
+        for i in range(20):
+            Restaurant.objects.create(name=f"국수집 {i}", address="서울")
+        first = self.client.get(reverse("restaurants:list"), {"q": "국수집"}).context["restaurants"]
+        second = self.client.get(
+            reverse("restaurants:list"), {"q": "국수집", "cursor": first.next_cursor}
+        ).context["restaurants"]
+        seen = [r.pk for r in first] + [r.pk for r in second]
+        self.assertEqual(len(seen), 20)
+        self.assertEqual(len(set(seen)), 20)
+
+
+class ViewCountBufferTests(TestCase):
+    def setUp(self):
+        self.restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        view_counter.clear()
+
+    def tearDown(self):
+        view_counter.clear()
+
+    @override_settings(VIEW_COUNT_FLUSH_THRESHOLD=5, VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_detail_views_are_buffered_then_flushed_in_batch(self):
+        for _ in range(4):
+            self.client.get(reverse("restaurants:detail", args=[self.restaurant.pk]))
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.view_count, 0)
+        self.assertEqual(view_counter.pending(self.restaurant.pk), 4)
+
+        self.client.get(reverse("restaurants:detail", args=[self.restaurant.pk]))
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.view_count, 5)
+        self.assertEqual(view_counter.pending(self.restaurant.pk), 0)
+
+    @override_settings(VIEW_COUNT_FLUSH_THRESHOLD=1000, VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_flush_groups_by_amount(self):
+        other = Restaurant.objects.create(name="다른집", address="부산", view_count=10)
+        view_counter.increment(self.restaurant.pk, 3)
+        view_counter.increment(other.pk, 3)
+        view_counter.increment(other.pk)
+        with self.assertNumQueries(2):
+            self.assertEqual(view_counter.flush(), 7)
+        self.restaurant.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.restaurant.view_count, other.view_count), (3, 14))
+
+    @override_settings(VIEW_COUNT_FLUSH_THRESHOLD=2, VIEW_COUNT_FLUSH_INTERVAL=3600)
+    def test_failed_flush_keeps_counts_and_page_works(self):
+        url = reverse("restaurants:detail", args=[self.restaurant.pk])
+        self.client.get(url)
+        with mock.patch("restaurants.viewcounts._apply_batches", side_effect=OperationalError("database is locked")), \
+                self.assertLogs("restaurants.viewcounts", "ERROR"):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(view_counter.pending(self.restaurant.pk), 2)
+
+        self.assertEqual(view_counter.flush(), 2)
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.view_count, 2)
+
+    @override_settings(VIEW_COUNT_FLUSH_THRESHOLD=1000, VIEW_COUNT_FLUSH_INTERVAL=3600, VIEW_COUNT_SORT_MAX_LAG=0)
+    def test_views_sort_flushes_stale_counts(self):
+        other = Restaurant.objects.create(name="다른집", address="부산", view_count=1)
+        view_counter.increment(self.restaurant.pk, 2)
+        response = self.client.get(reverse("restaurants:list"), {"sort": "views"})
+        self.assertEqual(list(response.context["restaurants"])[:2], [self.restaurant, other])
+
+
+
+# 타이머 스레드가 자기 DB 연결로 반영하므로 데이터를 커밋하는 TransactionTestCase
+@override_settings(VIEW_COUNT_BACKGROUND_FLUSH=True, VIEW_COUNT_FLUSH_THRESHOLD=1000, VIEW_COUNT_FLUSH_INTERVAL=0.05)
+class ViewCountBackgroundFlushTests(TransactionTestCase):
+    def tearDown(self):
+        view_counter.clear()
+
+    def test_idle_buffer_is_flushed_by_timer(self):
+        restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        view_counter.increment(restaurant.pk, 3)
+        deadline = time.monotonic() + 5
+        while restaurant.view_count != 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+            restaurant.refresh_from_db()
+        self.assertEqual(restaurant.view_count, 3)
+        self.assertEqual(view_counter.pending(restaurant.pk), 0)
+
+class ReviewFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username="author", password="pass12345")
+        self.other = User.objects.create_user(username="other", password="pass12345")
+        self.restaurant = Restaurant.objects.create(name="맛집", address="서울")
+        self.client.force_login(self.author)
+        self.client.post(
+            reverse("reviews:create", args=[self.restaurant.pk]),
+            {"rating": 4, "content": "처음 리뷰"},
+        )
+        self.review = Review.objects.get()
+        self.url = reverse("restaurants:detail", args=[self.restaurant.pk])
+
+    def test_cached_section_skips_review_queries(self):
+        self.client.logout()
+        self.client.get(self.url)
+        # 음식점 1건 조회만 남는다
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertContains(response, "처음 리뷰")
+
+    def test_edit_buttons_only_for_author(self):
+        edit_url = reverse("reviews:edit", args=[self.review.pk])
+        self.assertContains(self.client.get(self.url), edit_url)
+        self.client.force_login(self.other)
+        self.assertNotContains(self.client.get(self.url), edit_url)
+
+    def test_review_changes_bump_version(self):
+        self.client.get(self.url)
+        self.client.post(
+            reverse("reviews:edit", args=[self.review.pk]),
+            {"rating": 4, "content": "고친 리뷰"},
+        )
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.review_version, 2)
+        self.assertContains(self.client.get(self.url), "고친 리뷰")
+
+
+class NearbySearchTests(TestCase):
+    def setUp(self):
+        # 서울시청 기준
+        self.center = (37.5665, 126.9780)
+        self.close = Restaurant.objects.create(name="시청앞", address="서울 중구", lat="37.5670", lng="126.9785")
+        self.mid = Restaurant.objects.create(name="광화문", address="서울 종로구", lat="37.5759", lng="126.9769")
+        self.far = Restaurant.objects.create(name="부산집", address="부산 해운대구", lat="35.1587", lng="129.1604")
+        Restaurant.objects.create(name="좌표없음", address="어딘가")
+
+    def near(self, **params):
+        response = self.client.get(
+            reverse("restaurants:list"), {"lat": self.center[0], "lng": self.center[1], **params}
+        )
+        return [r.pk for r in response.context["restaurants"]]
+
+    def test_geo_cell_is_kept_in_sync_on_save(self):
+        self.assertEqual(self.close.geo_cell, cell_for(37.5670, 126.9785))
+        self.close.lat, self.close.lng = "35.1", "129.0"
+        self.close.save(update_fields=["lat", "lng"])
+        self.close.refresh_from_db()
+        self.assertEqual(self.close.geo_cell, cell_for(35.1, 129.0))
+
+    def test_radius_mode_sorted_by_distance(self):
+        self.assertEqual(self.near(radius=5), [self.close.pk, self.mid.pk])
+        self.assertEqual(self.near(radius=0.5), [self.close.pk])
+        self.assertEqual(self.near(radius=50, k=1), [self.close.pk])
+
+    def test_nearest_matches_brute_force(self):
+        lat, lng = self.center
+        expected = sorted(
+            Restaurant.objects.filter(lat__isnull=False),
+            key=lambda r: haversine_km(lat, lng, r.lat, r.lng),
+        )[:2]
+        found = nearest(Restaurant.objects.all(), lat, lng, k=2, max_radius_km=50)
+        self.assertEqual(found, expected)
+
+    def test_backfill_command_fills_missing_coordinates(self):
+        restaurant = Restaurant.objects.get(name="좌표없음")
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write("address,lat,lng\n어딘가,37.5,127.0\n")
+        self.addCleanup(os.unlink, f.name)
+        call_command("backfill_coordinates", f.name, stdout=StringIO())
+        restaurant.refresh_from_db()
+        self.assertEqual(float(restaurant.lat), 37.5)
+        self.assertEqual(restaurant.geo_cell, cell_for(37.5, 127.0))
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f"u{i}", password="pass12345") for i in range(4)]
+        self.fresh = Restaurant.objects.create(name="요즘뜨는집", address="서울")
+        self.stale = Restaurant.objects.create(name="예전맛집", address="서울")
+        self.quiet = Restaurant.objects.create(name="조용한집", address="서울")
+
+    def review(self, restaurant, user, days_ago):
+        review = Review.objects.create(restaurant=restaurant, author=user, rating=5, content="좋아요")
+        Review.objects.filter(pk=review.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def test_recent_activity_outranks_old(self):
+        for user in self.users[:2]:
+            self.review(self.fresh, user, days_ago=0)
+        for user in self.users:
+            self.review(self.stale, user, days_ago=10)
+        self.review(self.quiet, self.users[0], days_ago=30)
+
+        self.assertEqual(compute_trending(size=2), 2)
+        ranking = list(TrendingRestaurant.objects.order_by("rank").values_list("restaurant_id", flat=True))
+        self.assertEqual(ranking, [self.fresh.pk, self.stale.pk])
+        trending = TrendingRestaurant.objects.get(restaurant=self.fresh)
+        self.assertAlmostEqual(trending.recent_reviews, 2.0)
+
+        # 다시 계산하면 표를 통째로 바꾼다
+        call_command("update_trending", once=True, size=1, stdout=StringIO())
+        self.assertEqual(TrendingRestaurant.objects.count(), 1)
+
+    def test_home_serves_featured_from_cache(self):
+        self.review(self.fresh, self.users[0], days_ago=0)
+        compute_trending()
+        self.assertEqual(get_featured_restaurants()[0], self.fresh)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "요즘뜨는집")
+
+        # 재계산하면 캐시도 새로
+        self.review(self.quiet, self.users[0], days_ago=0)
+        self.review(self.quiet, self.users[1], days_ago=0)
+        compute_trending()
+        self.assertEqual(get_featured_restaurants()[0], self.quiet)
+
+
+class ImportRestaurantsTests(TestCase):
+    def write(self, suffix, content):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False, encoding="utf-8") as f:
+            f.write(content)
+        self.addCleanup(os.unlink, f.name)
+        return f.name
+
+    def test_csv_and_jsonl_with_dedup_and_categories(self):
+        Category.objects.create(name="한식")
+        Restaurant.objects.create(name="기존집", address="서울 중구 1")
+        csv_path = self.write(".csv", (
+            "name,address,category,phone,lat,lng\n"
+            "새집,서울  중구 2,한식,02-111-1111,37.56,126.97\n"
+            "기존집,서울 중구 1,한식,,,\n"
+            ",주소만,,,,\n"
+            "좌표오류,서울,,,abc,1\n"
+        ))
+        jsonl_path = self.write(".jsonl", "\n".join([
+            '{"name": "새집", "address": "서울 중구 2"}',
+            '{"name": "제이슨집", "address": "부산 1", "category": "분식"}',
+            '{"name": "제이슨집", "address": "부산 1", "category": "분식"}',
+            "not json",
+        ]))
+        out, err = StringIO(), StringIO()
+        call_command("import_restaurants", csv_path, jsonl_path, batch_size=2, stdout=out, stderr=err)
+
+        self.assertEqual(
+            set(Restaurant.objects.values_list("name", flat=True)), {"기존집", "새집", "제이슨집"},
+        )
+        new = Restaurant.objects.get(name="새집")
+        self.assertEqual((new.address, new.category.name), ("서울 중구 2", "한식"))
+        self.assertIsNotNone(new.geo_cell)
+        self.assertEqual(Restaurant.objects.get(name="제이슨집").category.name, "분식")
+        self.assertIn("추가 2, 중복 3, 오류 3, 새 카테고리 1", out.getvalue())
+        self.assertEqual(err.getvalue().count("건너뛰어요"), 3)
+
+    def test_dry_run_saves_nothing(self):
+        path = self.write(".jsonl", '{"name": "가게", "address": "대구", "category": "양식"}\n')
+        out = StringIO()
+        call_command("import_restaurants", path, dry_run=True, stdout=out)
+        self.assertIn("[dry-run] 완료: 1행", out.getvalue())
+        self.assertIn("추가 1", out.getvalue())
+        self.assertFalse(Restaurant.objects.exists())
+        self.assertFalse(Category.objects.exists())
+
+    def test_unknown_format(self):
+        with self.assertRaises(CommandError):
+            call_command("import_restaurants", self.write(".txt", "x"), stdout=StringIO())
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        autocomplete_index.clear()
+        self.addCleanup(autocomplete_index.clear)
+        cafe = Category.objects.create(name="카페")
+        Restaurant.objects.create(name="스타벅스 강남점", address="서울 강남구 테헤란로 1", category=cafe, review_count=5)
+        Restaurant.objects.create(name="스시 오마카세", address="서울 마포구 합정로 2", review_count=9)
+        Restaurant.objects.create(name="마시는 차", address="부산 해운대구 3", review_count=1)
+        self.url = reverse("restaurants:autocomplete")
+
+    def names(self, q, **params):
+        return [item["name"] for item in self.client.get(self.url, {"q": q, **params}).json()["results"]]
+
+    def test_prefix_choseong_and_partial_syllables(self):
+        self.assertEqual(self.names("스"), ["스시 오마카세", "스타벅스 강남점"])
+        self.assertEqual(self.names("스", limit=1), ["스시 오마카세"])
+        self.assertEqual(self.names("ㅅㅌㅂ"), ["스타벅스 강남점"])
+        self.assertEqual(self.names("스ㅌ"), ["스타벅스 강남점"])
+        # 단어 시작 / 주소
+        self.assertEqual(self.names("강남"), ["스타벅스 강남점"])
+        self.assertEqual(self.names("해운대"), ["마시는 차"])
+        # 받침이 다음 글자 초성일 수 있다: "맛" → 마시는
+        self.assertEqual(self.names("맛"), ["마시는 차"])
+        self.assertEqual(self.names("카"), ["카페"])
+        self.assertEqual(self.names(""), [])
+
+        data = self.client.get(self.url, {"q": "카페"}).json()["results"][0]
+        self.assertEqual(data["url"], "/restaurants/?category=%EC%B9%B4%ED%8E%98")
+
+    def test_created_restaurant_is_added_without_rebuild(self):
+        self.assertEqual(self.names("김치"), [])
+        self.client.force_login(User.objects.create_user(username="tester", password="pass12345"))
+        self.client.post(reverse("restaurants:create"), {"name": "김치찌개 명가", "address": "서울"})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("김ㅊ"), ["김치찌개 명가"])
+
+    def test_block_top_k_matches_full_scan(self):
+        index = PrefixIndex(limit=5)
+        words = ["가나", "가다", "나라", "다리", "라면", "마을", "바다", "사과"]
+        expected = []
+        for i in range(5000):
+            name = f"{words[i % 8]}{words[i * 7 % 8]} {i}"
+            popularity = i * 7919 % 1000
+            index.add_restaurant(i, name, "서울", popularity)
+            expected.append((name, popularity, i))
+        index.finish()
+
+        for query in ["가", "가나", "ㄱ", "ㄴㄹ", "다ㄹ", "나라다", "서울", "라면사과 4"]:
+            ranges = query_ranges(query)
+            matches = [
+                (-popularity, i) for name, popularity, i in expected
+                if any(
+                    start <= (choseong(key) if kind == "choseong" else key) < end
+                    for kind, start, end in ranges
+                    for key in [name, name.split()[1], "서울"]
+                )
+            ]
+            self.assertEqual(
+                [pk for _, pk, _, _ in index.search(query, 5)], [i for _, i in sorted(matches)[:5]], query,
+            )
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.korean = Category.objects.create(name="한식")
+        self.japanese = Category.objects.create(name="일식")
+        self.cafe = Category.objects.create(name="카페")
+        for name, category, rating in [
+            ("냉면집", self.korean, 4.5), ("국밥집", self.korean, 3.2), ("냉면 본점", self.korean, 2.0),
+            ("초밥집", self.japanese, 4.1), ("냉면 카페", self.cafe, 0),
+        ]:
+            Restaurant.objects.create(name=name, address="서울", category=category, avg_rating=rating)
+
+    def test_counts_exclude_own_filter(self):
+        rows = get_facet_rows("")
+        facets = summarize_facets(rows)
+        self.assertEqual([(f["name"], f["count"]) for f in facets["categories"]], [("한식", 3), ("일식", 1), ("카페", 1)])
+        self.assertEqual([(f["value"], f["count"]) for f in facets["ratings"]], [(4, 2), (3, 3), (2, 4)])
+
+        # 별점 조건은 카테고리 개수에, 카테고리는 별점 개수에만 반영
+        facets = summarize_facets(rows, category="한식", min_rating=4)
+        self.assertEqual([(f["name"], f["count"], f["active"]) for f in facets["categories"]], [
+            ("일식", 1, False), ("한식", 1, True), ("카페", 0, False),
+        ])
+        self.assertEqual([(f["value"], f["count"], f["active"]) for f in facets["ratings"]], [
+            (4, 1, True), (3, 2, False), (2, 3, False),
+        ])
+
+    def test_grouped_query_cached_per_query(self):
+        with self.assertNumQueries(1):
+            rows = get_facet_rows("냉면")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_facet_rows("  냉면 "), rows)
+        facets = summarize_facets(rows)
+        self.assertEqual([(f["name"], f["count"]) for f in facets["categories"]], [("한식", 2), ("카페", 1)])
+
+    def test_counts_match_list_results(self):
+        def chip_counts(params):
+            response = self.client.get(reverse("restaurants:list"), params)
+            facets = response.context["facets"]
+            return len(response.context["restaurants"]), sum(f["count"] for f in facets["categories"])
+
+        # 검색어는 목록과 똑같이 (공백 두 칸짜리 구절은 목록에서도 0개)
+        self.assertEqual(chip_counts({"q": "냉면 카페"}), (1, 1))
+        self.assertEqual(chip_counts({"q": "냉면  카페"}), (0, 0))
+
+        # 내 주변이면 같은 반경 안의 음식점만 센다
+        for name, lat in [("냉면집", 37.5665), ("국밥집", 37.5670), ("초밥집", 37.70)]:
+            restaurant = Restaurant.objects.get(name=name)
+            restaurant.lat, restaurant.lng = lat, 126.9780
+            restaurant.save()
+        self.assertEqual(chip_counts({"lat": 37.5665, "lng": 126.9780, "radius": 1}), (2, 2))
+
+    def test_list_filters_and_chips(self):
+        response = self.client.get(reverse("restaurants:list"), {"q": "냉면", "rating": 4})
+        self.assertEqual([r.name for r in response.context["restaurants"]], ["냉면집"])
+        self.assertContains(response, f'href="?q=%EB%83%89%EB%A9%B4&amp;rating=4&amp;category=%ED%95%9C%EC%8B%9D"')
+        # 별점 조건으로 0개가 된 카테고리는 누를 수 없다
+        self.assertContains(response, '<span class="chip disabled">☕ 카페 <span class="chip-count">0</span></span>', html=True)
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        like_changes.clear()
+        self.addCleanup(like_changes.clear)
+        self.users = [User.objects.create_user(username=f"user{i}", password="pass12345") for i in range(4)]
+        self.a, self.b, self.c, self.d = [
+            Restaurant.objects.create(name=name, address="서울") for name in ["냉면집", "국밥집", "초밥집", "카페"]
+        ]
+        # a 를 좋아한 3명 중 b 는 3명, c 는 2명이 같이 좋아함, d 는 1명뿐 (기준 2명 미만)
+        for user, restaurants in zip(self.users, [[self.a, self.b, self.c], [self.a, self.b, self.c], [self.a, self.b, self.d], [self.c]]):
+            for restaurant in restaurants:
+                Favorite.objects.create(user=user, restaurant=restaurant)
+
+    def neighbors(self, restaurant):
+        return list(SimilarRestaurant.objects.filter(restaurant=restaurant).order_by("rank").values_list("neighbor__name", flat=True))
+
+    def test_rebuild_all_ranks_by_cosine(self):
+        self.assertEqual(rebuild_all(k=5), (4, 6))
+        self.assertEqual(self.neighbors(self.a), ["국밥집", "초밥집"])
+        self.assertEqual(self.neighbors(self.c), ["냉면집", "국밥집"])
+        self.assertEqual(self.neighbors(self.d), [])
+
+    def test_high_rated_review_counts_as_like(self):
+        Review.objects.create(restaurant=self.d, author=self.users[0], rating=5, content="최고")
+        Review.objects.create(restaurant=self.d, author=self.users[1], rating=2, content="별로")
+        rebuild_all(k=5)
+        self.assertIn("카페", self.neighbors(self.a))
+        self.assertEqual(SimilarRestaurant.objects.get(restaurant=self.a, neighbor=self.d).common_users, 2)
+
+    def test_toggle_queues_and_process_queue_recomputes(self):
+        rebuild_all(k=5)
+        self.client.force_login(self.users[3])
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post(reverse("favorites:toggle", args=[self.a.pk]))
+        # 요청 안에서는 대기열을 쓰지 않고 버퍼에만 모은다
+        self.assertFalse(any("restaurants_recommendationupdate" in q["sql"] for q in ctx.captured_queries))
+        self.assertFalse(RecommendationUpdate.objects.exists())
+        self.assertEqual(like_changes.flush(), 1)
+        self.assertEqual(
+            set(RecommendationUpdate.objects.values_list("pk", flat=True)), {self.a.pk, self.c.pk},
+        )
+        self.assertEqual(process_queue(k=5)[0], 2)
+        self.assertFalse(RecommendationUpdate.objects.exists())
+        self.assertEqual(SimilarRestaurant.objects.get(restaurant=self.a, neighbor=self.c).common_users, 3)
+
+    @override_settings(RECOMMENDATION_QUEUE_FLUSH_THRESHOLD=2)
+    def test_buffer_flushes_many_users_at_threshold(self):
+        self.client.force_login(self.users[3])
+        self.client.post(reverse("favorites:toggle", args=[self.d.pk]))
+        self.assertFalse(RecommendationUpdate.objects.exists())
+        self.client.force_login(self.users[2])
+        self.client.post(reverse("favorites:toggle", args=[self.d.pk]))
+        # 두 사용자의 좋아요 전체 + 바뀐 음식점을 한 번에 쌓는다 (사용자 2 는 d 를 해제했어도 d 포함)
+        self.assertEqual(
+            set(RecommendationUpdate.objects.values_list("pk", flat=True)), {self.a.pk, self.b.pk, self.c.pk, self.d.pk},
+        )
+        self.assertEqual(like_changes.flush(), 0)
+
+    @override_settings(RECOMMENDATION_MAX_USER_LIKES=3)
+    def test_queued_update_loads_only_affected_likes(self):
+        # 즐겨찾기 + 높은 별점 리뷰가 겹치는 사용자, 좋아요가 많은 사용자가 섞여도 전체 계산과 같은 값
+        Review.objects.create(restaurant=self.a, author=self.users[0], rating=5, content="최고")
+        Review.objects.create(restaurant=self.d, author=self.users[3], rating=4, content="좋아요")
+        Favorite.objects.create(user=self.users[0], restaurant=self.d)
+        outsider = User.objects.create_user(username="outsider")
+        far = Restaurant.objects.create(name="먼집", address="부산")
+        Favorite.objects.create(user=outsider, restaurant=far)
+
+        user_likes, restaurant_likers, liker_counts = load_likes_for([self.c.pk])
+        full_user_likes, full_likers, full_counts = load_likes()
+        self.assertEqual(restaurant_likers[self.c.pk], full_likers[self.c.pk])
+        self.assertNotIn(outsider.pk, user_likes)
+        self.assertNotIn(self.users[0].pk, user_likes)  # 4곳을 좋아해서 빠짐
+        self.assertEqual(dict(user_likes), {pk: full_user_likes[pk] for pk in user_likes})
+        self.assertNotIn(far.pk, liker_counts)
+        self.assertEqual(dict(liker_counts), {pk: full_counts[pk] for pk in liker_counts})
+
+        rebuild_all(k=5)
+        expected = list(SimilarRestaurant.objects.order_by("restaurant", "rank").values_list("restaurant", "neighbor", "score"))
+        RecommendationUpdate.objects.bulk_create([
+            RecommendationUpdate(restaurant=r, queued_at=timezone.now()) for r in (self.a, self.b, self.c, self.d)
+        ])
+        with mock.patch("restaurants.recommendations.load_likes", side_effect=AssertionError("전체 로드")):
+            process_queue(k=5)
+        self.assertEqual(
+            list(SimilarRestaurant.objects.order_by("restaurant", "rank").values_list("restaurant", "neighbor", "score")),
+            expected,
+        )
+
+    def test_detail_reads_stored_neighbors(self):
+        out = StringIO()
+        call_command("update_recommendations", "--full", "--once", stdout=out)
+        self.assertIn("전체 음식점 4개의 비슷한 음식점 6개 저장", out.getvalue())
+        with self.assertNumQueries(1):
+            self.assertEqual([r.name for r in get_similar_restaurants(self.a.pk)], ["국밥집", "초밥집"])
+        with self.assertNumQueries(0):
+            get_similar_restaurants(self.a.pk)
+        response = self.client.get(reverse("restaurants:detail", args=[self.a.pk]))
+        self.assertContains(response, "함께 저장한 맛집")
+        self.assertEqual([r.name for r in response.context["similar_restaurants"]], ["국밥집", "초밥집"])
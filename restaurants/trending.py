@@ -0,0 +1,112 @@
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.db import atomic_with_retry
+from core.pagecache import invalidate_tags
+from .models import Restaurant, TrendingRestaurant
+
+FEATURED_CACHE_KEY = "restaurants:featured"
+
+# 점수 = 최근 리뷰·즐겨찾기(반감기로 감쇠) + 별점(리뷰 수가 적으면 평균 쪽으로 당김) + 누적 조회수(로그)
+REVIEW_WEIGHT = 3.0
+FAVORITE_WEIGHT = 2.0
+RATING_WEIGHT = 1.5
+VIEW_WEIGHT = 0.5
+RATING_PRIOR = 3.0       # 별점 보정 기준값
+RATING_PRIOR_COUNT = 5   # 리뷰가 이 정도 쌓여야 실제 평균이 절반 넘게 반영된다
+VIEW_CANDIDATES = 200    # 최근 활동이 없어도 조회수 상위는 후보에 넣는다
+
+
+# 최근 days 일 동안의 이벤트를 음식점별로 하루 단위 구간으로 세어 반감기 감쇠 합 → {restaurant_id: 점수}
+# 구간은 지금 기준 24시간씩이라 날짜 함수 없이 created_at 비교만으로 GROUP BY 한 번에 센다
+def decayed_counts(queryset, now, days, half_life):
+    buckets = {
+        f"d{age}": Count("pk", filter=Q(
+            created_at__gte=now - timedelta(days=age + 1), created_at__lt=now - timedelta(days=age),
+        ))
+        for age in range(days)
+    }
+    rows = (
+        queryset.filter(created_at__gte=now - timedelta(days=days))
+        .order_by()
+        .values("restaurant_id")
+        .annotate(**buckets)
+    )
+    return {
+        row["restaurant_id"]: sum(row[f"d{age}"] * 0.5 ** (age / half_life) for age in range(days))
+        for row in rows
+    }
+
+
+def trending_score(recent_reviews, recent_favorites, avg_rating, review_count, view_count):
+    rating = (avg_rating * review_count + RATING_PRIOR * RATING_PRIOR_COUNT) / (review_count + RATING_PRIOR_COUNT)
+    return (
+        REVIEW_WEIGHT * recent_reviews
+        + FAVORITE_WEIGHT * recent_favorites
+        + RATING_WEIGHT * (rating - RATING_PRIOR)
+        + VIEW_WEIGHT * math.log1p(view_count)
+    )
+
+
+# 전체 음식점의 인기 점수를 계산해서 상위 size 개로 순위 테이블을 교체 → 저장한 개수
+def compute_trending(size=None, now=None):
+    from favorites.models import Favorite
+    from reviews.models import Review
+
+    size = size or getattr(settings, "TRENDING_SIZE", 50)
+    half_life = getattr(settings, "TRENDING_HALF_LIFE_DAYS", 3)
+    days = getattr(settings, "TRENDING_WINDOW_DAYS", 14)
+    now = now or timezone.now()
+
+    reviews = decayed_counts(Review.objects.all(), now, days, half_life)
+    favorites = decayed_counts(Favorite.objects.all(), now, days, half_life)
+
+    candidates = set(reviews) | set(favorites)
+    candidates.update(Restaurant.objects.order_by("-view_count", "-id").values_list("pk", flat=True)[:VIEW_CANDIDATES])
+
+    scored = []
+    fields = ["pk", "avg_rating", "review_count", "view_count"]
+    candidates = sorted(candidates)
+    for start in range(0, len(candidates), 500):
+        for pk, avg_rating, review_count, view_count in Restaurant.objects.filter(
+            pk__in=candidates[start:start + 500]
+        ).values_list(*fields):
+            score = trending_score(reviews.get(pk, 0), favorites.get(pk, 0), avg_rating, review_count, view_count)
+            scored.append((score, pk))
+    scored.sort(key=lambda item: (-item[0], -item[1]))
+
+    rows = [
+        TrendingRestaurant(
+            restaurant_id=pk, rank=rank, score=score,
+            recent_reviews=reviews.get(pk, 0), recent_favorites=favorites.get(pk, 0), computed_at=now,
+        )
+        for rank, (score, pk) in enumerate(scored[:size], start=1)
+    ]
+    _replace_ranking(rows)
+    cache.delete(FEATURED_CACHE_KEY)
+    invalidate_tags("trending")  # 비로그인 홈 화면 캐시
+    return len(rows)
+
+
+@atomic_with_retry
+def _replace_ranking(rows):
+    TrendingRestaurant.objects.all().delete()
+    TrendingRestaurant.objects.bulk_create(rows)
+
+
+# 홈 화면 "이번 주 인기 맛집" — 순위 테이블 상위 몇 개 (캐시, compute_trending 이 갱신 시 무효화)
+def get_featured_restaurants():
+    restaurants = cache.get(FEATURED_CACHE_KEY)
+    if restaurants is None:
+        restaurants = [
+            trending.restaurant
+            for trending in TrendingRestaurant.objects.select_related("restaurant__category")
+            .order_by("rank")[:getattr(settings, "FEATURED_RESTAURANTS", 6)]
+        ]
+        cache.set(FEATURED_CACHE_KEY, restaurants, getattr(settings, "TRENDING_CACHE_TIMEOUT", 60 * 10))
+    return restaurants
@@ -1,10 +1,12 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "restaurants"
 
 urlpatterns = [
-    path("", views.restaurant_list, name="list"),
-    path("<int:pk>/", views.restaurant_detail, name="detail"),
+    path("", views.restaurant_list_async if settings.ASYNC_READ_VIEWS else views.restaurant_list, name="list"),
+    path("<int:pk>/", views.restaurant_detail_async if settings.ASYNC_READ_VIEWS else views.restaurant_detail, name="detail"),
     path("create/", views.restaurant_create, name="create"),
+    path("autocomplete/", views.autocomplete, name="autocomplete"),
 ]
\ No newline at end of file
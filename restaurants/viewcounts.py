@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F
+
+from core.db import atomic_with_retry
+
+from .models import Restaurant
+
+BATCH_SIZE = 500
+
+logger = logging.getLogger("restaurants.viewcounts")
+
+
+# 모인 조회수를 한 트랜잭션(커밋 1번)으로 반영 — 잠금 충돌이면 재시도 (core.db)
+@atomic_with_retry
+def _apply_batches(batches):
+    for amount, ids in batches:
+        Restaurant.objects.filter(pk__in=ids).update(view_count=F("view_count") + amount)
+
+
+# 조회수 버퍼
+# 상세 페이지 조회마다 UPDATE 하지 않고 프로세스 메모리에 모았다가
+# 일정 시간(VIEW_COUNT_FLUSH_INTERVAL 초) 또는 일정 건수(VIEW_COUNT_FLUSH_THRESHOLD)마다
+# view_count = view_count + n 형태로 한꺼번에 반영한다. 프로세스 종료 시에도 flush (RestaurantsConfig.ready)
+# 조회가 끊겨도 쌓인 조회수가 남아 있지 않도록 백그라운드 타이머가 주기마다 max_age 로 flush 한다
+# (VIEW_COUNT_BACKGROUND_FLUSH — 테스트에서는 끈다)
+class ViewCountBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._since = None  # 가장 오래된 미반영 조회 시각
+        self._timer = None
+
+    @property
+    def interval(self):
+        return getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 10)
+
+    @property
+    def threshold(self):
+        return getattr(settings, "VIEW_COUNT_FLUSH_THRESHOLD", 100)
+
+    def increment(self, restaurant_id, amount=1):
+        with self._lock:
+            if not self._pending:
+                self._since = time.monotonic()
+            self._pending[restaurant_id] += amount
+            self._schedule()
+            due = (
+                sum(self._pending.values()) >= self.threshold
+                or time.monotonic() - self._since >= self.interval
+            )
+        if due:
+            self.try_flush()
+
+    # 아직 DB 에 반영되지 않은 조회수
+    def pending(self, restaurant_id):
+        with self._lock:
+            return self._pending.get(restaurant_id, 0)
+
+    # max_age 를 주면 가장 오래된 미반영 조회가 그보다 오래됐을 때만 반영
+    def flush(self, max_age=None):
+        with self._lock:
+            if not self._pending:
+                return 0
+            if max_age is not None and time.monotonic() - self._since < max_age:
+                return 0
+            pending, self._pending = self._pending, Counter()
+            self._since = None
+
+        # 증가량이 같은 음식점끼리 묶어서 UPDATE ... WHERE id IN (...) 한 번씩
+        by_amount = defaultdict(list)
+        for pk, amount in pending.items():
+            by_amount[amount].append(pk)
+        batches = [
+            (amount, ids[start:start + BATCH_SIZE])
+            for amount, ids in by_amount.items()
+            for start in range(0, len(ids), BATCH_SIZE)
+        ]
+        try:
+            _apply_batches(batches)
+        except Exception:
+            # 반영 못 한 조회수는 버리지 않고 다시 쌓아 둔다
+            self._restore(batches)
+            raise
+        return sum(pending.values())
+
+    # 요청 처리 중에 부르는 flush — 반영에 실패해도(잠금 충돌, DB 오류) 페이지는 보여 주고 로그만 남긴다.
+    # 반영 못 한 조회수는 flush 가 다시 쌓아 두었으므로 다음 flush 때 다시 시도된다
+    def try_flush(self, max_age=None):
+        try:
+            return self.flush(max_age)
+        except Exception:
+            logger.exception("조회수 반영 실패 — 다음 flush 때 다시 시도")
+            return 0
+
+    # 주기 타이머 (lock 을 잡은 상태에서 호출) — 이미 돌고 있으면 그대로 둔다
+    def _schedule(self):
+        if self._timer is not None or not getattr(settings, "VIEW_COUNT_BACKGROUND_FLUSH", True):
+            return
+        self._timer = threading.Timer(self.interval, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.try_flush(max_age=self.interval)
+        finally:
+            connections.close_all()  # 타이머 스레드의 DB 연결
+        # 아직 주기가 안 된 조회수나 반영에 실패한 조회수가 남았으면 다음 주기에 다시
+        with self._lock:
+            if self._pending:
+                self._schedule()
+
+    # 다시 쌓을 때는 기준 시각도 지금으로 — 바로 다음 요청마다 재시도하지 않고 한 주기 기다린다
+    def _restore(self, batches):
+        with self._lock:
+            self._since = time.monotonic()
+            for amount, ids in batches:
+                for pk in ids:
+                    self._pending[pk] += amount
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._since = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+
+view_counter = ViewCountBuffer()
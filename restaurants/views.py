@@ -1,23 +1,70 @@
-from django.db.models import Avg, Count, Q
-from django.shortcuts import get_object_or_404, render, redirect
+import asyncio
+import hashlib
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.urls import reverse
+from core.images import enqueue_variants, prefetch_variants
+from core.metrics import query_budget
+from core.pagecache import cache_anonymous_page, invalidate_tags
+from favorites.cache import aget_favorite_ids, get_favorite_ids
 from .models import Restaurant, Category
+from .autocomplete import autocomplete_index
+from .facets import RATING_BUCKETS, get_facet_rows, summarize_facets
+from .fragments import render_review_section
+from .geo import nearest
+from .pagination import KeysetPage, apaginate_keyset, approximate_count, paginate_keyset
+from .recommendations import get_similar_restaurants
+from .search import search_queryset
+from .viewcounts import view_counter
 
+PAGE_SIZE = 12
+NEAR_DEFAULT_RADIUS_KM = 5
+NEAR_MAX_RADIUS_KM = 50
+NEAR_MAX_RESULTS = 100
 
-# 음식점 목록
-def restaurant_list(request):
+# 정렬 기준별 키셋 순서 (마지막 -id 가 동률 타이브레이커)
+SORT_ORDERINGS = {
+    "latest":    ["-id"],
+    "rating":    ["-avg_rating", "-review_count", "-id"],
+    "reviews":   ["-review_count", "-id"],
+    "views":     ["-view_count", "-id"],
+    "relevance": ["search_rank", "-id"],  # 검색 인덱스 사용 시에만
+}
+
+
+# ?lat=&lng= 가 올바르면 (lat, lng, 반경km, 개수), 아니면 None
+def _near_params(request):
+    try:
+        lat = float(request.GET["lat"])
+        lng = float(request.GET["lng"])
+    except (KeyError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    try:
+        radius = float(request.GET.get("radius", NEAR_DEFAULT_RADIUS_KM))
+        k = int(request.GET.get("k", PAGE_SIZE))
+    except ValueError:
+        radius, k = NEAR_DEFAULT_RADIUS_KM, PAGE_SIZE
+    radius = min(max(radius, 0.1), NEAR_MAX_RADIUS_KM)
+    k = min(max(k, 1), NEAR_MAX_RESULTS)
+    return lat, lng, radius, k
+
+
+# 검색어/카테고리 필터를 적용한 목록 queryset → (qs, q, category_id, sort, ranked)
+def _list_queryset(request):
     q           = request.GET.get("q", "").strip()
     category_id = request.GET.get("category", "").strip()
-    sort        = request.GET.get("sort", "latest")  # latest | rating | reviews | views
-
-    qs = Restaurant.objects.all().annotate(
-        avg_rating=Avg("reviews__rating"),
-        review_count=Count("reviews"),
-    )
+    sort        = request.GET.get("sort", "")  # latest | rating | reviews | views | relevance (| distance)
 
-    if q:
-        qs = qs.filter(Q(name__icontains=q) | Q(address__icontains=q))
+    # avg_rating / review_count 는 저장된 집계 컬럼 (restaurants.ratings)
+    qs, ranked = search_queryset(q)
 
     if category_id:
         # 이름으로 필터 (카테고리가 문자열로 넘어오는 경우)
@@ -26,72 +73,203 @@ def restaurant_list(request):
         else:
             qs = qs.filter(category__name=category_id)
 
-    if sort == "rating":
-        qs = qs.order_by("-avg_rating", "-review_count", "-id")
-    elif sort == "reviews":
-        qs = qs.order_by("-review_count", "-id")
-    elif sort == "views":
-        qs = qs.order_by("-view_count", "-id")
+    min_rating = _min_rating(request)
+    if min_rating is not None:
+        qs = qs.filter(avg_rating__gte=min_rating)
+    return qs, q, category_id, sort, ranked
+
+
+# ?rating=4 → 별점 4점 이상 (facets.RATING_BUCKETS 중 하나, 아니면 None)
+def _min_rating(request):
+    rating = request.GET.get("rating", "")
+    return int(rating) if rating.isdigit() and int(rating) in RATING_BUCKETS else None
+
+
+# 필터 옆에 보여 줄 카테고리/별점 개수 — 목록과 같은 검색어, 내 주변이면 같은 반경 (검색어별 캐시)
+def _list_facets(q, category_id, request):
+    return summarize_facets(get_facet_rows(q, _near_params(request)), category_id, _min_rating(request))
+
+
+# 검색어가 있으면 기본 정렬은 관련도 순
+def _list_sort(sort, ranked):
+    if not sort:
+        sort = "relevance" if ranked else "latest"
+    if sort == "relevance" and not ranked:
+        sort = "latest"
+    return sort
+
+
+# 전체 개수는 설정으로 켰을 때만 (캐시된 근사치)
+def _list_total_count(qs, q, category_id):
+    if not getattr(settings, "RESTAURANT_LIST_APPROX_COUNT", False):
+        return None
+    key = hashlib.md5(f"{q}|{category_id}".encode()).hexdigest()
+    return approximate_count(qs, f"restaurants:list:count:{key}")
+
+
+# 내 주변: 반경 안에서 가까운 순 k개 (한 페이지, 거리 계산은 격자 후보에 대해서만)
+def _near_page(qs, near):
+    lat, lng, radius, k = near
+    return KeysetPage(nearest(qs, lat, lng, k=k, max_radius_km=radius), ["id"], 1, False, False, k)
+
+
+# 비로그인 페이지 캐시 태그
+# - restaurant:<id> 상세, category:<id> 카테고리로 거른 목록, restaurants 그 밖의 목록
+def _list_cache_tags(request):
+    category_id = request.GET.get("category", "")
+    return [f"category:{category_id}"] if category_id.isdigit() else ["restaurants"]
+
+
+def _detail_cache_tags(request, pk):
+    return [f"restaurant:{pk}"]
+
+
+# 캐시된 상세 페이지를 보내도 조회수는 센다
+def _count_cached_view(request, pk):
+    view_counter.increment(pk)
+
+
+# 음식점이 바뀌면(등록, 리뷰로 별점 변경 등) 그 음식점이 보이는 비로그인 캐시 페이지를 무효화
+def invalidate_restaurant_pages(*restaurants, extra_tags=()):
+    tags = {"restaurants", *extra_tags}
+    for restaurant in restaurants:
+        tags.add(f"restaurant:{restaurant.pk}")
+        if restaurant.category_id:
+            tags.add(f"category:{restaurant.category_id}")
+    invalidate_tags(*tags)
+
+
+# 음식점 목록 (내 주변 검색은 반경을 넓혀 가며 최대 8번 조회)
+@query_budget(12)
+@cache_anonymous_page(_list_cache_tags)
+def restaurant_list(request):
+    qs, q, category_id, sort, ranked = _list_queryset(request)
+
+    near = _near_params(request)
+    if near:
+        sort = "distance"
+        page = _near_page(qs, near)
     else:
-        qs = qs.order_by("-id")
+        sort = _list_sort(sort, ranked)
+        ordering = SORT_ORDERINGS.get(sort, SORT_ORDERINGS["latest"])
 
-    categories = Category.objects.all()
+        # 조회수 순일 때는 오래 쌓인 조회수를 먼저 반영해서 순위가 실제와 크게 어긋나지 않게
+        if sort == "views":
+            view_counter.try_flush(max_age=getattr(settings, "VIEW_COUNT_SORT_MAX_LAG", 2))
 
+        page = paginate_keyset(
+            qs, ordering,
+            cursor=request.GET.get("cursor", ""),
+            per_page=PAGE_SIZE,
+            total_count=_list_total_count(qs, q, category_id),
+        )
+
+    prefetch_variants(restaurant.thumbnail for restaurant in page)
     context = {
-        "restaurants": qs,
+        "restaurants": page,
         "q": q,
-        "categories": categories,
+        "facets": _list_facets(q, category_id, request),
         "category_id": category_id,
         "sort": sort,
+        "near": near,
+        "user_favorites": get_favorite_ids(request.user),
     }
     return render(request, "restaurants/list.html", context)
 
 
-# 음식점 상세
-def restaurant_detail(request, pk):
-    restaurant = get_object_or_404(
-        Restaurant.objects.annotate(
-            avg_rating=Avg("reviews__rating"),
-            review_count=Count("reviews"),
-        ),
-        pk=pk,
-    )
+# 음식점 목록 (ASGI 용 async 버전 — settings.ASYNC_READ_VIEWS)
+@query_budget(12)
+@cache_anonymous_page(_list_cache_tags)
+async def restaurant_list_async(request):
+    # 검색 인덱스 확인(첫 호출 시 테이블 조회)이 있어서 queryset 구성은 스레드에서
+    qs, q, category_id, sort, ranked = await sync_to_async(_list_queryset)(request)
+    user = await request.auser()
 
-    # 조회수 증가
-    Restaurant.objects.filter(pk=pk).update(view_count=restaurant.view_count + 1)
-
-    # 리뷰 목록
-    reviews = restaurant.reviews.select_related("author").order_by("-created_at")
-
-    # 별점 분포 계산 (5점 → 1점 순서)
-    rating_distribution = []
-    total = reviews.count()
-    for star in range(5, 0, -1):
-        count = reviews.filter(rating=star).count()
-        pct = (count / total * 100) if total > 0 else 0
-        rating_distribution.append((star, count, round(pct)))
-
-    # 즐겨찾기 여부
-    is_favorite = False
-    if request.user.is_authenticated:
-        try:
-            from favorites.models import Favorite
-            is_favorite = Favorite.objects.filter(
-                user=request.user, restaurant=restaurant
-            ).exists()
-        except Exception:
-            pass
+    near = _near_params(request)
+    if near:
+        sort = "distance"
+        page, user_favorites = await asyncio.gather(
+            sync_to_async(_near_page)(qs, near), aget_favorite_ids(user),
+        )
+    else:
+        sort = _list_sort(sort, ranked)
+        ordering = SORT_ORDERINGS.get(sort, SORT_ORDERINGS["latest"])
+        if sort == "views":
+            await sync_to_async(view_counter.try_flush)(max_age=getattr(settings, "VIEW_COUNT_SORT_MAX_LAG", 2))
+        total_count = await sync_to_async(_list_total_count)(qs, q, category_id)
+        page, user_favorites = await asyncio.gather(
+            apaginate_keyset(qs, ordering, cursor=request.GET.get("cursor", ""), per_page=PAGE_SIZE,
+                             total_count=total_count),
+            aget_favorite_ids(user),
+        )
 
+    await sync_to_async(prefetch_variants)([restaurant.thumbnail for restaurant in page])
     context = {
+        "restaurants": page,
+        "q": q,
+        "facets": await sync_to_async(_list_facets)(q, category_id, request),
+        "category_id": category_id,
+        "sort": sort,
+        "near": near,
+        "user_favorites": user_favorites,
+    }
+    # 템플릿 태그(responsive_img)가 DB/캐시를 볼 수 있으므로 렌더링은 스레드에서
+    return await sync_to_async(render)(request, "restaurants/list.html", context)
+
+
+def _detail_context(restaurant, reviews_html, favorite_ids, similar_restaurants):
+    return {
         "restaurant": restaurant,
-        "reviews": reviews,
+        # 함께 저장한 음식점 (update_recommendations 가 미리 계산한 표에서 읽기만)
+        "similar_restaurants": similar_restaurants,
+        "reviews_html": reviews_html,
         "avg_rating": round(restaurant.avg_rating, 1) if restaurant.avg_rating else None,
-        "rating_distribution": rating_distribution,
-        "is_favorite": is_favorite,
+        # 별점 분포 (5점 → 1점 순서, 저장된 집계 컬럼 사용)
+        "rating_distribution": restaurant.rating_distribution,
+        # 즐겨찾기 여부 (사용자별 캐시된 id 집합)
+        "is_favorite": restaurant.pk in favorite_ids,
     }
+
+
+# 음식점 상세
+@query_budget(8)
+@cache_anonymous_page(_detail_cache_tags, on_hit=_count_cached_view)
+def restaurant_detail(request, pk):
+    restaurant = get_object_or_404(Restaurant.objects.select_related("category"), pk=pk)
+
+    # 조회수 증가 (버퍼에 모았다가 묶어서 반영)
+    view_counter.increment(restaurant.pk)
+
+    # 리뷰 목록 (음식점별 캐시, 본인 리뷰 버튼만 매 요청 렌더링)
+    reviews_html = render_review_section(restaurant, request.user)
+
+    context = _detail_context(
+        restaurant, reviews_html, get_favorite_ids(request.user), get_similar_restaurants(restaurant.pk),
+    )
     return render(request, "restaurants/detail.html", context)
 
 
+# 음식점 상세 (ASGI 용 async 버전)
+# 리뷰 섹션 / 즐겨찾기 id / 조회수 증가는 서로 독립이라 동시에 실행한다.
+# (Django async ORM 은 내부적으로 요청별 스레드에서 실행되므로 DB 쿼리끼리는 차례로 돌지만,
+#  캐시 조회와 겹치고 기다리는 동안 이벤트 루프가 다른 요청을 처리한다)
+@query_budget(8)
+@cache_anonymous_page(_detail_cache_tags, on_hit=_count_cached_view)
+async def restaurant_detail_async(request, pk):
+    restaurant = await aget_object_or_404(Restaurant.objects.select_related("category"), pk=pk)
+    user = await request.auser()
+
+    reviews_html, favorite_ids, similar_restaurants, _ = await asyncio.gather(
+        sync_to_async(render_review_section)(restaurant, user),
+        aget_favorite_ids(user),
+        sync_to_async(get_similar_restaurants)(restaurant.pk),
+        sync_to_async(view_counter.increment)(restaurant.pk),
+    )
+
+    context = _detail_context(restaurant, reviews_html, favorite_ids, similar_restaurants)
+    return await sync_to_async(render)(request, "restaurants/detail.html", context)
+
+
 # 음식점 등록
 @login_required
 def restaurant_create(request):
@@ -116,13 +294,12 @@ def restaurant_create(request):
                 "form": request.POST,
             })
 
+        # hours / closed_days / website 는 아직 모델 필드가 없어 저장하지 않음
         restaurant = Restaurant(
             name=name,
             address=address,
             phone=phone,
             description=description,
-            hours=hours,
-            website=website,
         )
 
         if category_id:
@@ -132,13 +309,36 @@ def restaurant_create(request):
                 pass
 
         if image:
-            restaurant.image = image
+            restaurant.thumbnail = image
 
         restaurant.save()
+        enqueue_variants(restaurant.thumbnail)
+        invalidate_restaurant_pages(restaurant)
+        autocomplete_index.add_restaurant(restaurant)
         messages.success(request, f'"{name}" 음식점이 등록되었어요! 🎉')
         return redirect("restaurants:detail", pk=restaurant.pk)
 
     return render(request, "restaurants/create.html", {
         "categories": categories,
         "form": {},
-    })
\ No newline at end of file
+    })
+
+
+# 검색창 자동완성 (이름/주소/카테고리 접두사, 초성 "ㅅㅌㅂㅅ" 도 가능) — 프로세스 메모리 인덱스에서 인기순
+# 인덱스를 처음 만드는 요청만 쿼리 2개 (카테고리, 음식점)
+@query_budget(2)
+def autocomplete(request):
+    q = request.GET.get("q", "").strip()
+    try:
+        limit = max(1, int(request.GET.get("limit", "")))
+    except ValueError:
+        limit = None
+    results = []
+    suggestions = autocomplete_index.search(q, limit) if q else []
+    for kind, pk, name, address in suggestions:
+        if kind == "category":
+            url = f"{reverse('restaurants:list')}?{urlencode({'category': name})}"
+        else:
+            url = reverse("restaurants:detail", args=[pk])
+        results.append({"type": kind, "id": pk, "name": name, "address": address, "url": url})
+    return JsonResponse({"query": q, "results": results})
@@ -3,3 +3,23 @@ from django.apps import AppConfig
 
 class ReviewsConfig(AppConfig):
     name = 'reviews'
+
+    def ready(self):
+        from core.images import variants_ready
+
+        variants_ready.connect(refresh_review_fragments)
+
+
+# 리뷰 사진 변환본이 생기면 해당 음식점의 리뷰 섹션 캐시를 새로 만들도록 버전 증가
+# (비로그인 페이지 캐시도 리뷰 쓰기와 같은 태그로 무효화 — 그대로 두면 만료될 때까지 예전 <img> 가 나간다)
+def refresh_review_fragments(sender, sources, **kwargs):
+    from django.db.models import F
+    from core.pagecache import invalidate_tags
+    from restaurants.models import Restaurant
+    from .models import Review
+
+    restaurant_ids = set(Review.objects.filter(photo__in=sources).values_list("restaurant_id", flat=True))
+    if not restaurant_ids:
+        return
+    Restaurant.objects.filter(pk__in=restaurant_ids).update(review_version=F("review_version") + 1)
+    invalidate_tags("reviews", *[f"restaurant:{pk}" for pk in restaurant_ids])
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0005_restaurant_coordinates'),
+        ('reviews', '0002_alter_review_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['restaurant', '-id'], name='review_restaurant_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['rating', '-id'], name='review_rating_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0006_restaurant_view_count_index'),
+        ('reviews', '0003_review_feed_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['restaurant', '-created_at'], name='review_restaurant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['author', '-created_at'], name='review_author_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['restaurant', 'rating'], name='review_restaurant_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0007_trending_restaurant'),
+        ('reviews', '0004_review_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['created_at', 'restaurant'], name='review_created_idx'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.contrib.auth.models import User
 from restaurants.models import Restaurant
@@ -5,13 +6,27 @@ from restaurants.models import Restaurant
 class Review(models.Model):
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name="reviews")
     author = models.ForeignKey(User, on_delete=models.CASCADE)
-    rating = models.PositiveSmallIntegerField(default=5)  # 1~5
+    rating = models.PositiveSmallIntegerField(
+        default=5, validators=[MinValueValidator(1), MaxValueValidator(5)]
+    )  # 1~5 (Restaurant 별점 분포 컬럼과 일치해야 함)
     content = models.TextField()
     photo = models.ImageField(upload_to="reviews/photos/", blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # 리뷰 피드 필터 + id 역순 커서 (reviews.views.feed_queryset)
+            models.Index(fields=["restaurant", "-id"], name="review_restaurant_id_idx"),
+            models.Index(fields=["rating", "-id"], name="review_rating_id_idx"),
+            # 상세 페이지 리뷰 섹션 / 마이페이지 내 리뷰 (최신순)
+            models.Index(fields=["restaurant", "-created_at"], name="review_restaurant_created_idx"),
+            models.Index(fields=["author", "-created_at"], name="review_author_created_idx"),
+            # 별점 집계 재계산 GROUP BY restaurant, rating (restaurants.ratings) — 커버링 인덱스
+            models.Index(fields=["restaurant", "rating"], name="review_restaurant_rating_idx"),
+            # 인기 맛집 점수 — 최근 N일 리뷰를 음식점/날짜별로 집계 (restaurants.trending) — 커버링 인덱스
+            models.Index(fields=["created_at", "restaurant"], name="review_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.restaurant.name} - {self.author.username} ({self.rating})"
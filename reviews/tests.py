@@ -1,3 +1,54 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from restaurants.models import Category, Restaurant
+from .models import Review
+
+
+class ReviewFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="tester", password="pass12345")
+        korean = Category.objects.create(name="한식")
+        self.kimbap = Restaurant.objects.create(name="김밥집", address="서울", category=korean)
+        self.sushi = Restaurant.objects.create(name="스시집", address="부산")
+        for i in range(45):
+            Review.objects.create(
+                restaurant=self.kimbap if i % 3 else self.sushi,
+                author=self.user,
+                rating=i % 5 + 1,
+                content=f"리뷰 {i}",
+            )
+
+    def walk_feed(self, **params):
+        ids, cursor = [], ""
+        while True:
+            data = self.client.get(reverse("reviews:feed"), {**params, "cursor": cursor}).json()
+            ids.extend(r["id"] for r in data["results"])
+            if not data["next_cursor"]:
+                return ids
+            cursor = data["next_cursor"]
+
+    def test_feed_walks_every_review_by_id_desc(self):
+        expected = list(Review.objects.order_by("-id").values_list("id", flat=True))
+        self.assertEqual(self.walk_feed(), expected)
+
+    def test_filters(self):
+        self.assertEqual(
+            self.walk_feed(restaurant=self.sushi.pk),
+            list(Review.objects.filter(restaurant=self.sushi).order_by("-id").values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            self.walk_feed(category="한식"),
+            list(Review.objects.filter(restaurant=self.kimbap).order_by("-id").values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            self.walk_feed(rating=5),
+            list(Review.objects.filter(rating=5).order_by("-id").values_list("id", flat=True)),
+        )
+
+    def test_html_first_page(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("reviews:list"))
+        self.assertEqual(len(response.context["reviews"]), 20)
+        self.assertContains(response, "리뷰 44")
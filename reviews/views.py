@@ -1,11 +1,59 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib import messages
+from django.http import JsonResponse
+from django.db.models import F, Func, IntegerField
+from django.db.models.lookups import In
+from core.db import atomic_with_retry
+from core.images import enqueue_variants, prefetch_variants
+from core.metrics import query_budget
+from core.pagecache import cache_anonymous_page
 from restaurants.models import Restaurant
+from restaurants.pagination import apaginate_keyset, paginate_keyset
+from restaurants.ratings import apply_rating_change
+from restaurants.recommendations import queue_review_change
+from restaurants.views import invalidate_restaurant_pages
 from .forms import ReviewForm
 from .models import Review
 
 
+# 리뷰 저장/삭제와 음식점 별점 집계 반영을 한 트랜잭션으로 (잠금 충돌이면 재시도)
+@atomic_with_retry
+def _write_review(write, restaurant_id, added=None, removed=None):
+    write()
+    apply_rating_change(restaurant_id, added=added, removed=removed)
+
+
+# 트랜잭션 안에서 지금 DB 에 있는 별점을 읽는다 (리뷰가 이미 지워졌으면 None)
+# SQLite 는 BEGIN IMMEDIATE 로 이미 쓰기 잠금을 잡았고, 행 잠금 DB 는 select_for_update 로 동시 수정/삭제를 기다린다
+def _current_rating(review_id):
+    return Review.objects.select_for_update().filter(pk=review_id).values_list("rating", flat=True).first()
+
+
+# 리뷰 수정 — 트랜잭션 안에서 읽은 이전 별점과의 차이를 반영 → 이전 별점 (이미 지워진 리뷰면 저장하지 않고 None)
+@atomic_with_retry
+def _update_review(form):
+    review = form.instance
+    old_rating = _current_rating(review.pk)
+    if old_rating is None:
+        return None
+    form.save()
+    apply_rating_change(review.restaurant_id, added=review.rating, removed=old_rating)
+    return old_rating
+
+
+# 리뷰 삭제 — 실제로 지운 경우에만 별점을 뺀다 → 지운 리뷰의 별점 (이미 지워졌으면 None)
+@atomic_with_retry
+def _delete_review(review):
+    rating = _current_rating(review.pk)
+    deleted, _ = Review.objects.filter(pk=review.pk).delete()
+    if not deleted:
+        return None
+    apply_rating_change(review.restaurant_id, removed=rating)
+    return rating
+
+
 # 리뷰 작성
 @login_required
 def create_review(request, restaurant_id):
@@ -17,7 +65,10 @@ def create_review(request, restaurant_id):
             review = form.save(commit=False)
             review.restaurant = restaurant
             review.author = request.user
-            review.save()
+            _write_review(review.save, restaurant.id, added=review.rating)
+            invalidate_restaurant_pages(restaurant, extra_tags=["reviews"])
+            queue_review_change(request.user.pk, restaurant.id, review.rating)
+            enqueue_variants(review.photo)
             messages.success(request, "리뷰가 등록되었어요! 😊")
             return redirect("restaurants:detail", pk=restaurant.id)
     else:
@@ -41,7 +92,14 @@ def edit_review(request, review_id):
     if request.method == "POST":
         form = ReviewForm(request.POST, request.FILES, instance=review)
         if form.is_valid():
-            form.save()
+            old_rating = _update_review(form)
+            if old_rating is None:
+                messages.error(request, "이미 삭제된 리뷰예요.")
+                return redirect("restaurants:detail", pk=review.restaurant_id)
+            invalidate_restaurant_pages(review.restaurant, extra_tags=["reviews"])
+            queue_review_change(request.user.pk, review.restaurant_id, review.rating, old_rating)
+            if "photo" in form.changed_data:
+                enqueue_variants(review.photo)
             messages.success(request, "리뷰가 수정되었어요! ✅")
             return redirect("restaurants:detail", pk=review.restaurant.id)
     else:
@@ -67,15 +125,104 @@ def delete_review(request, review_id):
     restaurant_id = review.restaurant.id
 
     if request.method == "POST":
-        review.delete()
+        rating = _delete_review(review)
+        if rating is not None:
+            invalidate_restaurant_pages(review.restaurant, extra_tags=["reviews"])
+            queue_review_change(request.user.pk, restaurant_id, rating)
         messages.success(request, "리뷰가 삭제되었어요.")
 
     return redirect("restaurants:detail", pk=restaurant_id)
 
 
-# 리뷰 전체 목록
+FEED_PAGE_SIZE = 20
+
+# 피드에 필요한 컬럼만 (작성자 비밀번호, 음식점 설명 등은 읽지 않음)
+FEED_FIELDS = [
+    "id", "rating", "content", "photo", "created_at",
+    "author__id", "author__username",
+    "restaurant__id", "restaurant__name",
+]
+
+
+# 필터(restaurant / category / rating)를 적용한 피드 queryset → (queryset, 적용된 필터)
+# 항상 id 내림차순 키셋 페이지네이션 → Review(restaurant, -id) / Review(rating, -id) 인덱스 사용
+def feed_queryset(params):
+    qs = Review.objects.select_related("author", "restaurant").only(*FEED_FIELDS)
+    filters = {}
+
+    restaurant_id = params.get("restaurant", "").strip()
+    if restaurant_id.isdigit():
+        qs = qs.filter(restaurant_id=restaurant_id)
+        filters["restaurant"] = restaurant_id
+
+    category = params.get("category", "").strip()
+    if category:
+        # 카테고리는 음식점 id 서브쿼리로 좁힌 뒤 id 역순으로 읽는다.
+        # restaurant_id 에 단항 + 를 붙여 인덱스를 타지 않게 해야 SQLite 가 id 역순으로 읽다가 LIMIT 에서 멈춘다
+        # (인덱스를 타면 카테고리의 리뷰를 전부 모은 뒤 임시 B-tree 로 정렬 — manage.py audit_query_plans)
+        restaurants = Restaurant.objects.filter(
+            **({"category_id": category} if category.isdigit() else {"category__name": category})
+        ).values("id")
+        unindexed_restaurant = Func(F("restaurant_id"), template="+%(expressions)s", output_field=IntegerField())
+        qs = qs.filter(In(unindexed_restaurant, restaurants))
+        filters["category"] = category
+
+    rating = params.get("rating", "").strip()
+    if rating in {"1", "2", "3", "4", "5"}:
+        qs = qs.filter(rating=int(rating))
+        filters["rating"] = rating
+
+    return qs, filters
+
+
+def _feed_page(request):
+    qs, filters = feed_queryset(request.GET)
+    page = paginate_keyset(qs, ["-id"], cursor=request.GET.get("cursor", ""), per_page=FEED_PAGE_SIZE)
+    return page, filters
+
+
+def _review_json(review):
+    return {
+        "id": review.id,
+        "rating": review.rating,
+        "content": review.content,
+        "photo": review.photo.url if review.photo else None,
+        "created_at": review.created_at.isoformat(),
+        "author": review.author.username,
+        "restaurant": {"id": review.restaurant.id, "name": review.restaurant.name},
+    }
+
+
+# 리뷰 전체 목록 (첫 페이지는 HTML, 이후는 review_feed JSON 으로 무한 스크롤)
+@query_budget(5)
+@cache_anonymous_page(["reviews"])
 def review_list(request):
-    reviews = Review.objects.all().select_related(
-        "author", "restaurant"
-    ).order_by("-id")
-    return render(request, "reviews/list.html", {"reviews": reviews})
\ No newline at end of file
+    page, filters = _feed_page(request)
+    prefetch_variants(review.photo for review in page)
+    return render(request, "reviews/list.html", {
+        "reviews": page,
+        "filters": filters,
+    })
+
+
+# 리뷰 전체 목록 (ASGI 용 async 버전 — settings.ASYNC_READ_VIEWS)
+@query_budget(5)
+@cache_anonymous_page(["reviews"])
+async def review_list_async(request):
+    qs, filters = feed_queryset(request.GET)
+    page = await apaginate_keyset(qs, ["-id"], cursor=request.GET.get("cursor", ""), per_page=FEED_PAGE_SIZE)
+    await sync_to_async(prefetch_variants)([review.photo for review in page])
+    return await sync_to_async(render)(request, "reviews/list.html", {
+        "reviews": page,
+        "filters": filters,
+    })
+
+
+# 리뷰 피드 JSON (무한 스크롤용)
+@query_budget(5)
+def review_feed(request):
+    page, filters = _feed_page(request)
+    return JsonResponse({
+        "results": [_review_json(review) for review in page],
+        "next_cursor": page.next_cursor or None,
+    })
\ No newline at end of file
@@ -0,0 +1,62 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from users.tokens import PURPOSES, RESET_PASSWORD, VERIFY_EMAIL, max_age
+
+LABELS = {VERIFY_EMAIL: "만료된 이메일 인증 토큰", RESET_PASSWORD: "만료된 비밀번호 재설정 토큰"}
+
+
+class Command(BaseCommand):
+    help = (
+        "만료된 이메일 인증/비밀번호 재설정 토큰과 끝내 인증하지 않은 가입(로그인한 적 없는 비활성 회원)을 "
+        "배치 단위로 삭제합니다. 배치마다 짧은 트랜잭션이라 운영 중에 cron 으로 돌려도 됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--sleep", type=float, default=0.0, help="배치 사이에 쉬는 시간(초) — 쓰기 잠금 양보")
+        parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 개수만 보고합니다.")
+        parser.add_argument("--keep-users", action="store_true", help="인증하지 않은 회원은 지우지 않습니다.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 해요.")
+        self.options = options
+        now = timezone.now()
+
+        for purpose, (model, _, _) in PURPOSES.items():
+            expired = model.objects.filter(created_at__lt=now - timedelta(seconds=max_age(purpose)))
+            self.report(LABELS[purpose], self.purge(model, expired))
+
+        if not options["keep_users"]:
+            cutoff = now - timedelta(seconds=getattr(settings, "UNVERIFIED_USER_MAX_AGE", 60 * 60 * 24 * 7))
+            unverified = User.objects.filter(
+                is_active=False, last_login__isnull=True, is_staff=False, date_joined__lt=cutoff,
+            )
+            self.report("인증하지 않은 회원", self.purge(User, unverified))
+
+    # pk 순서로 batch_size 개씩 골라 지운다 — 한 번에 큰 DELETE 로 테이블을 오래 잠그지 않게
+    def purge(self, model, queryset):
+        deleted = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:self.options["batch_size"]]
+            )
+            if not pks:
+                return deleted
+            last_pk = pks[-1]
+            if not self.options["dry_run"]:
+                model.objects.filter(pk__in=pks).delete()
+                if self.options["sleep"]:
+                    time.sleep(self.options["sleep"])
+            deleted += len(pks)
+
+    def report(self, label, count):
+        prefix = "[dry-run] " if self.options["dry_run"] else ""
+        self.stdout.write(f"{prefix}{label} {count}개 삭제")
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(fields=['created_at'], name='emailtoken_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(fields=['created_at'], name='resettoken_created_idx'),
+        ),
+    ]
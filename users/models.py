@@ -8,6 +8,12 @@ class EmailVerificationToken(models.Model):
     token      = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 만료 토큰 정리 (created_at 기준 범위 조회)
+            models.Index(fields=["created_at"], name="emailtoken_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - 이메일 인증 토큰"
 
@@ -18,5 +24,10 @@ class PasswordResetToken(models.Model):
     token      = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="resettoken_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - 비밀번호 재설정 토큰"
\ No newline at end of file
@@ -1,3 +1,126 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.mail import send_pending
+from core.models import OutgoingEmail
+
+from .models import EmailVerificationToken, PasswordResetToken
+from .tokens import RESET_PASSWORD, VERIFY_EMAIL, TokenExpired, TokenInvalid, check_token, issue_token
+
+
+class SignupEmailTests(TestCase):
+    def signup(self):
+        return self.client.post(reverse("users:signup"), {
+            "username": "newbie",
+            "email": "newbie@example.com",
+            "password1": "password123",
+            "password2": "password123",
+        })
+
+    def test_signup_enqueues_instead_of_sending(self):
+        response = self.signup()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)  # 요청 안에서는 보내지 않음
+
+        queued = OutgoingEmail.objects.get()
+        token = EmailVerificationToken.objects.get(user__username="newbie").token
+        self.assertEqual(queued.to, ["newbie@example.com"])
+        self.assertIn(token, queued.body)
+
+        self.assertEqual(send_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(token, mail.outbox[0].alternatives[0][0])
+
+    def test_user_and_email_are_one_transaction(self):
+        with mock.patch("users.views.enqueue_email", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.signup()
+        self.assertFalse(User.objects.filter(username="newbie").exists())
+
+
+
+@override_settings(SIGNED_USER_TOKENS=True)
+class SignedTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("member", email="member@example.com", password="oldpass123")
+
+    def test_signup_and_verify_without_token_rows(self):
+        self.client.post(reverse("users:signup"), {
+            "username": "newbie", "email": "newbie@example.com",
+            "password1": "password123", "password2": "password123",
+        })
+        self.assertFalse(EmailVerificationToken.objects.exists())
+        url = OutgoingEmail.objects.get().body.replace(settings.SITE_URL, "")
+
+        self.client.get(url)
+        self.assertTrue(User.objects.get(username="newbie").is_active)
+        self.assertEqual(int(self.client.session["_auth_user_id"]), User.objects.get(username="newbie").pk)
+
+        # 활성화된 뒤에는 같은 링크를 다시 쓸 수 없다
+        self.client.logout()
+        with self.assertRaises(TokenInvalid):
+            check_token(url.rstrip("/").rsplit("/", 1)[1], VERIFY_EMAIL)
+
+    def test_reset_password_is_single_use(self):
+        token = issue_token(self.user, RESET_PASSWORD)
+        self.assertFalse(PasswordResetToken.objects.exists())
+        url = reverse("users:reset_password", args=[token])
+        response = self.client.post(url, {"new_password": "newpass123", "new_password2": "newpass123"})
+        self.assertRedirects(response, "/users/login/", fetch_redirect_response=False)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("newpass123"))
+
+        with self.assertRaises(TokenInvalid):
+            check_token(token, RESET_PASSWORD)
+
+    def test_expired_and_tampered(self):
+        token = issue_token(self.user, RESET_PASSWORD)
+        with mock.patch("time.time", return_value=time.time() + 2 * 60 * 60):
+            with self.assertRaises(TokenExpired):
+                check_token(token, RESET_PASSWORD)
+        with self.assertRaises(TokenInvalid):
+            check_token(token[:-2] + "xx", RESET_PASSWORD)
+        # 다른 용도로 서명된 토큰은 안 된다
+        with self.assertRaises(TokenInvalid):
+            check_token(token, VERIFY_EMAIL)
+
+    def test_db_tokens_issued_before_switch_still_work(self):
+        with self.settings(SIGNED_USER_TOKENS=False):
+            token = issue_token(self.user, RESET_PASSWORD)
+        self.assertEqual(check_token(token, RESET_PASSWORD), self.user)
+
+
+class PurgeTokensTests(TestCase):
+    def age(self, queryset, field, **delta):
+        queryset.update(**{field: timezone.now() - timedelta(**delta)})
+
+    def test_purges_expired_tokens_and_unverified_users(self):
+        active = User.objects.create_user("active", password="pw")
+        stale = User.objects.create_user("stale", password="pw", is_active=False)
+        fresh = User.objects.create_user("fresh", password="pw", is_active=False)
+        for user in [active, stale, fresh]:
+            issue_token(user, RESET_PASSWORD)
+        issue_token(stale, VERIFY_EMAIL)
+        issue_token(fresh, VERIFY_EMAIL)
+        self.age(PasswordResetToken.objects.exclude(user=fresh), "created_at", hours=2)
+        self.age(User.objects.filter(pk=stale.pk), "date_joined", days=8)
+
+        out = StringIO()
+        call_command("purge_tokens", batch_size=1, dry_run=True, stdout=out)
+        self.assertIn("[dry-run] 만료된 비밀번호 재설정 토큰 2개", out.getvalue())
+        self.assertEqual(PasswordResetToken.objects.count(), 3)
+
+        call_command("purge_tokens", batch_size=1, stdout=StringIO())
+        self.assertEqual(list(PasswordResetToken.objects.values_list("user", flat=True)), [fresh.pk])
+        self.assertEqual(set(User.objects.values_list("username", flat=True)), {"active", "fresh"})
+        self.assertTrue(EmailVerificationToken.objects.filter(user=fresh).exists())
@@ -0,0 +1,90 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import EmailVerificationToken, PasswordResetToken
+
+VERIFY_EMAIL = "verify_email"
+RESET_PASSWORD = "reset_password"
+
+# 용도 → (DB 토큰 모델, 유효 시간 설정 이름, 기본값(초))
+PURPOSES = {
+    VERIFY_EMAIL:   (EmailVerificationToken, "EMAIL_VERIFICATION_MAX_AGE", 60 * 60 * 24),
+    RESET_PASSWORD: (PasswordResetToken, "PASSWORD_RESET_MAX_AGE", 60 * 60),
+}
+
+
+class TokenInvalid(Exception):
+    pass
+
+
+class TokenExpired(TokenInvalid):
+    pass
+
+
+def max_age(purpose):
+    _, setting, default = PURPOSES[purpose]
+    return getattr(settings, setting, default)
+
+
+# 서명 토큰이 한 번만 쓰이도록 사용자 상태를 같이 서명한다
+# - 이메일 인증: 활성화되면(is_active) 무효
+# - 비밀번호 재설정: 비밀번호가 바뀌거나 로그인하면 무효
+def _fingerprint(user, purpose):
+    if purpose == VERIFY_EMAIL:
+        state = f"{user.is_active}{user.email}"
+    else:
+        state = f"{user.password}{user.last_login}"
+    return salted_hmac(f"users.tokens.{purpose}", f"{user.pk}{state}").hexdigest()[:20]
+
+
+def _is_signed(token):
+    return ":" in token
+
+
+# 토큰 발급
+# SIGNED_USER_TOKENS 면 DB 에 쓰지 않는 서명+타임스탬프 토큰, 아니면 DB 에 저장하는 랜덤 토큰
+def issue_token(user, purpose):
+    if getattr(settings, "SIGNED_USER_TOKENS", False):
+        return signing.dumps({"u": user.pk, "f": _fingerprint(user, purpose)}, salt=f"users.{purpose}")
+    model = PURPOSES[purpose][0]
+    token = str(uuid.uuid4())
+    model.objects.filter(user=user).delete()  # 기존 토큰 삭제
+    model.objects.create(user=user, token=token)
+    return token
+
+
+# 토큰 확인 → 사용자 (잘못됐으면 TokenInvalid, 만료면 TokenExpired)
+# 설정을 바꿔도 이미 보낸 링크가 동작하도록 토큰 모양으로 방식을 고른다
+def check_token(token, purpose):
+    if _is_signed(token):
+        try:
+            payload = signing.loads(token, salt=f"users.{purpose}", max_age=max_age(purpose))
+        except signing.SignatureExpired:
+            raise TokenExpired
+        except signing.BadSignature:
+            raise TokenInvalid
+        user = User.objects.filter(pk=payload.get("u")).first()
+        if user is None or not constant_time_compare(payload.get("f", ""), _fingerprint(user, purpose)):
+            raise TokenInvalid
+        return user
+
+    model = PURPOSES[purpose][0]
+    token_obj = model.objects.select_related("user").filter(token=token).first()
+    if token_obj is None:
+        raise TokenInvalid
+    if timezone.now() > token_obj.created_at + timedelta(seconds=max_age(purpose)):
+        token_obj.delete()
+        raise TokenExpired
+    return token_obj.user
+
+
+# 사용 완료 — DB 토큰은 지우고, 서명 토큰은 사용자 상태가 바뀌어 저절로 무효가 된다
+def consume_token(token, purpose):
+    if not _is_signed(token):
+        PURPOSES[purpose][0].objects.filter(token=token).delete()
@@ -1,14 +1,13 @@
-import uuid
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate, update_session_auth_hash
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.mail import send_mail
+from django.db import transaction
 from django.conf import settings
-from django.utils import timezone
-from datetime import timedelta
-from django.core.mail import EmailMultiAlternatives
+from core.images import prefetch_variants
+from core.mail import enqueue_email
+from .tokens import RESET_PASSWORD, VERIFY_EMAIL, TokenExpired, TokenInvalid, check_token, consume_token, issue_token
 
 
 # -------------------------------------------------------
@@ -57,28 +56,18 @@ def signup_view(request):
         if len(password1) < 8 or password1 != password2:
             return render(request, 'users/signup.html', {'errors': {'password1': '비밀번호를 확인해주세요.'}, 'username': username, 'email': email})
 
-        # 유저 생성
-        user = User.objects.create_user(username=username, email=email, password=password1, is_active=False)
+        # 유저 생성 + 인증 메일 예약 (한 트랜잭션 — 발송은 send_emails 워커가)
+        with transaction.atomic():
+            user = User.objects.create_user(username=username, email=email, password=password1, is_active=False)
 
-        token = str(uuid.uuid4())
-        try:
-            from .models import EmailVerificationToken
-            EmailVerificationToken.objects.create(user=user, token=token)
+            token = issue_token(user, VERIFY_EMAIL)
             verify_url = f"{settings.SITE_URL}/users/verify-email/{token}/"
-            subject = '[LocalEats] 이메일 인증'
-            text_content = verify_url
-            html_content = f'<a href="{verify_url}">이메일 인증하기 클릭</a>'
-
-            msg = EmailMultiAlternatives(
-              subject=subject,
-              body=text_content,
-              from_email=settings.DEFAULT_FROM_EMAIL,
-              to=[email],
+            enqueue_email(
+                subject='[LocalEats] 이메일 인증',
+                body=verify_url,
+                html_body=f'<a href="{verify_url}">이메일 인증하기 클릭</a>',
+                to=[email],
             )
-            msg.attach_alternative(html_content, "text/html")
-            msg.send(fail_silently=True)
-        except Exception as e:
-            print(f"오류: {e}")
 
         return render(request, 'users/signup_done.html', {'email': email})
 
@@ -89,24 +78,19 @@ def signup_view(request):
 # 이메일 인증 확인
 # -------------------------------------------------------
 def verify_email(request, token):
-    from .models import EmailVerificationToken
     try:
-        token_obj = EmailVerificationToken.objects.get(token=token)
-    except EmailVerificationToken.DoesNotExist:
-        messages.error(request, '유효하지 않은 인증 링크예요.')
-        return redirect('/users/login/')
-
-    # 24시간 만료 체크
-    if timezone.now() > token_obj.created_at + timedelta(hours=24):
-        token_obj.delete()
+        user = check_token(token, VERIFY_EMAIL)
+    except TokenExpired:
         messages.error(request, '인증 링크가 만료됐어요. 다시 회원가입해주세요.')
         return redirect('/users/signup/')
+    except TokenInvalid:
+        messages.error(request, '유효하지 않은 인증 링크예요.')
+        return redirect('/users/login/')
 
     # 유저 활성화
-    user = token_obj.user
     user.is_active = True
     user.save()
-    token_obj.delete()
+    consume_token(token, VERIFY_EMAIL)
 
     login(request, user)
     messages.success(request, '이메일 인증이 완료됐어요! 🎉')
@@ -128,9 +112,10 @@ def logout_view(request):
 @login_required
 def mypage_view(request):
     from reviews.models import Review
-    reviews = Review.objects.filter(
+    reviews = list(Review.objects.filter(
         author=request.user
-    ).select_related('restaurant').order_by('-created_at')
+    ).select_related('restaurant').order_by('-created_at'))
+    prefetch_variants(review.photo for review in reviews)
 
     favorites = []
     favorite_count = 0
@@ -211,17 +196,15 @@ def forgot_password(request):
             # 보안상 존재 여부를 알려주지 않음
             return render(request, 'users/forgot_password_done.html', {'email': email})
 
-        # 재설정 토큰 생성
-        token = str(uuid.uuid4())
-        from .models import PasswordResetToken
-        PasswordResetToken.objects.filter(user=user).delete()  # 기존 토큰 삭제
-        PasswordResetToken.objects.create(user=user, token=token)
-
-        # 재설정 이메일 발송
-        reset_url = f"{settings.SITE_URL}/users/reset-password/{token}/"
-        send_mail(
-            subject='[LocalEats] 비밀번호 재설정',
-            message=f'''
+        # 재설정 토큰 생성 (DB 토큰이면 기존 토큰은 삭제)
+        with transaction.atomic():
+            token = issue_token(user, RESET_PASSWORD)
+
+            # 재설정 이메일 발송 예약 (send_emails 워커가 발송)
+            reset_url = f"{settings.SITE_URL}/users/reset-password/{token}/"
+            enqueue_email(
+                subject='[LocalEats] 비밀번호 재설정',
+                body=f'''
 안녕하세요!
 
 비밀번호 재설정 요청이 들어왔어요.
@@ -235,10 +218,8 @@ def forgot_password(request):
 감사합니다,
 LocalEats 팀
             ''',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            fail_silently=False,
-        )
+                to=[email],
+            )
 
         return render(request, 'users/forgot_password_done.html', {'email': email})
 
@@ -249,18 +230,14 @@ LocalEats 팀
 # 비밀번호 재설정
 # -------------------------------------------------------
 def reset_password(request, token):
-    from .models import PasswordResetToken
     try:
-        token_obj = PasswordResetToken.objects.get(token=token)
-    except PasswordResetToken.DoesNotExist:
-        messages.error(request, '유효하지 않은 링크예요.')
-        return redirect('/users/forgot-password/')
-
-    # 1시간 만료 체크
-    if timezone.now() > token_obj.created_at + timedelta(hours=1):
-        token_obj.delete()
+        user = check_token(token, RESET_PASSWORD)
+    except TokenExpired:
         messages.error(request, '링크가 만료됐어요. 다시 요청해주세요.')
         return redirect('/users/forgot-password/')
+    except TokenInvalid:
+        messages.error(request, '유효하지 않은 링크예요.')
+        return redirect('/users/forgot-password/')
 
     if request.method == 'POST':
         new_pw  = request.POST.get('new_password', '')
@@ -274,10 +251,9 @@ def reset_password(request, token):
             messages.error(request, '비밀번호가 일치하지 않아요.')
             return render(request, 'users/reset_password.html', {'token': token})
 
-        user = token_obj.user
         user.set_password(new_pw)
         user.save()
-        token_obj.delete()
+        consume_token(token, RESET_PASSWORD)
 
         messages.success(request, '비밀번호가 재설정됐어요! 로그인해주세요. 🔒')
         return redirect('/users/login/')
@@ -297,9 +273,27 @@ def delete_account(request):
             messages.error(request, '비밀번호가 올바르지 않아요.')
             return redirect('/users/delete-account/')
 
+        from mypage.reservations import release_reservations
+        from reviews.models import Review
+        from restaurants.models import Restaurant
+        from restaurants.ratings import rebuild_rating_stats
+        from restaurants.recommendations import queue_like_change
+        from restaurants.views import invalidate_restaurant_pages
+
         user = request.user
+        queue_like_change(user.pk)  # 이 사용자가 좋아한 음식점들의 비슷한 음식점 다시 계산
         logout(request)
-        user.delete()
+        # 탈퇴 시 CASCADE 로 지워지는 리뷰만큼 음식점 집계도 다시 계산
+        with transaction.atomic():
+            restaurant_ids = list(
+                Review.objects.filter(author=user).order_by().values_list('restaurant_id', flat=True).distinct()
+            )
+            release_reservations(user)  # CASCADE 로 지워지는 예약의 자리를 돌려놓는다
+            user.delete()
+            rebuild_rating_stats(restaurant_ids)
+        invalidate_restaurant_pages(
+            *Restaurant.objects.filter(pk__in=restaurant_ids).only('id', 'category'), extra_tags=['reviews'],
+        )
         messages.success(request, '계정이 삭제됐어요. 그동안 이용해주셔서 감사해요 💙')
         return redirect('/')
 